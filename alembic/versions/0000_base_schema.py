@@ -0,0 +1,95 @@
+"""Original schema: users, monitors, pings and alerts
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-19 08:00:00
+
+The tables as the first release created them, before migrations existed.
+A database made by that release already has them; each is only created if
+missing, so ``alembic upgrade head`` works on it directly, on an empty
+database, and on one the app has since started against (its ``create_all``
+adds missing tables but never changes existing ones).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0000"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("users", "monitors", "pings", "alerts")
+
+
+def _create(table: str, *columns: sa.Column) -> bool:
+    """Create ``table`` unless it exists; returns whether it was created."""
+    if sa.inspect(op.get_bind()).has_table(table):
+        return False
+    op.create_table(table, *columns)
+    return True
+
+
+def upgrade() -> None:
+    if _create(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("username", sa.String(100), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("api_key", sa.String(64), nullable=False),
+        sa.Column("alert_email", sa.String(255), nullable=True),
+        sa.Column("email_alerts_enabled", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    ):
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+        op.create_index("ix_users_username", "users", ["username"], unique=True)
+        op.create_index("ix_users_api_key", "users", ["api_key"], unique=True)
+
+    if _create(
+        "monitors",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("slug", sa.String(36), nullable=False),
+        sa.Column("period", sa.Integer(), nullable=False),
+        sa.Column("grace", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(10), nullable=False),
+        sa.Column("last_ping_at", sa.DateTime(), nullable=True),
+        sa.Column("webhook_url", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    ):
+        op.create_index("ix_monitors_user_id", "monitors", ["user_id"])
+        op.create_index("ix_monitors_slug", "monitors", ["slug"], unique=True)
+
+    if _create(
+        "pings",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("monitor_id", sa.Integer(), sa.ForeignKey("monitors.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column("remote_addr", sa.String(45), nullable=True),
+        sa.Column("user_agent", sa.String(500), nullable=True),
+    ):
+        op.create_index("ix_pings_monitor_id", "pings", ["monitor_id"])
+
+    if _create(
+        "alerts",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("monitor_id", sa.Integer(), sa.ForeignKey("monitors.id"), nullable=False),
+        sa.Column("alert_type", sa.String(10), nullable=False),
+        sa.Column("channel", sa.String(20), nullable=False),
+        sa.Column("details", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    ):
+        op.create_index("ix_alerts_monitor_id", "alerts", ["monitor_id"])
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_table(table)
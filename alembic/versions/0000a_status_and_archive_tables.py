@@ -0,0 +1,87 @@
+"""Status pages, status history and archived ping segments
+
+Revision ID: 0000a
+Revises: 0000
+Create Date: 2026-10-19 08:10:00
+
+Creates ``status_pages``, ``status_page_monitors``, ``status_events`` and
+``ping_segments`` with plain foreign keys (revision 0001 makes them cascade).
+The app's startup ``create_all`` may already have made any of them on a
+database it was pointed at before migrating; those are left as they are.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0000a"
+down_revision: Union[str, None] = "0000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("status_pages", "status_page_monitors", "status_events", "ping_segments")
+
+
+def _create(table: str, *columns: sa.Column) -> bool:
+    """Create ``table`` unless it exists; returns whether it was created."""
+    if sa.inspect(op.get_bind()).has_table(table):
+        return False
+    op.create_table(table, *columns)
+    return True
+
+
+def upgrade() -> None:
+    if _create(
+        "status_pages",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("slug", sa.String(36), nullable=False),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    ):
+        op.create_index("ix_status_pages_user_id", "status_pages", ["user_id"])
+        op.create_index("ix_status_pages_slug", "status_pages", ["slug"], unique=True)
+
+    if _create(
+        "status_page_monitors",
+        sa.Column(
+            "status_page_id", sa.Integer(), sa.ForeignKey("status_pages.id"), primary_key=True
+        ),
+        sa.Column("monitor_id", sa.Integer(), sa.ForeignKey("monitors.id"), primary_key=True),
+    ):
+        op.create_index(
+            "ix_status_page_monitors_monitor_id", "status_page_monitors", ["monitor_id"]
+        )
+
+    if _create(
+        "status_events",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("monitor_id", sa.Integer(), sa.ForeignKey("monitors.id"), nullable=False),
+        sa.Column("from_status", sa.String(10), nullable=False),
+        sa.Column("to_status", sa.String(10), nullable=False),
+        sa.Column("at", sa.DateTime(), nullable=False),
+    ):
+        op.create_index("ix_status_events_monitor_at", "status_events", ["monitor_id", "at"])
+
+    if _create(
+        "ping_segments",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("monitor_id", sa.Integer(), sa.ForeignKey("monitors.id"), nullable=False),
+        sa.Column("start_at", sa.DateTime(), nullable=False),
+        sa.Column("end_at", sa.DateTime(), nullable=False),
+        sa.Column("first_id", sa.Integer(), nullable=False),
+        sa.Column("last_id", sa.Integer(), nullable=False),
+        sa.Column("row_count", sa.Integer(), nullable=False),
+        sa.Column("path", sa.String(500), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    ):
+        op.create_index(
+            "ix_ping_segments_monitor_start", "ping_segments", ["monitor_id", "start_at"]
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_table(table)
@@ -0,0 +1,36 @@
+"""Record when each monitor's status last changed
+
+Revision ID: 0000b
+Revises: 0000a
+Create Date: 2026-10-19 08:20:00
+
+Adds ``monitors.status_changed_at``. Existing monitors get their last ping
+time, or their creation time if they were never pinged: the closest record
+of a status change there is.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0000b"
+down_revision: Union[str, None] = "0000a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("monitors")}
+    if "status_changed_at" not in columns:
+        op.add_column("monitors", sa.Column("status_changed_at", sa.DateTime(), nullable=True))
+    op.execute(
+        "UPDATE monitors SET status_changed_at = coalesce(last_ping_at, created_at) "
+        "WHERE status_changed_at IS NULL"
+    )
+
+
+def downgrade() -> None:
+    # A plain DROP COLUMN (SQLite 3.35+); a batch copy would lose the urgency index
+    op.drop_column("monitors", "status_changed_at")
@@ -0,0 +1,43 @@
+"""Composite indexes for the dashboard's sorts and status counts
+
+Revision ID: 0000c
+Revises: 0000b
+Create Date: 2026-10-19 08:30:00
+
+One index per dashboard sort (urgency, name, status), each ending in
+``name, id`` so keyset pagination reads rows in index order. The urgency
+index is on the same CASE expression the app sorts by.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0000c"
+down_revision: Union[str, None] = "0000b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+URGENCY = (
+    "CASE WHEN (status = 'down') THEN 0 WHEN (status = 'new') THEN 1 "
+    "WHEN (status = 'up') THEN 2 WHEN (status = 'paused') THEN 3 ELSE 4 END"
+)
+
+# index -> columns
+INDEXES = {
+    "ix_monitors_user_urgency": ["user_id", sa.text(URGENCY), "name", "id"],
+    "ix_monitors_user_name": ["user_id", "name", "id"],
+    "ix_monitors_user_status": ["user_id", "status", "name", "id"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES.items():
+        op.create_index(name, "monitors", columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name="monitors", if_exists=True)
@@ -0,0 +1,32 @@
+"""Index pings by monitor and time
+
+Revision ID: 0000d
+Revises: 0000c
+Create Date: 2026-10-19 08:40:00
+
+Replaces ``ix_pings_monitor_id`` with ``ix_pings_monitor_created`` on
+``(monitor_id, created_at, id)``: a monitor's recent pings, newest first,
+are then read in index order. The old index is a prefix of the new one.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0000d"
+down_revision: Union[str, None] = "0000c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_pings_monitor_created", "pings", ["monitor_id", "created_at", "id"], if_not_exists=True
+    )
+    op.drop_index("ix_pings_monitor_id", table_name="pings", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index("ix_pings_monitor_id", "pings", ["monitor_id"], if_not_exists=True)
+    op.drop_index("ix_pings_monitor_created", table_name="pings", if_exists=True)
@@ -0,0 +1,82 @@
+"""Cascade deletes of users, monitors and status pages in the database
+
+Revision ID: 0001
+Revises: 0000d
+Create Date: 2026-10-19 09:00:00
+
+Deleting a monitor used to load every ping and alert into the ORM and delete
+them one by one. The foreign keys now carry ON DELETE CASCADE so the
+database removes them. SQLite cannot alter a constraint, so there each
+child table is copied into a new one (batch mode); expression indexes are
+not reflected by the copy and are recreated by hand.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = "0000d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> [(column, referred table)]
+FOREIGN_KEYS = {
+    "monitors": [("user_id", "users")],
+    "pings": [("monitor_id", "monitors")],
+    "ping_segments": [("monitor_id", "monitors")],
+    "alerts": [("monitor_id", "monitors")],
+    "status_events": [("monitor_id", "monitors")],
+    "status_pages": [("user_id", "users")],
+    "status_page_monitors": [("status_page_id", "status_pages"), ("monitor_id", "monitors")],
+}
+# Gives the unnamed SQLite constraints a name batch mode can drop them by
+NAMING_CONVENTION = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+
+URGENCY_INDEX = "ix_monitors_user_urgency"
+URGENCY = (
+    "CASE WHEN (status = 'down') THEN 0 WHEN (status = 'new') THEN 1 "
+    "WHEN (status = 'up') THEN 2 WHEN (status = 'paused') THEN 3 ELSE 4 END"
+)
+
+
+def _set_ondelete(ondelete: str | None) -> None:
+    sqlite = op.get_bind().dialect.name == "sqlite"
+    if sqlite:
+        # Absent on databases whose monitors table predates the index
+        op.drop_index(URGENCY_INDEX, table_name="monitors", if_exists=True)
+
+    for table, keys in FOREIGN_KEYS.items():
+        if sqlite:
+            with op.batch_alter_table(
+                table, naming_convention=NAMING_CONVENTION, recreate="always"
+            ) as batch:
+                for column, referred in keys:
+                    name = f"fk_{table}_{column}_{referred}"
+                    batch.drop_constraint(name, type_="foreignkey")
+                    batch.create_foreign_key(
+                        name, referred, [column], ["id"], ondelete=ondelete
+                    )
+        else:
+            for column, referred in keys:
+                name = f"{table}_{column}_fkey"  # PostgreSQL's default name
+                op.drop_constraint(name, table, type_="foreignkey")
+                op.create_foreign_key(name, table, referred, [column], ["id"], ondelete=ondelete)
+
+    if sqlite:
+        op.create_index(
+            URGENCY_INDEX,
+            "monitors",
+            ["user_id", sa.text(URGENCY), "name", "id"],
+            if_not_exists=True,
+        )
+
+
+def upgrade() -> None:
+    _set_ondelete("CASCADE")
+
+
+def downgrade() -> None:
+    _set_ondelete(None)
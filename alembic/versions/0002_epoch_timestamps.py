@@ -0,0 +1,102 @@
+"""Store ping times and monitor deadlines as integer epoch seconds
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 12:00:00
+
+``monitors.last_ping_at`` and ``pings.created_at`` become BIGINT seconds since
+the epoch, and ``monitors.deadline_at`` (last ping + period + grace) is added
+with an index for the overdue check. On SQLite the stored text is converted
+in place before the batch copy, which would otherwise CAST it to a number.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> epoch column
+EPOCH_COLUMNS = {"monitors": "last_ping_at", "pings": "created_at"}
+
+URGENCY_INDEX = "ix_monitors_user_urgency"
+URGENCY = (
+    "CASE WHEN (status = 'down') THEN 0 WHEN (status = 'new') THEN 1 "
+    "WHEN (status = 'up') THEN 2 WHEN (status = 'paused') THEN 3 ELSE 4 END"
+)
+
+
+def _is_sqlite() -> bool:
+    return op.get_bind().dialect.name == "sqlite"
+
+
+def _recreate_sqlite_tables(column_type, server_default, drop_deadline=False) -> None:
+    # Batch mode copies tables without their expression indexes
+    op.drop_index(URGENCY_INDEX, table_name="monitors", if_exists=True)
+    with op.batch_alter_table("monitors", recreate="always") as batch:
+        batch.alter_column("last_ping_at", type_=column_type, existing_nullable=True)
+        if drop_deadline:
+            batch.drop_column("deadline_at")
+    with op.batch_alter_table("pings", recreate="always") as batch:
+        batch.alter_column(
+            "created_at",
+            type_=column_type,
+            server_default=server_default,
+            existing_nullable=False,
+        )
+    op.create_index(URGENCY_INDEX, "monitors", ["user_id", sa.text(URGENCY), "name", "id"])
+
+
+def upgrade() -> None:
+    if _is_sqlite():
+        for table, column in EPOCH_COLUMNS.items():
+            op.execute(
+                f"UPDATE {table} SET {column} = CAST(strftime('%s', {column}) AS INTEGER) "
+                f"WHERE {column} IS NOT NULL"
+            )
+        _recreate_sqlite_tables(sa.BigInteger(), None)
+    else:
+        op.alter_column("pings", "created_at", server_default=None)
+        for table, column in EPOCH_COLUMNS.items():
+            op.alter_column(
+                table,
+                column,
+                type_=sa.BigInteger(),
+                postgresql_using=f"extract(epoch from {column})::bigint",
+            )
+
+    op.add_column("monitors", sa.Column("deadline_at", sa.BigInteger(), nullable=True))
+    op.execute(
+        "UPDATE monitors SET deadline_at = last_ping_at + period + grace "
+        "WHERE last_ping_at IS NOT NULL"
+    )
+    op.create_index("ix_monitors_status_deadline", "monitors", ["status", "deadline_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_monitors_status_deadline", table_name="monitors")
+    if _is_sqlite():
+        # Convert after the copy, so the copy's CAST only ever sees integers
+        _recreate_sqlite_tables(
+            sa.DateTime(), sa.text("(CURRENT_TIMESTAMP)"), drop_deadline=True
+        )
+        for table, column in EPOCH_COLUMNS.items():
+            op.execute(
+                f"UPDATE {table} SET {column} = datetime({column}, 'unixepoch') "
+                f"WHERE {column} IS NOT NULL"
+            )
+    else:
+        op.drop_column("monitors", "deadline_at")
+        for table, column in EPOCH_COLUMNS.items():
+            op.alter_column(
+                table,
+                column,
+                type_=sa.DateTime(),
+                postgresql_using=f"to_timestamp({column}) AT TIME ZONE 'UTC'",
+            )
+        op.alter_column("pings", "created_at", server_default=sa.func.now())
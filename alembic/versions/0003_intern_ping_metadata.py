@@ -0,0 +1,81 @@
+"""Intern ping user agents and source addresses in lookup tables
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 15:00:00
+
+``pings.user_agent`` and ``pings.remote_addr`` repeat the same few strings on
+every row. They move to the ``user_agents`` and ``remote_addrs`` tables
+(one row per distinct value) and pings keep ``user_agent_id`` and
+``remote_addr_id``. Existing values are copied over before the string
+columns are dropped; on SQLite that last step copies the pings table.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# pings column -> (lookup table, value length)
+INTERNED = {"user_agent": ("user_agents", 500), "remote_addr": ("remote_addrs", 45)}
+
+
+def _foreign_key_name(column: str, table: str) -> str:
+    if op.get_bind().dialect.name == "sqlite":
+        return f"fk_pings_{column}_id_{table}"  # as named by 0001's convention
+    return f"pings_{column}_id_fkey"  # PostgreSQL's default name
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for column, (table, length) in INTERNED.items():
+        # The app's startup create_all may have made the lookup tables already
+        if not inspector.has_table(table):
+            op.create_table(
+                table,
+                sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+                sa.Column("value", sa.String(length), nullable=False),
+                sa.UniqueConstraint("value"),
+            )
+        op.execute(
+            f"INSERT INTO {table} (value) "
+            f"SELECT DISTINCT {column} FROM pings WHERE {column} IS NOT NULL "
+            f"AND {column} NOT IN (SELECT value FROM {table})"
+        )
+        op.add_column("pings", sa.Column(f"{column}_id", sa.Integer(), nullable=True))
+        op.execute(
+            f"UPDATE pings SET {column}_id = "
+            f"(SELECT id FROM {table} WHERE {table}.value = pings.{column}) "
+            f"WHERE {column} IS NOT NULL"
+        )
+
+    with op.batch_alter_table("pings") as batch:
+        for column, (table, _) in INTERNED.items():
+            batch.drop_column(column)
+            batch.create_foreign_key(
+                _foreign_key_name(column, table), table, [f"{column}_id"], ["id"]
+            )
+
+
+def downgrade() -> None:
+    for column, (table, length) in INTERNED.items():
+        op.add_column("pings", sa.Column(column, sa.String(length), nullable=True))
+        op.execute(
+            f"UPDATE pings SET {column} = "
+            f"(SELECT value FROM {table} WHERE {table}.id = pings.{column}_id) "
+            f"WHERE {column}_id IS NOT NULL"
+        )
+
+    with op.batch_alter_table("pings") as batch:
+        for column, (table, _) in INTERNED.items():
+            batch.drop_constraint(_foreign_key_name(column, table), type_="foreignkey")
+            batch.drop_column(f"{column}_id")
+
+    for table, _ in INTERNED.values():
+        op.drop_table(table)
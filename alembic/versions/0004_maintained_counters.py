@@ -0,0 +1,82 @@
+"""Maintain ping and monitor status counters
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 18:00:00
+
+Adds ``monitors.ping_count`` (pings ever recorded, archived ones included),
+``ping_days`` (pings per monitor per UTC day) and ``monitor_status_counts``
+(monitors per status per user), and fills all three from the existing rows.
+Per-day counts older than the app's window are dropped by its reconcile job.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "monitors",
+        sa.Column("ping_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        "UPDATE monitors SET ping_count = "
+        "(SELECT count(*) FROM pings WHERE pings.monitor_id = monitors.id) + "
+        "(SELECT coalesce(sum(row_count), 0) FROM ping_segments "
+        "WHERE ping_segments.monitor_id = monitors.id)"
+    )
+
+    inspector = sa.inspect(op.get_bind())
+    # The app's startup create_all may have made the counter tables already;
+    # they are refilled from scratch either way
+    if not inspector.has_table("ping_days"):
+        op.create_table(
+            "ping_days",
+            sa.Column(
+                "monitor_id",
+                sa.Integer(),
+                sa.ForeignKey("monitors.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column("day", sa.Integer(), primary_key=True),
+            sa.Column("pings", sa.Integer(), nullable=False),
+        )
+    op.execute("DELETE FROM ping_days")
+    op.execute(
+        "INSERT INTO ping_days (monitor_id, day, pings) "
+        "SELECT monitor_id, created_at / 86400, count(*) FROM pings "
+        "GROUP BY monitor_id, created_at / 86400"
+    )
+
+    if not inspector.has_table("monitor_status_counts"):
+        op.create_table(
+            "monitor_status_counts",
+            sa.Column(
+                "user_id",
+                sa.Integer(),
+                sa.ForeignKey("users.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column("status", sa.String(10), primary_key=True),
+            sa.Column("monitors", sa.Integer(), nullable=False),
+        )
+    op.execute("DELETE FROM monitor_status_counts")
+    op.execute(
+        "INSERT INTO monitor_status_counts (user_id, status, monitors) "
+        "SELECT user_id, status, count(*) FROM monitors GROUP BY user_id, status"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("monitor_status_counts")
+    op.drop_table("ping_days")
+    # A plain DROP COLUMN (SQLite 3.35+); a batch copy would lose the urgency index
+    op.drop_column("monitors", "ping_count")
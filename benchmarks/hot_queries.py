@@ -0,0 +1,146 @@
+"""Per-call cost of the hot queries: statements built per call vs the prebuilt ones.
+
+    python benchmarks/hot_queries.py [--calls 3000] [--monitors 2000]
+
+Runs each query shape against an in-memory SQLite database, where executing
+the SQL itself takes microseconds, so the figures are mostly SQLAlchemy's
+Python overhead: building the statement, its cache key and, for entities,
+ORM loading and flushing.
+
+- badge: slug -> status row (``select(Monitor.status, ...)`` vs ``BADGE_STATUS``)
+- ping: stamp an up monitor and record a ping (load entity + flush vs
+  ``STAMP_UP_MONITOR`` + ``INSERT_PING`` with cached interned ids, both sides
+  keeping the ping counters); rolled back after each call
+- checker: find overdue monitors among ``--monitors`` healthy ones (load every up
+  monitor as an entity and compare in Python vs ``OVERDUE_MONITORS`` on the
+  indexed epoch deadline)
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import counters, interning
+from app.checker import OVERDUE_MONITORS
+from app.database import Base, make_engine
+from app.models import Monitor, Ping, User
+from app.routers.badge import BADGE_STATUS
+from app.routers.ping import INSERT_PING, STAMP_UP_MONITOR
+
+
+async def badge_built(db, slug):
+    result = await db.execute(
+        select(Monitor.status, Monitor.status_changed_at, Monitor.created_at).where(
+            Monitor.slug == slug
+        )
+    )
+    return result.first()
+
+
+async def badge_prebuilt(db, slug):
+    return (await db.execute(BADGE_STATUS, {"badge_slug": slug})).first()
+
+
+async def ping_built(db, slug):
+    monitor = (await db.execute(select(Monitor).where(Monitor.slug == slug))).scalar_one()
+    monitor.last_ping_at = datetime.now(timezone.utc)
+    db.add(Ping(monitor_id=monitor.id, remote_addr="127.0.0.1", user_agent="bench"))
+    await db.flush()
+    await db.rollback()
+
+
+async def ping_prebuilt(db, slug):
+    now = datetime.now(timezone.utc)
+    stamped = (await db.execute(STAMP_UP_MONITOR, {"ping_slug": slug, "ping_at": now})).first()
+    await db.execute(INSERT_PING, {
+        "monitor_id": stamped.id,
+        **await interning.ping_ids_async(db, "127.0.0.1", "bench"),
+    })
+    await counters.count_ping_day(db, stamped.id, now)
+    await db.rollback()
+
+
+async def checker_built(db, slug):
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        select(Monitor).where(Monitor.status.in_(["up"]), Monitor.last_ping_at.isnot(None))
+    )
+    [
+        monitor for monitor in result.scalars()
+        if now > monitor.last_ping_at.replace(tzinfo=timezone.utc)
+        + timedelta(seconds=monitor.period + monitor.grace)
+    ]
+    db.expunge_all()  # each checker run starts with a fresh session
+
+
+async def checker_prebuilt(db, slug):
+    (await db.execute(OVERDUE_MONITORS, {"now": datetime.now(timezone.utc)})).scalars().all()
+
+
+CASES = {
+    "badge": (badge_built, badge_prebuilt),
+    "ping": (ping_built, ping_prebuilt),
+    "checker": (checker_built, checker_prebuilt),
+}
+
+
+async def timed(session_factory, query, slug, calls: int) -> float:
+    """Mean microseconds per call, after a warm-up that fills the compiled cache."""
+    async with session_factory() as db:
+        for _ in range(min(calls, 100)):
+            await query(db, slug)
+        start = time.perf_counter()
+        for _ in range(calls):
+            await query(db, slug)
+        return (time.perf_counter() - start) / calls * 1e6
+
+
+async def run(calls: int, monitors: int) -> None:
+    engine = make_engine("sqlite+aiosqlite://")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_factory() as db:
+        user = User(email="bench@example.com", username="bench", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        now = datetime.now(timezone.utc)
+        db.add_all([
+            Monitor(
+                user_id=user.id, name=f"job-{n}", period=3600, grace=0, status="up",
+                last_ping_at=now,
+            )
+            for n in range(monitors)
+        ])
+        # Both sides record pings from an agent and address seen before
+        await interning.ping_ids_async(db, "127.0.0.1", "bench")
+        await db.commit()
+        slug = (await db.execute(select(Monitor.slug).limit(1))).scalar_one()
+
+    print(f"{'query':<10}{'built per call':>16}{'prebuilt':>12}{'speedup':>10}")
+    for name, (built, prebuilt) in CASES.items():
+        # The checker scans every monitor per call, so it gets far fewer calls
+        n = max(1, calls // 100) if name == "checker" else calls
+        before = await timed(session_factory, built, slug, n)
+        after = await timed(session_factory, prebuilt, slug, n)
+        print(f"{name:<10}{before:>13.1f} us{after:>9.1f} us{before / after:>9.2f}x")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=3000)
+    parser.add_argument("--monitors", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.calls, args.monitors))
+
+
+if __name__ == "__main__":
+    main()
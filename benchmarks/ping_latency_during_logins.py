@@ -0,0 +1,114 @@
+"""Ping latency percentiles while a burst of logins is hashing passwords.
+
+    python benchmarks/ping_latency_during_logins.py [--logins 40]
+    python benchmarks/ping_latency_during_logins.py --inline   # bcrypt on the event loop
+
+Runs the app in-process against a throwaway SQLite file, then fires
+``--logins`` concurrent logins while pinging a monitor at a steady rate until
+they finish, and reports ping latency. ``--inline`` swaps the pooled bcrypt calls for the
+blocking ones, reproducing the behaviour before hashing moved off the loop.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+_db_dir = tempfile.mkdtemp()
+os.environ["CRONGUARD_DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/bench.db"
+# Measure the event loop, not the rate limiter
+os.environ["CRONGUARD_PING_RATE_PER_SLUG"] = "0"
+os.environ["CRONGUARD_LOGIN_RATE_PER_IP"] = "0"
+os.environ["CRONGUARD_LOGIN_RATE_PER_ACCOUNT"] = "0"
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+from app import auth  # noqa: E402
+from app.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.routers import auth as auth_router  # noqa: E402
+
+PASSWORD = "benchmark-password"
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def setup(client: AsyncClient) -> str:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await client.post("/auth/register", data={
+        "username": "bench",
+        "email": "bench@example.com",
+        "password": PASSWORD,
+        "password_confirm": PASSWORD,
+    })
+    response = await client.post("/api/v1/monitors", json={"name": "bench", "period": 60})
+    return response.json()["slug"]
+
+
+async def run(logins: int, interval: float) -> tuple[list[float], float]:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        slug = await setup(client)
+
+        async def login():
+            async with AsyncClient(transport=transport, base_url="http://bench") as c:
+                await c.post(
+                    "/auth/login", data={"email": "bench@example.com", "password": PASSWORD}
+                )
+
+        done = asyncio.Event()
+
+        async def ping_loop() -> list[float]:
+            # Ping for as long as the login burst lasts
+            latencies = []
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get(f"/ping/{slug}")
+                latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(interval)
+            return latencies
+
+        pinger = asyncio.create_task(ping_loop())
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        return await pinger, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--interval", type=float, default=0.005, help="seconds between pings")
+    parser.add_argument("--inline", action="store_true", help="run bcrypt on the event loop")
+    args = parser.parse_args()
+
+    if args.inline:
+        async def verify_inline(plain, hashed):
+            return auth.verify_password(plain, hashed)
+
+        async def hash_inline(password):
+            return auth.hash_password(password)
+
+        auth_router.verify_password_async = verify_inline
+        auth_router.hash_password_async = hash_inline
+
+    latencies, elapsed = asyncio.run(run(args.logins, args.interval))
+    workers = auth._password_executor._max_workers
+    mode = "inline (event loop)" if args.inline else f"pool ({workers} threads)"
+    print(f"bcrypt {mode}: {args.logins} logins in {elapsed:.1f}s, {len(latencies)} pings")
+    for pct in (50, 95, 99):
+        print(f"  p{pct}: {percentile(latencies, pct):8.1f} ms")
+    print(f"  max: {max(latencies):8.1f} ms   mean: {statistics.mean(latencies):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
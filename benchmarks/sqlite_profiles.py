@@ -0,0 +1,118 @@
+"""Concurrent ping and dashboard throughput under different SQLite profiles.
+
+    python benchmarks/sqlite_profiles.py [--seconds 5] [--writers 8] [--readers 8]
+
+Each profile runs in a fresh subprocess against its own throwaway database
+file: ``--writers`` tasks ping monitors while ``--readers`` tasks load the
+dashboard, for ``--seconds``. Reports requests per second and failures
+(e.g. ``database is locked``) for each.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+PROFILES = {
+    # SQLite's own defaults: rollback journal, fsync on every commit, no lock wait
+    "default": {
+        "SQLITE_JOURNAL_MODE": "delete",
+        "SQLITE_SYNCHRONOUS": "full",
+        "SQLITE_BUSY_TIMEOUT": "0",
+        "SQLITE_CACHE_SIZE": "-2000",
+        "SQLITE_MMAP_SIZE": "0",
+        "SQLITE_TEMP_STORE": "default",
+    },
+    # The shipped settings
+    "tuned": {},
+}
+
+
+async def run_profile(seconds: float, writers: int, readers: int) -> dict:
+    sys.path.insert(0, str(SRC))
+    from httpx import ASGITransport, AsyncClient
+
+    from app.database import Base, engine
+    from app.main import app
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/auth/register", data={
+            "username": "bench",
+            "email": "bench@example.com",
+            "password": "benchmark-password",
+            "password_confirm": "benchmark-password",
+        })
+        slugs = []
+        for i in range(writers):
+            response = await client.post("/api/v1/monitors", json={"name": f"m{i}", "period": 60})
+            slugs.append(response.json()["slug"])
+
+        counts = {"pings": 0, "dashboards": 0, "failures": 0}
+        deadline = time.perf_counter() + seconds
+
+        async def worker(url: str, key: str):
+            while time.perf_counter() < deadline:
+                try:
+                    response = await client.get(url)
+                    ok = response.status_code == 200
+                except Exception:
+                    ok = False
+                counts[key if ok else "failures"] += 1
+
+        await asyncio.gather(
+            *(worker(f"/ping/{slug}", "pings") for slug in slugs),
+            *(worker("/dashboard", "dashboards") for _ in range(readers)),
+        )
+    await engine.dispose()
+    return {key: value / seconds if key != "failures" else value for key, value in counts.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--profile", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        result = asyncio.run(run_profile(args.seconds, args.writers, args.readers))
+        print(json.dumps(result))
+        return
+
+    for name, overrides in PROFILES.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {
+                **os.environ,
+                "CRONGUARD_DATABASE_URL": f"sqlite+aiosqlite:///{tmp}/bench.db",
+                # Measure the database, not the rate limiter
+                "CRONGUARD_PING_RATE_PER_SLUG": "0",
+                "CRONGUARD_PING_RATE_PER_IP": "0",
+                **{f"CRONGUARD_{key}": value for key, value in overrides.items()},
+            }
+            output = subprocess.run(
+                [sys.executable, __file__, "--profile", name, *sys.argv[1:]],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{name:>8}: {result['pings']:7.1f} pings/s  {result['dashboards']:7.1f} dashboards/s"
+            f"  {result['failures']} failures"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,140 +1,256 @@
+import asyncio
 import logging
-from datetime import datetime, timezone
 
 import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.channels import AlertEvent, Channel, dispatch, get_pool, register_channel
 from app.config import settings
 from app.models import Alert, Monitor, User
 
 logger = logging.getLogger("cronguard.alerts")
 
 
-async def send_email_alert(user: User, monitor: Monitor, alert_type: str) -> None:
+async def send_email_alert(event: AlertEvent) -> None:
     """Send email alert. In dev mode, just logs to console."""
     subject = (
-        f"[CronGuard] {monitor.name} is DOWN"
-        if alert_type == "down"
-        else f"[CronGuard] {monitor.name} has RECOVERED"
+        f"[CronGuard] {event.monitor_name} is DOWN"
+        if event.alert_type == "down"
+        else f"[CronGuard] {event.monitor_name} has RECOVERED"
     )
-    recipient = user.alert_email or user.email
+    recipient = event.alert_email
 
-    if alert_type == "down":
+    if event.alert_type == "down":
         body = (
-            f"Monitor '{monitor.name}' has gone DOWN.\n"
-            f"Last ping: {monitor.last_ping_at or 'never'}\n"
-            f"Expected interval: {monitor.period}s (grace: {monitor.grace}s)\n"
-            f"\nView monitor: {settings.base_url}/monitors/{monitor.id}\n"
+            f"Monitor '{event.monitor_name}' has gone DOWN.\n"
+            f"Last ping: {event.last_ping_at or 'never'}\n"
+            f"Expected interval: {event.period}s (grace: {event.grace}s)\n"
+            f"\nView monitor: {settings.base_url}/monitors/{event.monitor_id}\n"
         )
     else:
         body = (
-            f"Monitor '{monitor.name}' has RECOVERED and is now UP.\n"
-            f"Ping received at: {monitor.last_ping_at}\n"
-            f"\nView monitor: {settings.base_url}/monitors/{monitor.id}\n"
+            f"Monitor '{event.monitor_name}' has RECOVERED and is now UP.\n"
+            f"Ping received at: {event.last_ping_at}\n"
+            f"\nView monitor: {settings.base_url}/monitors/{event.monitor_id}\n"
         )
 
     if settings.smtp_host == "localhost" and settings.smtp_port == 1025:
         # Dev mode — log to console
-        logger.info(f"EMAIL ALERT [{alert_type.upper()}] to={recipient} subject={subject}")
+        logger.info(f"EMAIL ALERT [{event.alert_type.upper()}] to={recipient} subject={subject}")
         logger.info(f"Body: {body}")
         return
 
-    try:
-        import aiosmtplib
-        from email.mime.text import MIMEText
-
-        msg = MIMEText(body)
-        msg["Subject"] = subject
-        msg["From"] = settings.smtp_from_email
-        msg["To"] = recipient
-
-        await aiosmtplib.send(
-            msg,
-            hostname=settings.smtp_host,
-            port=settings.smtp_port,
-            username=settings.smtp_user or None,
-            password=settings.smtp_password or None,
-            use_tls=settings.smtp_tls,
-        )
-    except Exception as e:
-        logger.error(f"Failed to send email alert: {e}")
+    import aiosmtplib
+    from email.mime.text import MIMEText
 
+    msg = MIMEText(body)
+    msg["Subject"] = subject
+    msg["From"] = settings.smtp_from_email
+    msg["To"] = recipient
+
+    await aiosmtplib.send(
+        msg,
+        hostname=settings.smtp_host,
+        port=settings.smtp_port,
+        username=settings.smtp_user or None,
+        password=settings.smtp_password or None,
+        use_tls=settings.smtp_tls,
+    )
 
-async def send_webhook_alert(monitor: Monitor, alert_type: str) -> None:
-    """Send webhook alert to user-configured URL."""
-    if not monitor.webhook_url:
-        return
 
-    payload = {
-        "monitor_name": monitor.name,
-        "monitor_slug": monitor.slug,
-        "status": alert_type,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "details": f"Monitor '{monitor.name}' is now {alert_type.upper()}.",
+async def post_webhook(url: str, payload: dict) -> None:
+    """POST a JSON payload to a webhook URL."""
+    async with httpx.AsyncClient(timeout=5.0) as client:
+        await client.post(url, json=payload)
+
+
+def webhook_payload(event: AlertEvent) -> dict:
+    return {
+        "monitor_name": event.monitor_name,
+        "monitor_slug": event.monitor_slug,
+        "status": event.alert_type,
+        "timestamp": event.timestamp.isoformat(),
+        "details": f"Monitor '{event.monitor_name}' is now {event.alert_type.upper()}.",
     }
 
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(monitor.webhook_url, json=payload)
-    except Exception as e:
-        logger.error(f"Failed to send webhook alert to {monitor.webhook_url}: {e}")
 
+class WebhookBatcher:
+    """Coalesces webhook payloads per URL into a single batched POST.
 
-async def send_down_alert(monitor: Monitor, db: AsyncSession) -> None:
-    """Send down alerts via all configured channels."""
-    # Get user
-    result = await db.execute(select(User).where(User.id == monitor.user_id))
-    user = result.scalar_one_or_none()
-    if not user:
+    A batch is sent when it reaches ``max_size`` events, when its oldest event
+    has waited ``max_wait`` seconds, or when ``flush()`` is called explicitly.
+
+    The checker enqueues a pass's alerts on the webhook workers, so they reach
+    the batcher after the pass has moved on. It reports each one with
+    ``expect()`` and ends the pass with ``flush_expected()``: a URL's batch is
+    then sent as soon as the last alert the pass enqueued for it is added,
+    without the pass waiting for delivery.
+    """
+
+    def __init__(self, max_size: int, max_wait: float):
+        self.max_size = max(max_size, 1)
+        self.max_wait = max_wait
+        self._pending: dict[str, list[dict]] = {}
+        self._timers: dict[str, asyncio.Task] = {}
+        # url -> events enqueued by a checker pass that have not been added yet
+        self._expected: dict[str, int] = {}
+        # URLs to send as soon as their expected events have all been added
+        self._send_on_arrival: set[str] = set()
+
+    def pending(self, url: str) -> int:
+        return len(self._pending.get(url, ()))
+
+    def expect(self, url: str) -> None:
+        """Note an event enqueued for ``url`` that the webhook workers will add later."""
+        if url in settings.webhook_batch_urls:
+            self._expected[url] = self._expected.get(url, 0) + 1
+
+    async def flush_expected(self) -> None:
+        """Send complete batches now and the rest once their expected events arrive."""
+        for url in list(self._pending):
+            if url not in self._expected:
+                await self.flush(url)
+        self._send_on_arrival.update(self._expected)
+
+    async def add(self, url: str, payload: dict) -> None:
+        events = self._pending.setdefault(url, [])
+        events.append(payload)
+        arrived = False
+        if url in self._expected:
+            self._expected[url] -= 1
+            if self._expected[url] <= 0:
+                del self._expected[url]
+                arrived = url in self._send_on_arrival
+                self._send_on_arrival.discard(url)
+        if len(events) >= self.max_size or arrived:
+            # Called from a webhook channel worker: a failed POST propagates to it
+            await self._send(url)
+        elif url not in self._timers:
+            self._timers[url] = asyncio.create_task(self._flush_later(url))
+
+    async def _flush_later(self, url: str) -> None:
+        await asyncio.sleep(self.max_wait)
+        self._timers.pop(url, None)
+        await self.flush(url)
+
+    async def _send(self, url: str) -> None:
+        timer = self._timers.pop(url, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        events = self._pending.pop(url, None)
+        if events:
+            await post_webhook(url, {"batch": True, "count": len(events), "events": events})
+
+    async def flush(self, url: str | None = None) -> None:
+        """Send pending batches now. Failures are logged and counted on the webhook pool."""
+        for target in [url] if url else list(self._pending):
+            try:
+                await self._send(target)
+            except Exception as e:
+                pool = get_pool("webhook")
+                if pool:
+                    pool.record_failure(f"batch to {target}", e)
+                else:
+                    logger.error(f"Failed to send batched webhook alert to {target}: {e}")
+
+
+webhook_batcher = WebhookBatcher(settings.webhook_batch_max_size, settings.webhook_batch_max_wait)
+
+
+async def send_webhook_alert(event: AlertEvent) -> None:
+    """Send webhook alert to user-configured URL.
+
+    URLs listed in ``settings.webhook_batch_urls`` opt into the batch format;
+    everything else receives one single-event POST per transition.
+    """
+    if not event.webhook_url:
         return
 
-    # Email alert
-    if user.email_alerts_enabled:
-        await send_email_alert(user, monitor, "down")
-        alert = Alert(
-            monitor_id=monitor.id,
-            alert_type="down",
-            channel="email",
-            details=f"Down alert sent to {user.alert_email or user.email}",
-        )
-        db.add(alert)
+    payload = webhook_payload(event)
+    if event.webhook_url in settings.webhook_batch_urls:
+        await webhook_batcher.add(event.webhook_url, payload)
+    else:
+        await post_webhook(event.webhook_url, payload)
 
-    # Webhook alert
-    if monitor.webhook_url:
-        await send_webhook_alert(monitor, "down")
-        alert = Alert(
-            monitor_id=monitor.id,
-            alert_type="down",
-            channel="webhook",
-            details=f"Down alert sent to {monitor.webhook_url}",
-        )
-        db.add(alert)
 
+class EmailChannel(Channel):
+    name = "email"
 
-async def send_recovery_alert(monitor: Monitor, db: AsyncSession) -> None:
-    """Send recovery alerts via all configured channels."""
+    def target(self, event: AlertEvent) -> str | None:
+        return event.alert_email
+
+    async def send(self, event: AlertEvent) -> None:
+        await send_email_alert(event)
+
+
+class WebhookChannel(Channel):
+    name = "webhook"
+
+    def target(self, event: AlertEvent) -> str | None:
+        return event.webhook_url
+
+    async def send(self, event: AlertEvent) -> None:
+        await send_webhook_alert(event)
+
+
+register_channel(EmailChannel())
+register_channel(WebhookChannel())
+
+
+async def flush_webhook_batches() -> None:
+    """Deliver everything queued for webhooks, then send any partial batches.
+
+    Used at shutdown; the checker only calls ``webhook_batcher.flush_expected()``
+    so a slow webhook target never holds up a pass.
+    """
+    pool = get_pool("webhook")
+    if pool:
+        await pool.drain()
+    await webhook_batcher.flush()
+
+
+async def send_alert(
+    monitor: Monitor, db: AsyncSession, alert_type: str
+) -> list[tuple[str, str]]:
+    """Dispatch a transition to every configured channel concurrently.
+
+    Delivery happens on the channel worker pools; an Alert row is recorded for
+    each channel that accepted the event. Returns ``(channel, target)`` for each.
+    """
     result = await db.execute(select(User).where(User.id == monitor.user_id))
     user = result.scalar_one_or_none()
     if not user:
-        return
+        return []
 
-    if user.email_alerts_enabled:
-        await send_email_alert(user, monitor, "up")
-        alert = Alert(
+    event = AlertEvent(
+        alert_type=alert_type,
+        monitor_id=monitor.id,
+        monitor_name=monitor.name,
+        monitor_slug=monitor.slug,
+        period=monitor.period,
+        grace=monitor.grace,
+        last_ping_at=monitor.last_ping_at,
+        webhook_url=monitor.webhook_url,
+        alert_email=(user.alert_email or user.email) if user.email_alerts_enabled else None,
+    )
+    label = "Down" if alert_type == "down" else "Recovery"
+    accepted = dispatch(event)
+    for channel, target in accepted:
+        db.add(Alert(
             monitor_id=monitor.id,
-            alert_type="up",
-            channel="email",
-            details=f"Recovery alert sent to {user.alert_email or user.email}",
-        )
-        db.add(alert)
+            alert_type=alert_type,
+            channel=channel,
+            details=f"{label} alert sent to {target}",
+        ))
+    return accepted
 
-    if monitor.webhook_url:
-        await send_webhook_alert(monitor, "up")
-        alert = Alert(
-            monitor_id=monitor.id,
-            alert_type="up",
-            channel="webhook",
-            details=f"Recovery alert sent to {monitor.webhook_url}",
-        )
-        db.add(alert)
+
+async def send_down_alert(monitor: Monitor, db: AsyncSession) -> list[tuple[str, str]]:
+    """Send down alerts via all configured channels."""
+    return await send_alert(monitor, db, "down")
+
+
+async def send_recovery_alert(monitor: Monitor, db: AsyncSession) -> None:
+    """Send recovery alerts via all configured channels."""
+    await send_alert(monitor, db, "up")
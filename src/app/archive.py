@@ -0,0 +1,341 @@
+"""Cold archive: move old pings out of the database into gzip segment files.
+
+Pings older than ``archive_after_days`` are written, oldest first, to one
+gzip NDJSON file per monitor per calendar month of the rows moved in a run
+(``<archive_dir>/<monitor_id>/<YYYY-MM>-<first ping id>.ndjson.gz``). Each
+file gets a ``PingSegment`` row recording its time and id range, committed
+in the same transaction that deletes the pings, so a ping is always either
+in the table or in exactly one indexed segment. Files are fully written and
+renamed into place before that commit.
+
+Segments are read back transparently: exports stream the segments that
+overlap the requested range before the live rows, and the monitor detail
+page continues into them once the live history runs out. Archived pings are
+always older than live ones, because the cutoff only moves forward.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from pathlib import Path
+
+from sqlalchemy import Select, delete, event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app import pagination
+from app.config import settings
+from app.database import async_session
+from app.models import Monitor, Ping, PingSegment, from_epoch, to_epoch
+
+logger = logging.getLogger("cronguard.archive")
+
+COLUMNS = ("id", "monitor_id", "created_at", "remote_addr", "user_agent")
+
+_PENDING_KEY = "cronguard_archive_unlink"
+
+
+def archive_root() -> Path:
+    return Path(settings.archive_dir)
+
+
+class SegmentWriter:
+    """Writes one segment to a temporary file; ``close`` renames it into place."""
+
+    def __init__(self, monitor_id: int, month: str, first):
+        self.month = month
+        relative = f"{monitor_id}/{month}-{first.id}.ndjson.gz"
+        self.path = archive_root() / relative
+        self.tmp = self.path.with_name(self.path.name + ".tmp")
+        self.segment = PingSegment(
+            monitor_id=monitor_id,
+            start_at=first.created_at,
+            end_at=first.created_at,
+            first_id=first.id,
+            last_id=first.id,
+            row_count=0,
+            path=relative,
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = gzip.open(self.tmp, "wt", encoding="utf-8")
+
+    def write(self, rows: list) -> None:
+        for row in rows:
+            line = dict(zip(COLUMNS, row))
+            line["created_at"] = row.created_at.isoformat()
+            self.file.write(json.dumps(line, separators=(",", ":")) + "\n")
+        self.segment.end_at = rows[-1].created_at
+        self.segment.last_id = max(self.segment.last_id, max(row.id for row in rows))
+        self.segment.row_count += len(rows)
+
+    def close(self) -> None:
+        self.file.close()
+        with open(self.tmp, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(self.tmp, self.path)
+
+    def discard(self) -> None:
+        self.file.close()
+        for path in (self.tmp, self.path):
+            path.unlink(missing_ok=True)
+
+
+async def archive_monitor(
+    db: AsyncSession, monitor_id: int, cutoff: datetime
+) -> list[PingSegment]:
+    """Write one monitor's pings older than ``cutoff`` to segments and delete them.
+
+    The deletes and segment rows are left pending on ``db`` for the caller to commit.
+    """
+    created = pagination.time_key(Ping.created_at)
+    bound = pagination.time_bound(Ping.created_at, cutoff)
+    query = (
+        select(Ping.id, Ping.monitor_id, Ping.created_at, Ping.remote_addr, Ping.user_agent)
+        .where(Ping.monitor_id == monitor_id, created < bound)
+        .order_by(created, Ping.id)
+    )
+
+    writers: list[SegmentWriter] = []
+    try:
+        result = await db.stream(query.execution_options(yield_per=settings.export_batch_size))
+        async for rows in result.partitions():
+            for month, group in groupby(rows, key=lambda r: r.created_at.strftime("%Y-%m")):
+                group = list(group)
+                if not writers or writers[-1].month != month:
+                    if writers:
+                        await asyncio.to_thread(writers[-1].close)
+                    writers.append(SegmentWriter(monitor_id, month, group[0]))
+                await asyncio.to_thread(writers[-1].write, group)
+        if writers:
+            await asyncio.to_thread(writers[-1].close)
+    except BaseException:
+        for writer in writers:
+            writer.discard()
+        raise
+
+    segments = [writer.segment for writer in writers]
+    if segments:
+        await db.execute(delete(Ping).where(Ping.monitor_id == monitor_id, created < bound))
+        db.add_all(segments)
+    return segments
+
+
+async def archive_old_pings(
+    cutoff: datetime | None = None,
+    session_factory: async_sessionmaker = async_session,
+) -> int:
+    """Archive every monitor's pings older than ``cutoff``; returns the number moved.
+
+    Defaults to ``archive_after_days`` ago and does nothing when that is 0.
+    Each monitor is archived in its own transaction.
+    """
+    if cutoff is None:
+        if settings.archive_after_days <= 0:
+            return 0
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None)
+        cutoff -= timedelta(days=settings.archive_after_days)
+
+    async with session_factory() as db:
+        result = await db.execute(
+            select(Ping.monitor_id)
+            .where(Ping.created_at < cutoff)
+            .distinct()
+        )
+        monitor_ids = result.scalars().all()
+
+    moved = 0
+    for monitor_id in monitor_ids:
+        segments = []
+        try:
+            async with session_factory() as db:
+                segments = await archive_monitor(db, monitor_id, cutoff)
+                await db.commit()
+        except Exception as e:
+            for segment in segments:
+                (archive_root() / segment.path).unlink(missing_ok=True)
+            logger.error(f"Archiving pings for monitor {monitor_id} failed: {e}")
+            continue
+        moved += sum(segment.row_count for segment in segments)
+
+    if moved:
+        logger.info(f"Archived {moved} pings from {len(monitor_ids)} monitors")
+    return moved
+
+
+def segments_query(
+    monitor_id: int | None = None,
+    user_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> Select:
+    """Segments of one monitor (or all of a user's) overlapping ``[since, until)``."""
+    query = select(PingSegment)
+    if monitor_id is not None:
+        query = query.where(PingSegment.monitor_id == monitor_id)
+    else:
+        owned = select(Monitor.id).where(Monitor.user_id == user_id)
+        query = query.where(PingSegment.monitor_id.in_(owned))
+    if since:
+        query = query.where(PingSegment.end_at >= since)
+    if until:
+        query = query.where(PingSegment.start_at < until)
+    return query.order_by(PingSegment.start_at, PingSegment.id)
+
+
+def _row(line: str) -> tuple:
+    data = json.loads(line)
+    data["created_at"] = datetime.fromisoformat(data["created_at"])
+    return tuple(data[column] for column in COLUMNS)
+
+
+def iter_segment(segment: PingSegment, batch_size: int) -> Iterator[list[tuple]]:
+    """Rows of a segment file in ``COLUMNS`` order, oldest first, ``batch_size`` at a time."""
+    with gzip.open(archive_root() / segment.path, "rt", encoding="utf-8") as f:
+        batch = []
+        for line in f:
+            batch.append(_row(line))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _in_range(created: datetime, since: datetime | None, until: datetime | None) -> bool:
+    return (since is None or created >= since) and (until is None or created < until)
+
+
+async def archived_rows(
+    segments: list[PingSegment],
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> AsyncIterator[list[tuple]]:
+    """Stream the rows of ``segments`` within ``[since, until)``; file reads run in a thread."""
+    for segment in segments:
+        batches = iter_segment(segment, settings.export_batch_size)
+        try:
+            while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+                rows = [row for row in batch if _in_range(row[2], since, until)]
+                if rows:
+                    yield rows
+        except FileNotFoundError:
+            logger.error(f"Archive segment {segment.path} is missing")
+        finally:
+            batches.close()
+
+
+def ping_key(ping: Ping) -> tuple[int, int]:
+    """Keyset cursor values for an archived ping, comparable with the history page's keys."""
+    return to_epoch(ping.created_at), ping.id
+
+
+def _newest_rows(
+    segment: PingSegment,
+    since: datetime | None,
+    until: datetime | None,
+    before_key: tuple | None,
+    count: int,
+) -> list[tuple]:
+    """The newest ``count`` rows of a segment in range and older than ``before_key``.
+
+    Files are oldest first and gzip only reads forward, so the file is
+    streamed keeping just the last ``count`` matches, and reading stops at
+    the first row past ``until`` or the cursor.
+    """
+    newest: deque[tuple] = deque(maxlen=count)
+    with gzip.open(archive_root() / segment.path, "rt", encoding="utf-8") as f:
+        for line in f:
+            row = _row(line)
+            if until is not None and row[2] >= until:
+                break
+            if before_key is not None and (row[2], row[0]) >= before_key:
+                break
+            if since is None or row[2] >= since:
+                newest.append(row)
+    newest.reverse()
+    return list(newest)
+
+
+async def archived_pings(
+    db: AsyncSession,
+    monitor_id: int,
+    since: datetime | None,
+    until: datetime | None,
+    before: tuple | None,
+    limit: int,
+) -> list[Ping]:
+    """Up to ``limit`` archived pings, newest first, older than the ``before`` cursor."""
+    upper = until
+    before_key = None
+    if before is not None:
+        if not isinstance(before[0], int):
+            return []
+        before_key = (from_epoch(before[0]), before[1])
+        # Segments starting after the cursor cannot hold older pings
+        newest = before_key[0] + timedelta(seconds=1)
+        upper = min(upper, newest) if upper else newest
+
+    query = segments_query(monitor_id, since=since, until=upper)
+    segments = (await db.execute(query.order_by(None).order_by(
+        PingSegment.start_at.desc(), PingSegment.id.desc()
+    ))).scalars().all()
+
+    # A monitor's segments never overlap in time, so newest first they yield
+    # pings newest first and the loop can stop as soon as it has enough
+    pings: list[Ping] = []
+    for segment in segments:
+        if len(pings) >= limit:
+            break
+        cursor = before_key
+        if cursor is not None:
+            if (segment.start_at, segment.first_id) >= cursor:
+                continue  # its oldest ping is already past the cursor
+            if segment.end_at < cursor[0]:
+                cursor = None  # wholly older than the cursor
+        try:
+            rows = await asyncio.to_thread(
+                _newest_rows, segment, since, until, cursor, limit - len(pings)
+            )
+        except FileNotFoundError:
+            logger.error(f"Archive segment {segment.path} is missing")
+            continue
+        pings.extend(Ping(**dict(zip(COLUMNS, row))) for row in rows)
+    return pings
+
+
+async def archived_count(db: AsyncSession, monitor_id: int) -> int:
+    result = await db.execute(
+        select(func.coalesce(func.sum(PingSegment.row_count), 0)).where(
+            PingSegment.monitor_id == monitor_id
+        )
+    )
+    return result.scalar()
+
+
+async def drop_segments(db: AsyncSession, monitor_id: int) -> None:
+    """Delete a monitor's segment rows; their files are removed once ``db`` commits."""
+    result = await db.execute(
+        delete(PingSegment)
+        .where(PingSegment.monitor_id == monitor_id)
+        .returning(PingSegment.path)
+    )
+    db.info.setdefault(_PENDING_KEY, []).extend(result.scalars().all())
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    for path in session.info.pop(_PENDING_KEY, ()):
+        try:
+            (archive_root() / path).unlink(missing_ok=True)
+        except OSError as e:
+            logger.error(f"Could not remove archive segment {path}: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
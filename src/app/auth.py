@@ -1,17 +1,26 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
-from fastapi import Depends, Request
+from fastapi import Depends, HTTPException, Request
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth_cache import auth_cache
 from app.config import settings
 from app.database import get_db
 from app.models import User
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is deliberately slow (~100-300ms) and releases the GIL, so handlers hash
+# on this bounded pool instead of the event loop; extra requests wait their turn.
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers, thread_name_prefix="bcrypt"
+)
+
 
 class AuthRequired(Exception):
     """Raised when user is not authenticated and should be redirected to login."""
@@ -26,6 +35,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def hash_password_async(password: str) -> str:
+    """``hash_password`` on the password pool, keeping the event loop free."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """``verify_password`` on the password pool, keeping the event loop free."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor, verify_password, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (
@@ -47,13 +70,24 @@ async def get_current_user(
     request: Request,
     db: AsyncSession = Depends(get_db),
 ) -> User:
-    """Extract user from JWT cookie or API key header."""
+    """Extract user from JWT cookie or API key header.
+
+    Resolved users are cached per key/token (see app.auth_cache), so repeat
+    requests usually skip both the user query and the JWT signature check.
+    """
     # Try API key first
     api_key = request.headers.get("X-Api-Key")
     if api_key:
-        result = await db.execute(select(User).where(User.api_key == api_key, User.is_active.is_(True)))
+        user = await auth_cache.get(db, ("key", api_key))
+        if user:
+            return user
+        version = auth_cache.version
+        result = await db.execute(
+            select(User).where(User.api_key == api_key, User.is_active.is_(True))
+        )
         user = result.scalar_one_or_none()
         if user:
+            auth_cache.put(("key", api_key), user, version)
             return user
 
     # Try JWT cookie
@@ -61,6 +95,11 @@ async def get_current_user(
     if not token:
         raise AuthRequired()
 
+    user = await auth_cache.get(db, ("jwt", token))
+    if user:
+        return user
+    version = auth_cache.version
+
     payload = decode_access_token(token)
     if payload is None:
         raise AuthRequired()
@@ -74,9 +113,25 @@ async def get_current_user(
     if user is None:
         raise AuthRequired()
 
+    auth_cache.put(("jwt", token), user, version, expires_at=payload.get("exp"))
     return user
 
 
+async def get_api_user(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Same as get_current_user but answers 401 instead of redirecting to the login page."""
+    try:
+        return await get_current_user(request, db)
+    except AuthRequired:
+        raise HTTPException(
+            status_code=401,
+            detail="Authentication required",
+            headers={"WWW-Authenticate": "X-Api-Key"},
+        )
+
+
 async def get_current_user_optional(
     request: Request,
     db: AsyncSession = Depends(get_db),
@@ -0,0 +1,111 @@
+"""Bounded, TTL'd cache of authenticated users.
+
+Maps an API key or a session JWT to a detached snapshot of its (active)
+user, so steady-state authenticated requests skip both the user query and,
+for cookies, the JWT signature check. A hit is attached to the request's
+session with ``merge(load=False)``, which issues no SQL, so handlers still
+get a normal, session-bound ``User`` they can modify.
+
+Any ORM flush that updates or deletes a user (new API key, password change,
+deactivation, profile edits) drops that user's entries immediately, and again
+after the commit so a request that read the old row mid-transaction cannot
+put it back. Bulk ``update(User)`` statements bypass this; use the ORM.
+"""
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+
+from app.config import settings
+from app.models import User
+
+_PENDING_KEY = "cronguard_auth_invalidations"
+
+# ("key", api_key) or ("jwt", token)
+CacheKey = tuple[str, str]
+
+
+class AuthCache:
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[CacheKey, tuple[User, float]] = OrderedDict()
+        self._keys_by_user: dict[int, set[CacheKey]] = {}
+        # Bumped on every invalidation so a lookup that raced with one is not stored
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, db: AsyncSession, key: CacheKey) -> User | None:
+        """The cached user for ``key``, attached to ``db`` without a query; None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            if entry is not None:
+                self._discard(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return await db.merge(entry[0], load=False)
+
+    def put(self, key: CacheKey, user: User, version: int, expires_at: float | None = None):
+        """Cache a snapshot of ``user`` unless an invalidation happened since ``version``."""
+        if version != self.version or self.max_size <= 0:
+            return
+        snapshot = User(**{
+            attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs
+        })
+        make_transient_to_detached(snapshot)
+        deadline = time.monotonic() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, time.monotonic() + expires_at - time.time())
+
+        self._discard(key)
+        self._entries[key] = (snapshot, deadline)
+        self._keys_by_user.setdefault(user.id, set()).add(key)
+        while len(self._entries) > self.max_size:
+            self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int) -> None:
+        self.version += 1
+        for key in self._keys_by_user.pop(user_id, ()):
+            self._entries.pop(key, None)
+
+    def _discard(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._keys_by_user.get(entry[0].id)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_user[entry[0].id]
+
+    def clear(self) -> None:
+        self.version += 1
+        self._entries.clear()
+        self._keys_by_user.clear()
+
+
+auth_cache = AuthCache(settings.auth_cache_size, settings.auth_cache_ttl)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _on_user_changed(mapper, connection, target: User) -> None:
+    auth_cache.invalidate_user(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        auth_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,218 @@
+"""Notification channel framework.
+
+Every channel type (email, webhook, ...) is registered once and gets its own
+bounded queue and worker pool, so a slow SMTP server never delays webhook
+delivery and vice versa. ``dispatch`` hands one transition to every channel
+configured for it at the same time and returns without waiting for delivery.
+"""
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from app import metrics
+from app.config import settings
+
+logger = logging.getLogger("cronguard.channels")
+
+
+@dataclass(frozen=True)
+class AlertEvent:
+    """A status transition, snapshotted so workers never touch the DB session."""
+
+    alert_type: str  # "down" or "up" (recovery)
+    monitor_id: int
+    monitor_name: str
+    monitor_slug: str
+    period: int
+    grace: int
+    last_ping_at: datetime | None
+    webhook_url: str | None
+    alert_email: str | None  # None when the owner has email alerts disabled
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class Channel(ABC):
+    """Base class for a notification channel.
+
+    Subclasses set ``name`` and implement ``target`` (where the event would be
+    delivered, or None if this channel is not configured for it) and ``send``.
+    ``send`` should raise on failure so the pool can count it.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def target(self, event: AlertEvent) -> str | None:
+        ...
+
+    @abstractmethod
+    async def send(self, event: AlertEvent) -> None:
+        ...
+
+
+@dataclass
+class ChannelStats:
+    sent: int = 0
+    failed: int = 0
+    dropped: int = 0
+    latency_total: float = 0.0  # seconds
+    latency_max: float = 0.0
+
+
+class ChannelPool:
+    """A bounded queue plus a fixed set of workers delivering for one channel."""
+
+    def __init__(self, channel: Channel, workers: int, queue_size: int):
+        self.channel = channel
+        self.workers = max(workers, 1)
+        self.queue_size = queue_size
+        self.stats = ChannelStats()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _ensure_started(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use, or the previous loop is gone (tests run one loop per test)
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+        return self._queue
+
+    def submit(self, event: AlertEvent) -> bool:
+        """Enqueue an event without waiting. Returns False if the queue is full."""
+        queue = self._ensure_started()
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.stats.dropped += 1
+            logger.error(
+                f"{self.channel.name} queue full ({self.queue_size}); "
+                f"dropped {event.alert_type} alert for monitor {event.monitor_id}"
+            )
+            return False
+        return True
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            event = await queue.get()
+            started = time.perf_counter()
+            try:
+                await self.channel.send(event)
+                self.stats.sent += 1
+            except Exception as e:
+                self.record_failure(f"{event.alert_type} alert for monitor {event.monitor_id}", e)
+            finally:
+                elapsed = time.perf_counter() - started
+                self.stats.latency_total += elapsed
+                self.stats.latency_max = max(self.stats.latency_max, elapsed)
+                metrics.alert_latency.observe(elapsed, self.channel.name)
+                queue.task_done()
+
+    def record_failure(self, what: str, error: Exception) -> None:
+        """Count a delivery failure, including ones outside the workers (e.g. timed batches)."""
+        self.stats.failed += 1
+        logger.error(f"Failed to send {self.channel.name} {what}: {error}")
+
+    async def drain(self) -> None:
+        """Wait until every queued event has been delivered (or has failed)."""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        if self._loop is asyncio.get_running_loop():
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._loop = None
+
+
+_pools: dict[str, ChannelPool] = {}
+
+
+def register_channel(
+    channel: Channel, workers: int | None = None, queue_size: int | None = None
+) -> ChannelPool:
+    """Register a channel type with its own worker pool. Re-registering replaces it."""
+    pool = ChannelPool(
+        channel,
+        workers=workers or settings.channel_workers,
+        queue_size=queue_size or settings.channel_queue_size,
+    )
+    _pools[channel.name] = pool
+    return pool
+
+
+def get_pool(name: str) -> ChannelPool | None:
+    return _pools.get(name)
+
+
+def get_pools() -> list[ChannelPool]:
+    return list(_pools.values())
+
+
+def dispatch(event: AlertEvent) -> list[tuple[str, str]]:
+    """Enqueue an event on every channel configured for it.
+
+    Returns ``(channel name, target)`` for each channel that accepted the event.
+    """
+    accepted = []
+    for pool in _pools.values():
+        target = pool.channel.target(event)
+        if target and pool.submit(event):
+            accepted.append((pool.channel.name, target))
+    return accepted
+
+
+async def drain_channels() -> None:
+    await asyncio.gather(*(pool.drain() for pool in _pools.values()))
+
+
+async def stop_channels() -> None:
+    await asyncio.gather(*(pool.stop() for pool in _pools.values()))
+
+
+def channel_stats() -> dict[str, dict]:
+    """Per-channel delivery counters, latency and current queue depth."""
+    stats = {}
+    for name, pool in _pools.items():
+        s = pool.stats
+        delivered = s.sent + s.failed
+        stats[name] = {
+            "queue_depth": pool.queue_depth,
+            "queue_size": pool.queue_size,
+            "workers": pool.workers,
+            "sent": s.sent,
+            "failed": s.failed,
+            "dropped": s.dropped,
+            "latency_avg": s.latency_total / delivered if delivered else 0.0,
+            "latency_max": s.latency_max,
+        }
+    return stats
+
+
+@metrics.collected(
+    "cronguard_alerts_total", "Alert deliveries per channel: sent, failed or dropped.", "counter"
+)
+def _alert_samples() -> metrics.Samples:
+    for name, pool in _pools.items():
+        yield {"channel": name, "result": "sent"}, pool.stats.sent
+        yield {"channel": name, "result": "failed"}, pool.stats.failed
+        yield {"channel": name, "result": "dropped"}, pool.stats.dropped
+
+
+@metrics.collected("cronguard_alert_queue_depth", "Alerts waiting in each channel's queue.")
+def _queue_samples() -> metrics.Samples:
+    for name, pool in _pools.items():
+        yield {"channel": name}, pool.queue_depth
@@ -1,15 +1,28 @@
 import logging
-from datetime import datetime, timezone, timedelta
+import time
+from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from app import alerts, metrics
 from app.database import async_session
-from app.models import Monitor
+from app.models import Monitor, to_epoch
 from app.alerts import send_down_alert
+from app.transitions import change_status
 
 logger = logging.getLogger("cronguard.checker")
 
+# Built once; each run only binds ``now`` and reuses the cached compiled SQL.
+# Walks ix_monitors_status_deadline, so healthy monitors are never read. On
+# PostgreSQL the rows are locked until commit and rows another checker holds
+# are skipped, so several instances never alert twice; SQLite ignores the clause.
+OVERDUE_MONITORS = (
+    select(Monitor)
+    .where(Monitor.status == "up", Monitor.deadline_at < bindparam("now"))
+    .with_for_update(skip_locked=True)
+)
+
 
 async def check_overdue_monitors(
     session_factory: async_sessionmaker | None = None,
@@ -18,33 +31,35 @@ async def check_overdue_monitors(
     logger.info("Running overdue monitor check...")
 
     factory = session_factory or async_session
+    # Looked up per pass: the channel workers add to whichever batcher is current
+    batcher = alerts.webhook_batcher
+    started = time.perf_counter()
     async with factory() as db:
         try:
             now = datetime.now(timezone.utc)
 
-            # Find monitors that are "up" but overdue
-            result = await db.execute(
-                select(Monitor).where(
-                    Monitor.status.in_(["up"]),
-                    Monitor.last_ping_at.isnot(None),
-                )
-            )
-            monitors = result.scalars().all()
-
             down_count = 0
-            for monitor in monitors:
-                deadline = monitor.last_ping_at.replace(tzinfo=timezone.utc) + timedelta(
-                    seconds=monitor.period + monitor.grace
+            result = await db.execute(OVERDUE_MONITORS, {"now": now})
+            for monitor in result.scalars():
+                logger.warning(
+                    f"Monitor '{monitor.name}' (id={monitor.id}) is overdue — marking DOWN"
                 )
-                if now > deadline:
-                    logger.warning(f"Monitor '{monitor.name}' (id={monitor.id}) is overdue — marking DOWN")
-                    monitor.status = "down"
-                    await send_down_alert(monitor, db)
-                    down_count += 1
+                metrics.checker_lag.observe(to_epoch(now) - to_epoch(monitor.deadline_at))
+                change_status(monitor, "down", now)
+                for channel, target in await send_down_alert(monitor, db):
+                    if channel == "webhook":
+                        batcher.expect(target)
+                down_count += 1
 
             await db.commit()
-            logger.info(f"Checker complete: {down_count} monitor(s) marked DOWN out of {len(monitors)} checked")
+            # One batch per URL per pass, sent once the workers have added its alerts
+            await batcher.flush_expected()
+            logger.info(f"Checker complete: {down_count} monitor(s) marked DOWN")
+            metrics.checker_runs.inc("ok")
 
         except Exception as e:
             logger.error(f"Error in checker: {e}")
             await db.rollback()
+            metrics.checker_runs.inc("error")
+        finally:
+            metrics.checker_duration.observe(time.perf_counter() - started)
@@ -0,0 +1,96 @@
+"""Command-line client for CronGuard.
+
+    cronguard sync monitors.json [--dry-run]
+
+Pushes a JSON manifest (a list of monitors, or ``{"monitors": [...]}``) to
+``/api/v1/monitors/sync`` and prints the resulting plan. The server URL and
+API key come from ``--url``/``--api-key`` or ``CRONGUARD_BASE_URL`` and
+``CRONGUARD_API_KEY``.
+"""
+import argparse
+import json
+import os
+import sys
+
+import httpx
+
+
+def load_manifest(path: str) -> list[dict]:
+    if path == "-":
+        data = json.load(sys.stdin)
+    else:
+        with open(path) as f:
+            data = json.load(f)
+    return data["monitors"] if isinstance(data, dict) else data
+
+
+def format_plan(plan: dict) -> str:
+    lines = []
+    for name in plan["create"]:
+        lines.append(f"+ {name}")
+    for item in plan["update"]:
+        changes = ", ".join(
+            f"{key}: {old!r} -> {new!r}" for key, (old, new) in item["changes"].items()
+        )
+        lines.append(f"~ {item['name']} ({changes})")
+    for item in plan["delete"]:
+        lines.append(f"- {item['name']}")
+    verb = "Would apply" if plan["dry_run"] else "Applied"
+    lines.append(
+        f"{verb}: {len(plan['create'])} to create, {len(plan['update'])} to update, "
+        f"{len(plan['delete'])} to delete, {plan['unchanged']} unchanged."
+    )
+    return "\n".join(lines)
+
+
+def sync(args: argparse.Namespace) -> int:
+    if not args.api_key:
+        print("An API key is required (--api-key or CRONGUARD_API_KEY).", file=sys.stderr)
+        return 2
+    try:
+        monitors = load_manifest(args.manifest)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Could not read manifest: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        response = httpx.post(
+            f"{args.url.rstrip('/')}/api/v1/monitors/sync",
+            params={"dry_run": "true"} if args.dry_run else None,
+            json={"monitors": monitors},
+            headers={"X-Api-Key": args.api_key},
+            timeout=args.timeout,
+        )
+    except httpx.HTTPError as e:
+        print(f"Request failed: {e}", file=sys.stderr)
+        return 1
+    if response.status_code != 200:
+        print(f"Sync failed ({response.status_code}): {response.text}", file=sys.stderr)
+        return 1
+
+    print(format_plan(response.json()))
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="cronguard")
+    parser.add_argument(
+        "--url", default=os.environ.get("CRONGUARD_BASE_URL", "http://localhost:8000")
+    )
+    parser.add_argument("--api-key", default=os.environ.get("CRONGUARD_API_KEY"))
+    parser.add_argument("--timeout", type=float, default=30.0)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = commands.add_parser("sync", help="make monitors match a JSON manifest")
+    sync_parser.add_argument("manifest", help="path to the manifest, or - for stdin")
+    sync_parser.add_argument(
+        "--dry-run", action="store_true", help="show the plan without changing anything"
+    )
+    sync_parser.set_defaults(handler=sync)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,6 @@
 from pathlib import Path
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -11,11 +13,34 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = f"sqlite+aiosqlite:///{BASE_DIR / 'cronguard.db'}"
+    # Read-only traffic (dashboard, badges, status pages) uses its own pool: this URL
+    # (e.g. a replica) if set, otherwise read-only connections to database_url
+    database_read_url: str = ""
+    database_read_pool_size: int = 8
+    # Connection pool for server databases (PostgreSQL via postgresql+asyncpg://...);
+    # database_pool_size is also the write pool size for a SQLite file
+    database_pool_size: int = 5
+    database_max_overflow: int = 10  # extra connections opened under load, closed when idle
+    database_pool_timeout: int = 30  # seconds to wait for a free connection
+    database_pool_recycle: int = 1800  # seconds before a connection is replaced; -1 never
+    database_pool_pre_ping: bool = False  # test connections on checkout (drops after failover)
+    # SQLite connection profile, applied as PRAGMAs on connect ("" keeps SQLite's default)
+    sqlite_journal_mode: Literal["", "wal", "delete", "truncate", "persist", "memory"] = "wal"
+    sqlite_synchronous: Literal["", "off", "normal", "full", "extra"] = "normal"
+    sqlite_busy_timeout: int = 5000  # ms a connection waits for a lock before erroring
+    sqlite_cache_size: int = -20000  # pages, or KiB when negative (20 MB)
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # bytes of the file to memory-map
+    sqlite_temp_store: Literal["", "default", "file", "memory"] = "memory"
 
     # Auth
     secret_key: str = "change-me-in-production-use-a-real-secret-key"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60 * 24  # 24 hours
+    # Authenticated users cached per API key / session token
+    auth_cache_size: int = 10000
+    auth_cache_ttl: int = 60  # seconds; changes to a user drop their entries immediately
+    # Threads that may run bcrypt at once; further logins queue rather than block pings
+    password_hash_workers: int = 4
 
     # SMTP (email alerts)
     smtp_host: str = "localhost"
@@ -25,6 +50,65 @@ class Settings(BaseSettings):
     smtp_tls: bool = False
     smtp_from_email: str = "alerts@cronguard.dev"
 
+    # Alert channels: each channel type gets its own worker pool and bounded queue
+    channel_workers: int = 4
+    channel_queue_size: int = 1000
+
+    # Webhook batching: URLs listed here receive an array of transitions per POST
+    webhook_batch_urls: list[str] = []
+    webhook_batch_max_size: int = 50
+    webhook_batch_max_wait: float = 5.0  # seconds
+
+    # Status badges: browsers/CDNs may reuse a badge for this many seconds before revalidating
+    badge_max_age: int = 60
+    status_page_max_age: int = 30
+    # Seconds an uptime figure shown on public badges is reused (dropped early on status change)
+    uptime_cache_ttl: int = 60
+
+    # Rate limits: token buckets refilling at *_rate per minute up to *_burst (0 disables)
+    ping_rate_per_slug: float = 60
+    ping_burst_per_slug: int = 10
+    ping_rate_per_ip: float = 3000
+    ping_burst_per_ip: int = 200
+    login_rate_per_ip: float = 30
+    login_burst_per_ip: int = 20
+    login_rate_per_account: float = 6
+    login_burst_per_account: int = 10
+    register_rate_per_ip: float = 3
+    register_burst_per_ip: int = 10
+    rate_limit_max_keys: int = 100_000  # buckets kept per limiter
+
+    # Dashboard: monitors per page (keyset pagination)
+    dashboard_page_size: int = 50
+    # Monitor detail: pings per history page (keyset pagination)
+    ping_page_size: int = 50
+    # Monitor detail: recent activity covers this many UTC days (per-day counters kept)
+    ping_count_days: int = 7
+    # Minutes between runs of the job that repairs drifted counters (0 = never)
+    counter_reconcile_minutes: int = 60
+    # Distinct ping user agents / source addresses whose lookup ids are kept in memory
+    intern_cache_size: int = 10000
+
+    # JSON API
+    api_max_page_size: int = 500
+    api_bulk_max_items: int = 1000  # operations per /api/v1/monitors/bulk request
+    sync_max_items: int = 10000  # monitors per /api/v1/monitors/sync manifest
+    export_batch_size: int = 1000  # rows fetched per cursor round-trip when exporting
+
+    # Cold archive: pings older than this many days move to gzip segment files (0 = never)
+    archive_after_days: int = 0
+    archive_dir: str = str(BASE_DIR / "archive")
+
+    # Live dashboard (Server-Sent Events)
+    live_max_connections: int = 1000
+    live_max_connections_per_user: int = 10
+    live_queue_size: int = 100  # events buffered per connection before it is dropped
+    live_heartbeat: float = 15.0  # seconds between keepalive comments
+    live_retry_ms: int = 3000  # browser reconnect delay
+
+    # Prometheus metrics at /metrics (requests, pings, checker, alerts, DB pools)
+    metrics_enabled: bool = True
+
     # App URL (for ping URLs displayed to users)
     base_url: str = "http://localhost:8000"
 
@@ -0,0 +1,309 @@
+"""Maintained counters, so pages read counts instead of computing them.
+
+- ``Monitor.ping_count``: pings ever recorded for a monitor, archived ones
+  included. The ping path bumps it in the statement that stamps the monitor.
+- ``PingDay``: pings per monitor per UTC day, summed over the last
+  ``ping_count_days`` days on the monitor detail page.
+- ``MonitorStatusCount``: a user's monitors per status, for the dashboard.
+
+The ping path writes its counts directly. Everything that goes through the
+ORM is counted by the mapper events in app.models: each monitor inserted,
+deleted or moved to another status, and each ``Ping`` added, is queued on
+the session, and each flush ends with one batch of upserts. That covers the
+checker, the HTML forms, the JSON API and manifest sync alike.
+
+Each change is written in the transaction that makes the change it counts,
+so the two commit or roll back together. Writes that go around the ORM (a
+bulk ``UPDATE monitors SET status = ...``) or a restored backup can still
+let them drift; ``reconcile_counters`` recounts them one monitor (or user)
+at a time and puts right any that are wrong.
+"""
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import bindparam, delete, event, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, object_session
+
+from app import pagination
+from app.config import settings
+from app.database import async_session
+from app.models import Monitor, MonitorStatusCount, Ping, PingDay, PingSegment, to_epoch
+
+logger = logging.getLogger("cronguard.counters")
+
+DAY = 86400
+
+_PENDING_KEY = "cronguard_counts"
+
+monitors = Monitor.__table__
+ping_days = PingDay.__table__
+status_counts = MonitorStatusCount.__table__
+
+
+def _increment(dialect_insert, table, keys: tuple[str, ...], column: str):
+    """``INSERT`` a row, or add its ``column`` to the existing row with the same keys."""
+    insert = dialect_insert(table)
+    return insert.on_conflict_do_update(
+        index_elements=list(keys), set_={column: table.c[column] + insert.excluded[column]}
+    )
+
+
+# Built once per dialect, like the ping path's statements
+COUNT_PING_DAY = {
+    name: _increment(dialect_insert, ping_days, ("monitor_id", "day"), "pings")
+    for name, dialect_insert in (("sqlite", sqlite.insert), ("postgresql", postgresql.insert))
+}
+SHIFT_STATUS_COUNT = {
+    name: _increment(dialect_insert, status_counts, ("user_id", "status"), "monitors")
+    for name, dialect_insert in (("sqlite", sqlite.insert), ("postgresql", postgresql.insert))
+}
+COUNT_PINGS = (
+    update(monitors)
+    .where(monitors.c.id == bindparam("monitor_id"))
+    .values(ping_count=monitors.c.ping_count + bindparam("pings"))
+)
+
+
+def epoch_day(at: datetime) -> int:
+    return to_epoch(at) // DAY
+
+
+async def count_ping_day(db: AsyncSession, monitor_id: int, at: datetime) -> None:
+    """Add one ping to ``monitor_id``'s count for the day of ``at``."""
+    await db.execute(
+        COUNT_PING_DAY[db.get_bind().dialect.name],
+        {"monitor_id": monitor_id, "day": epoch_day(at), "pings": 1},
+    )
+
+
+async def count_ping(db: AsyncSession, monitor_id: int, at: datetime) -> None:
+    """Count a ping inserted directly for a monitor ``STAMP_UP_MONITOR`` did not stamp."""
+    await db.execute(COUNT_PINGS, {"monitor_id": monitor_id, "pings": 1})
+    await count_ping_day(db, monitor_id, at)
+
+
+def _pending(instance) -> dict[str, Counter]:
+    return object_session(instance).info.setdefault(
+        _PENDING_KEY, {"statuses": Counter(), "pings": Counter()}
+    )
+
+
+def shift_status_counts(monitor: Monitor, deltas: dict[str, int]) -> None:
+    """Queue ``{status: delta}`` for the monitor's user; written as the flush ends."""
+    statuses = _pending(monitor)["statuses"]
+    for status, delta in deltas.items():
+        statuses[monitor.user_id, status] += delta
+
+
+def count_flushed_ping(ping: Ping) -> None:
+    """Queue the counts for a ``Ping`` inserted through the ORM."""
+    _pending(ping)["pings"][ping.monitor_id, epoch_day(ping.created_at)] += 1
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    connection = session.connection()
+    dialect = connection.dialect.name
+    statuses = [
+        {"user_id": user_id, "status": status, "monitors": delta}
+        for (user_id, status), delta in pending["statuses"].items()
+        if delta
+    ]
+    if statuses:
+        connection.execute(SHIFT_STATUS_COUNT[dialect], statuses)
+    if pending["pings"]:
+        totals = Counter()
+        for (monitor_id, _), pings in pending["pings"].items():
+            totals[monitor_id] += pings
+        connection.execute(
+            COUNT_PINGS,
+            [{"monitor_id": monitor_id, "pings": pings} for monitor_id, pings in totals.items()],
+        )
+        connection.execute(
+            COUNT_PING_DAY[dialect],
+            [
+                {"monitor_id": monitor_id, "day": day, "pings": pings}
+                for (monitor_id, day), pings in pending["pings"].items()
+            ],
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+async def user_status_counts(db: AsyncSession, user_id: int) -> dict[str, int]:
+    """A user's monitors per status, from at most one row per status."""
+    result = await db.execute(
+        select(MonitorStatusCount.status, MonitorStatusCount.monitors).where(
+            MonitorStatusCount.user_id == user_id
+        )
+    )
+    return dict(result.tuples().all())
+
+
+async def recent_pings(db: AsyncSession, monitor_id: int, days: int) -> int:
+    """Pings ``monitor_id`` received over the last ``days`` UTC days, today included."""
+    today = epoch_day(datetime.now(timezone.utc))
+    result = await db.execute(
+        select(func.coalesce(func.sum(PingDay.pings), 0)).where(
+            PingDay.monitor_id == monitor_id, PingDay.day > today - days
+        )
+    )
+    return result.scalar()
+
+
+# Taken before a monitor's counters are recounted. The ping path and the ORM
+# update the monitor row before its counters, so a ping committing meanwhile
+# either lands before the lock (and is counted) or waits for it (and adds to
+# the repaired value); its increment is never overwritten. SQLite ignores the
+# clause; its single writer fails the transaction instead of losing a write.
+LOCK_MONITOR = (
+    select(monitors.c.id).where(monitors.c.id == bindparam("monitor_id")).with_for_update()
+)
+LOCK_USER_MONITORS = (
+    select(monitors.c.id).where(monitors.c.user_id == bindparam("user_id")).with_for_update()
+)
+
+
+async def _repair(
+    db: AsyncSession, table, keys: tuple[str, str], column: str, actual: dict, stored: dict
+) -> int:
+    """Rewrite the rows of ``table`` whose ``column`` differs from ``actual``."""
+    wrong = [
+        key for key in actual.keys() | stored.keys() if actual.get(key, 0) != stored.get(key, 0)
+    ]
+    if not wrong:
+        return 0
+    await db.execute(
+        delete(table).where(*(table.c[name] == bindparam(f"key_{name}") for name in keys)),
+        [{f"key_{name}": value for name, value in zip(keys, key)} for key in wrong],
+    )
+    rows = [{**dict(zip(keys, key)), column: actual[key]} for key in wrong if actual.get(key)]
+    if rows:
+        await db.execute(table.insert(), rows)
+    return len(wrong)
+
+
+def _by_key(rows) -> dict:
+    """``(key 1, key 2, count)`` rows as ``{(key 1, key 2): count}``."""
+    return {(first, second): count for first, second, count in rows}
+
+
+async def _reconcile_monitor(db: AsyncSession, monitor_id: int, first_day: int) -> int:
+    """Recount one monitor's ``ping_count`` and its per-day counts from ``first_day``."""
+    await db.execute(LOCK_MONITOR, {"monitor_id": monitor_id})
+
+    # Both read the index on (monitor_id, ...), never the whole table
+    live = select(func.count()).where(Ping.monitor_id == monitor_id).scalar_subquery()
+    archived = (
+        select(func.coalesce(func.sum(PingSegment.row_count), 0))
+        .where(PingSegment.monitor_id == monitor_id)
+        .scalar_subquery()
+    )
+    expected = live + archived
+    result = await db.execute(
+        update(monitors)
+        .where(monitors.c.id == monitor_id, monitors.c.ping_count != expected)
+        # A repaired counter is not an edit of the monitor
+        .values(ping_count=expected, updated_at=monitors.c.updated_at)
+    )
+    repaired = result.rowcount
+
+    created = pagination.time_key(Ping.created_at)
+    actual = await db.execute(
+        select(Ping.monitor_id, created // DAY, func.count())
+        .where(Ping.monitor_id == monitor_id, created >= first_day * DAY)
+        .group_by(Ping.monitor_id, created // DAY)
+    )
+    stored = await db.execute(
+        select(ping_days.c.monitor_id, ping_days.c.day, ping_days.c.pings).where(
+            ping_days.c.monitor_id == monitor_id, ping_days.c.day >= first_day
+        )
+    )
+    return repaired + await _repair(
+        db, ping_days, ("monitor_id", "day"), "pings", _by_key(actual), _by_key(stored)
+    )
+
+
+async def _reconcile_user(db: AsyncSession, user_id: int) -> int:
+    """Recount one user's monitors per status."""
+    # Monitor rows, then counter rows: the order status changes take them in
+    await db.execute(LOCK_USER_MONITORS, {"user_id": user_id})
+    stored = await db.execute(
+        select(status_counts.c.user_id, status_counts.c.status, status_counts.c.monitors)
+        .where(status_counts.c.user_id == user_id)
+        .with_for_update()
+    )
+    actual = await db.execute(
+        select(Monitor.user_id, Monitor.status, func.count())
+        .where(Monitor.user_id == user_id)
+        .group_by(Monitor.user_id, Monitor.status)
+    )
+    return await _repair(
+        db, status_counts, ("user_id", "status"), "monitors", _by_key(actual), _by_key(stored)
+    )
+
+
+async def _reconcile_in_transaction(factory: async_sessionmaker, reconcile, *args) -> int:
+    async with factory() as db:
+        try:
+            repaired = await reconcile(db, *args)
+            await db.commit()
+            return repaired
+        except Exception as e:
+            owner = reconcile.__name__.removeprefix("_reconcile_")
+            logger.error(f"Error reconciling counters for {owner} {args[0]}: {e}")
+            await db.rollback()
+            return 0
+
+
+async def reconcile_counters(session_factory: async_sessionmaker | None = None) -> int:
+    """Recompute every counter from the source tables and fix any that drifted.
+
+    Each monitor's ping counts, and each user's status counts, are recounted
+    and repaired in a transaction of their own that first locks the rows the
+    live paths update, so a count committed meanwhile is never lost. Per-day
+    counts are only checked within ``ping_count_days`` (and after the archive
+    cutoff); older ones are dropped. Returns how many counters were wrong.
+    """
+    factory = session_factory or async_session
+    now = datetime.now(timezone.utc)
+    first_day = epoch_day(now) - settings.ping_count_days + 1
+
+    async with factory() as db:
+        try:
+            await db.execute(delete(ping_days).where(ping_days.c.day < first_day))
+            await db.commit()
+            monitor_ids = (await db.execute(select(Monitor.id))).scalars().all()
+            user_ids = (await db.execute(
+                select(Monitor.user_id).union(select(status_counts.c.user_id))
+            )).scalars().all()
+        except Exception as e:
+            logger.error(f"Error reconciling counters: {e}")
+            await db.rollback()
+            return 0
+
+    if settings.archive_after_days > 0:
+        # The archive has taken some pings of earlier days; leave those days as they are
+        cutoff = now - timedelta(days=settings.archive_after_days)
+        first_day = max(first_day, epoch_day(cutoff) + 1)
+
+    repaired = 0
+    for monitor_id in monitor_ids:
+        repaired += await _reconcile_in_transaction(
+            factory, _reconcile_monitor, monitor_id, first_day
+        )
+    for user_id in user_ids:
+        repaired += await _reconcile_in_transaction(factory, _reconcile_user, user_id)
+
+    if repaired:
+        logger.warning(f"Reconciled {repaired} drifted counter(s)")
+    return repaired
@@ -1,22 +1,215 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from sqlalchemy import URL, event, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, ORMExecuteState, Session
 
 from app.config import settings
 
-engine = create_async_engine(settings.database_url, echo=settings.debug)
+
+def sqlite_pragmas() -> dict[str, str | int]:
+    """Per-connection SQLite settings from ``Settings``; an empty value keeps SQLite's default."""
+    pragmas = {
+        # WAL lets readers run alongside the writer; NORMAL syncs at checkpoints only
+        # (durable against app crashes, may lose the last commits on power loss)
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "busy_timeout": settings.sqlite_busy_timeout,
+        "cache_size": settings.sqlite_cache_size,
+        "mmap_size": settings.sqlite_mmap_size,
+        "temp_store": settings.sqlite_temp_store,
+    }
+    pragmas = {name: value for name, value in pragmas.items() if value not in ("", None)}
+    # Off by default in SQLite; the schema relies on ON DELETE CASCADE
+    pragmas["foreign_keys"] = "on"
+    return pragmas
+
+
+def apply_sqlite_pragmas(engine: AsyncEngine, pragmas: dict[str, str | int]) -> None:
+    """Run ``PRAGMA name = value`` on every new connection of a SQLite engine."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+
+@dataclass
+class DatabaseStats:
+    """Process-wide counters; tests diff them around a request."""
+
+    checkouts: int = 0  # connections taken from a pool
+    transactions: int = 0  # session transactions that reached the database
+    commits: int = 0
+
+
+stats = DatabaseStats()
+
+
+def track_pool(engine: AsyncEngine) -> None:
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        stats.checkouts += 1
+
+
+def _is_memory_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(url: str | URL, pool_size: int | None = None) -> dict:
+    """Pool and driver options for ``url`` from ``Settings``.
+
+    An in-memory SQLite database lives in a single static connection and
+    takes no pool options. PostgreSQL sessions are pinned to UTC so
+    ``now()`` defaults match the naive-UTC timestamps the app writes.
+    """
+    url = make_url(url)
+    if _is_memory_sqlite(url):
+        return {}
+    options = {
+        "pool_size": pool_size or settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": settings.database_pool_timeout,
+        "pool_recycle": settings.database_pool_recycle,
+        "pool_pre_ping": settings.database_pool_pre_ping,
+    }
+    if url.get_backend_name() == "postgresql":
+        options["connect_args"] = {"server_settings": {"timezone": "UTC"}}
+    return options
+
+
+def make_engine(url: str | URL, pool_size: int | None = None, **kwargs) -> AsyncEngine:
+    engine = create_async_engine(
+        url, echo=settings.debug, **{**engine_options(url, pool_size), **kwargs}
+    )
+    apply_sqlite_pragmas(engine, sqlite_pragmas())
+    track_pool(engine)
+    return engine
+
+
+def make_read_engine(write_engine: AsyncEngine) -> AsyncEngine:
+    """Engine for read-only traffic, so reads never queue behind writes.
+
+    Uses ``database_read_url`` (e.g. a replica) if set. Otherwise a SQLite file
+    gets its own pool of ``query_only`` connections, which WAL lets read while
+    a write is in progress. An in-memory database cannot be shared between
+    engines, and a server database already serves concurrent readers from
+    the write pool, so both read through ``write_engine``.
+    """
+    if settings.database_read_url:
+        return make_engine(settings.database_read_url, settings.database_read_pool_size)
+    url = write_engine.url
+    if url.get_backend_name() != "sqlite" or _is_memory_sqlite(url):
+        return write_engine
+    engine = create_async_engine(
+        url, echo=settings.debug, **engine_options(url, settings.database_read_pool_size)
+    )
+    apply_sqlite_pragmas(engine, {**sqlite_pragmas(), "query_only": 1})
+    track_pool(engine)
+    return engine
+
+
+engine = make_engine(settings.database_url)
+read_engine = make_read_engine(engine)
+
+READ_ONLY_KEY = "cronguard_read_only"
+_WRITES_KEY = "cronguard_writes"
 
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+read_session = async_sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False, info={READ_ONLY_KEY: True}
+)
 
 
 class Base(DeclarativeBase):
     pass
 
 
-async def get_db() -> AsyncSession:
-    async with async_session() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+class ReadOnlySessionError(Exception):
+    """A write was attempted on a session from the read pool."""
+
+
+@event.listens_for(Session, "before_flush")
+def _before_flush(session: Session, flush_context, instances) -> None:
+    if session.info.get(READ_ONLY_KEY) and (session.new or session.dirty or session.deleted):
+        raise ReadOnlySessionError("This session is read-only; use get_db to write")
+    session.info[_WRITES_KEY] = True
+
+
+# Execution option for an UPDATE/DELETE that may match no rows: it does not by
+# itself make the request commit; whatever the caller writes next does
+DEFER_WRITE_MARK = "cronguard_defer_write_mark"
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_execute(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        if state.session.info.get(READ_ONLY_KEY):
+            raise ReadOnlySessionError("This session is read-only; use get_db to write")
+        if not state.execution_options.get(DEFER_WRITE_MARK):
+            state.session.info[_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "after_begin")
+def _after_begin(session: Session, transaction, connection) -> None:
+    stats.transactions += 1
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    stats.commits += 1
+    session.info.pop(_WRITES_KEY, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_WRITES_KEY, None)
+
+
+def has_writes(session: AsyncSession) -> bool:
+    """Whether committing ``session`` would change anything."""
+    return bool(
+        session.info.get(_WRITES_KEY) or session.new or session.dirty or session.deleted
+    )
+
+
+def request_session(factory: async_sessionmaker, read_only: bool = False):
+    """Build a request-scoped session dependency on ``factory``.
+
+    The session connects on first use, so a request that never queries never
+    checks out a connection, and it is only committed if something was
+    written; otherwise closing it simply returns the connection. Read-only
+    sessions raise ``ReadOnlySessionError`` on any write.
+    """
+
+    async def dependency() -> AsyncIterator[AsyncSession]:
+        async with factory(info={READ_ONLY_KEY: True} if read_only else {}) as session:
+            try:
+                yield session
+                if has_writes(session):
+                    await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    return dependency
+
+
+get_db = request_session(async_session)
+# For handlers that only query: served by the read pool, never commits
+get_read_db = request_session(read_session, read_only=True)
+
+
+def get_session_factory() -> async_sessionmaker:
+    """Read session factory for work that outlives the request scope (streamed responses)."""
+    return read_session
@@ -0,0 +1,139 @@
+"""Interned ping metadata.
+
+A job pings with the same ``User-Agent`` from the same host almost every
+time, so pings store small integer ids into the ``user_agents`` and
+``remote_addrs`` lookup tables rather than the strings themselves.
+``Ping.user_agent`` and ``Ping.remote_addr`` read the strings back, so
+history pages, exports and the archive see no difference.
+
+Each table has an ``Interner``: an LRU of value -> id in front of it, so the
+ping path normally resolves both ids without a query. A value seen for the
+first time is inserted (``ON CONFLICT DO NOTHING``, then looked up), and its
+id is cached only once the transaction commits, so a rollback never leaves
+an id in the cache that points at nothing. Interned rows are never deleted.
+"""
+from collections import OrderedDict
+
+from sqlalchemy import Connection, event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.config import settings
+from app.models import Ping, RemoteAddr, UserAgent
+
+_PENDING_KEY = "cronguard_interned"
+
+_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+class Interner:
+    def __init__(self, model: type[UserAgent] | type[RemoteAddr], max_size: int):
+        self.model = model
+        self.max_size = max_size
+        self._ids: OrderedDict[str, int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def cached(self, value: str) -> int | None:
+        """The id of ``value`` if it is in the cache."""
+        id_ = self._ids.get(value)
+        if id_ is not None:
+            self._ids.move_to_end(value)
+            self.hits += 1
+        return id_
+
+    def resolve(self, connection: Connection, pending: dict, value: str) -> int:
+        """The id of ``value``, inserting it if new; ``pending`` collects new ids."""
+        id_ = self.cached(value)
+        if id_ is not None:
+            return id_
+        key = (self.model, value)
+        if key in pending:
+            return pending[key]
+
+        self.misses += 1
+        insert = _INSERTS[connection.dialect.name]
+        connection.execute(
+            insert(self.model).values(value=value).on_conflict_do_nothing(
+                index_elements=["value"]
+            )
+        )
+        id_ = connection.execute(
+            select(self.model.id).where(self.model.value == value)
+        ).scalar_one()
+        pending[key] = id_
+        return id_
+
+    def store(self, value: str, id_: int) -> None:
+        if self.max_size <= 0:
+            return
+        self._ids[value] = id_
+        self._ids.move_to_end(value)
+        while len(self._ids) > self.max_size:
+            self._ids.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def clear(self) -> None:
+        self._ids.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+user_agents = Interner(UserAgent, settings.intern_cache_size)
+remote_addrs = Interner(RemoteAddr, settings.intern_cache_size)
+
+
+def ping_ids(session: Session, remote_addr: str | None, user_agent: str | None) -> dict:
+    """``remote_addr_id``/``user_agent_id`` values for a pings row."""
+    connection = session.connection()
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    return {
+        "remote_addr_id": (
+            None if remote_addr is None else remote_addrs.resolve(connection, pending, remote_addr)
+        ),
+        "user_agent_id": (
+            None if user_agent is None else user_agents.resolve(connection, pending, user_agent)
+        ),
+    }
+
+
+async def ping_ids_async(
+    db: AsyncSession, remote_addr: str | None, user_agent: str | None
+) -> dict:
+    """``ping_ids`` without leaving the event loop when both values are cached."""
+    ids = {
+        "remote_addr_id": None if remote_addr is None else remote_addrs.cached(remote_addr),
+        "user_agent_id": None if user_agent is None else user_agents.cached(user_agent),
+    }
+    wanted = (remote_addr, user_agent)
+    if any(value is not None and id_ is None for value, id_ in zip(wanted, ids.values())):
+        return await db.run_sync(ping_ids, remote_addr, user_agent)
+    return ids
+
+
+def clear() -> None:
+    user_agents.clear()
+    remote_addrs.clear()
+
+
+def intern_ping(connection: Connection, ping: Ping) -> None:
+    """Give a ``Ping`` built with strings (``Ping(user_agent=...)``) their ids."""
+    pending = object_session(ping).info.setdefault(_PENDING_KEY, {})
+    if ping.remote_addr is not None and ping.remote_addr_id is None:
+        ping.remote_addr_id = remote_addrs.resolve(connection, pending, ping.remote_addr)
+    if ping.user_agent is not None and ping.user_agent_id is None:
+        ping.user_agent_id = user_agents.resolve(connection, pending, ping.user_agent)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    for (model, value), id_ in session.info.pop(_PENDING_KEY, {}).items():
+        (user_agents if model is UserAgent else remote_addrs).store(value, id_)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,121 @@
+"""In-process pub/sub feeding the live dashboard (Server-Sent Events).
+
+Every connected browser holds a ``Subscriber`` with a small bounded queue,
+keyed by the owning user so an event only fans out to that user's tabs.
+Publishing never blocks: a subscriber whose queue is full has fallen behind,
+so it is closed and told to reload rather than letting events pile up in
+memory. Events are published only after the database commit that produced
+them, via the transition listener and ``publish_on_commit``.
+"""
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.transitions import Transition, add_listener
+
+logger = logging.getLogger("cronguard.live")
+
+_PENDING_KEY = "cronguard_live_events"
+
+
+class TooManyConnections(Exception):
+    pass
+
+
+@dataclass(eq=False)
+class Subscriber:
+    user_id: int
+    queue: asyncio.Queue
+    closed: asyncio.Event = field(default_factory=asyncio.Event)
+    overflowed: bool = False
+
+
+class LiveHub:
+    def __init__(self, max_connections: int, max_per_user: int, queue_size: int):
+        self.max_connections = max_connections
+        self.max_per_user = max_per_user
+        self.queue_size = queue_size
+        self._subscribers: dict[int, set[Subscriber]] = {}
+        self.connections = 0
+        self.published = 0
+        self.overflows = 0
+
+    def subscribe(self, user_id: int) -> Subscriber:
+        """Register a connection; raises TooManyConnections past either limit."""
+        subscribers = self._subscribers.get(user_id, set())
+        if self.connections >= self.max_connections or len(subscribers) >= self.max_per_user:
+            raise TooManyConnections()
+        subscriber = Subscriber(user_id, asyncio.Queue(maxsize=self.queue_size))
+        self._subscribers.setdefault(user_id, set()).add(subscriber)
+        self.connections += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        subscribers = self._subscribers.get(subscriber.user_id)
+        if subscribers and subscriber in subscribers:
+            subscribers.discard(subscriber)
+            self.connections -= 1
+            if not subscribers:
+                del self._subscribers[subscriber.user_id]
+        subscriber.closed.set()
+
+    def publish(self, user_id: int, name: str, data: dict) -> None:
+        """Fan an event out to every connection of ``user_id`` without waiting."""
+        message = (name, data)
+        for subscriber in list(self._subscribers.get(user_id, ())):
+            try:
+                subscriber.queue.put_nowait(message)
+                self.published += 1
+            except asyncio.QueueFull:
+                self.overflows += 1
+                subscriber.overflowed = True
+                logger.info(f"Live subscriber for user {user_id} fell behind; disconnecting")
+                self.unsubscribe(subscriber)
+
+    def clear(self) -> None:
+        for subscribers in list(self._subscribers.values()):
+            for subscriber in list(subscribers):
+                self.unsubscribe(subscriber)
+
+
+hub = LiveHub(
+    settings.live_max_connections,
+    settings.live_max_connections_per_user,
+    settings.live_queue_size,
+)
+
+
+def format_sse(name: str, data: dict) -> str:
+    return f"event: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def publish_on_commit(db: AsyncSession, user_id: int, name: str, data: dict) -> None:
+    """Publish an event once ``db`` commits; dropped if it rolls back."""
+    db.info.setdefault(_PENDING_KEY, []).append((user_id, name, data))
+
+
+@add_listener
+def _on_transition(transition: Transition) -> None:
+    hub.publish(transition.user_id, "status", {
+        "monitor_id": transition.monitor_id,
+        "previous": transition.previous,
+        "status": transition.status,
+        "at": transition.at.isoformat(),
+    })
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    for user_id, name, data in session.info.pop(_PENDING_KEY, ()):
+        hub.publish(user_id, name, data)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
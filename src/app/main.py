@@ -3,13 +3,14 @@ from contextlib import asynccontextmanager
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi import FastAPI, Request
-from fastapi.responses import RedirectResponse
+from fastapi.responses import PlainTextResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pathlib import Path
 
+from app import metrics
 from app.config import settings
-from app.database import engine, Base
+from app.database import engine, read_engine, Base
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("cronguard")
@@ -35,13 +36,37 @@ async def lifespan(app: FastAPI):
     from app.checker import check_overdue_monitors
 
     scheduler.add_job(check_overdue_monitors, "interval", seconds=60, id="overdue_checker")
+    if settings.archive_after_days > 0:
+        from app.archive import archive_old_pings
+
+        scheduler.add_job(archive_old_pings, "interval", hours=1, id="ping_archiver")
+    if settings.counter_reconcile_minutes > 0:
+        from app.counters import reconcile_counters
+
+        scheduler.add_job(
+            reconcile_counters,
+            "interval",
+            minutes=settings.counter_reconcile_minutes,
+            id="counter_reconciler",
+        )
     scheduler.start()
     logger.info("Background checker started (60s interval)")
 
     yield
 
     scheduler.shutdown(wait=False)
+
+    from app.alerts import flush_webhook_batches
+    from app.channels import drain_channels, stop_channels
+    from app.live import hub as live_hub
+
+    await drain_channels()
+    await flush_webhook_batches()
+    await stop_channels()
+    live_hub.clear()
     await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
 
 
 app = FastAPI(
@@ -50,6 +75,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+if settings.metrics_enabled:
+    app.add_middleware(metrics.RequestMetrics)
+
 # Register auth redirect exception handler
 from app.auth import AuthRequired  # noqa: E402
 
@@ -64,13 +92,27 @@ if static_dir.exists():
     app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
 # Include routers
-from app.routers import auth, monitors, ping, badge, settings as settings_router  # noqa: E402
+from app.routers import (  # noqa: E402
+    api,
+    auth,
+    badge,
+    export,
+    live,
+    monitors,
+    ping,
+    settings as settings_router,
+    status_pages,
+)
 
 app.include_router(auth.router)
 app.include_router(monitors.router)
 app.include_router(ping.router)
 app.include_router(badge.router)
 app.include_router(settings_router.router)
+app.include_router(status_pages.router)
+app.include_router(live.router)
+app.include_router(api.router)
+app.include_router(export.router)
 
 
 @app.get("/")
@@ -88,3 +130,12 @@ async def health_check():
         "app": settings.app_name,
         "version": settings.app_version,
     }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    if not settings.metrics_enabled:
+        return PlainTextResponse("Not Found", status_code=404)
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
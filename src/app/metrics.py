@@ -0,0 +1,271 @@
+"""Prometheus metrics, served in the text exposition format at ``/metrics``.
+
+Hot-path metrics are plain in-process counters and fixed-bucket histograms:
+recording one is a dict lookup and an addition (plus a bisect over the
+bucket bounds for histograms), with no locks because everything runs on the
+event loop. Figures that already exist elsewhere (pool occupancy, channel
+queues and delivery counts) are read by collectors only when scraped.
+
+Values are per process; with several workers Prometheus scrapes each.
+"""
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+
+from app.database import engine, read_engine, stats as db_stats
+
+# (labels, value) samples of one metric family, produced at scrape time
+Samples = Iterable[tuple[dict[str, str], float]]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LAG_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{_labels(self.labels, labels)} {_number(value)}")
+        return lines
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # labels -> [count per bucket (the last one +Inf), sum]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_labels(self.labels, labels, le)} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_labels(self.labels, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+    def clear(self) -> None:
+        self._series.clear()
+
+
+class Collected:
+    """A metric family whose samples are read from elsewhere when scraped."""
+
+    def __init__(self, name: str, help: str, kind: str, collect: Callable[[], Samples]):
+        self.name = name
+        self.help = help
+        self.kind = kind  # "gauge" or "counter"
+        self.collect = collect
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in self.collect():
+            label_text = _labels(tuple(labels), tuple(labels.values()))
+            lines.append(f"{self.name}{label_text} {_number(value)}")
+        return lines
+
+
+_metrics: list[Counter | Histogram | Collected] = []
+
+
+def register(metric):
+    _metrics.append(metric)
+    return metric
+
+
+def collected(name: str, help: str, kind: str = "gauge"):
+    """Register the decorated function as the sample source of a scrape-time family."""
+
+    def decorator(collect: Callable[[], Samples]) -> Callable[[], Samples]:
+        register(Collected(name, help, kind, collect))
+        return collect
+
+    return decorator
+
+
+def render() -> str:
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def clear() -> None:
+    for metric in _metrics:
+        if isinstance(metric, (Counter, Histogram)):
+            metric.clear()
+
+
+# HTTP
+requests = register(Counter(
+    "cronguard_http_requests_total", "HTTP requests by route and status.",
+    ("method", "route", "status"),
+))
+request_latency = register(Histogram(
+    "cronguard_http_request_duration_seconds",
+    "Time from receiving a request to sending its response headers.",
+    ("method", "route"),
+))
+
+# Pings
+pings = register(Counter(
+    "cronguard_pings_total",
+    "Pings by outcome: accepted, unknown (no such monitor), paused or limited.",
+    ("outcome",),
+))
+
+# Checker
+checker_runs = register(Counter(
+    "cronguard_checker_runs_total", "Overdue checker runs by result.", ("result",)
+))
+checker_duration = register(Histogram(
+    "cronguard_checker_run_duration_seconds", "Time one overdue checker run took."
+))
+checker_lag = register(Histogram(
+    "cronguard_checker_lag_seconds",
+    "How far past its deadline a monitor was when the checker marked it down.",
+    buckets=LAG_BUCKETS,
+))
+
+# Alerts
+alert_latency = register(Histogram(
+    "cronguard_alert_send_duration_seconds",
+    "Time one alert delivery took, successful or not.",
+    ("channel",),
+))
+
+
+def _route(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class RequestMetrics:
+    """ASGI middleware recording request counts and latency per route.
+
+    The route is the matched path template (``/ping/{slug}``), so label values
+    stay bounded whatever URLs clients ask for. Latency stops at the response
+    headers, so long-lived streams (SSE, exports) count their setup only.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_metrics(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                request_latency.observe(
+                    time.perf_counter() - started, scope["method"], _route(scope)
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            requests.inc(scope["method"], _route(scope), str(status))
+
+
+def _engines() -> dict:
+    engines = {"write": engine}
+    if read_engine is not engine:
+        engines["read"] = read_engine
+    return engines
+
+
+@collected("cronguard_db_pool_connections", "Database pool connections by state.")
+def _pool_connections() -> Samples:
+    for name, db_engine in _engines().items():
+        pool = db_engine.sync_engine.pool
+        if not hasattr(pool, "checkedout"):
+            continue  # a single static connection (in-memory SQLite)
+        yield {"engine": name, "state": "checked_out"}, pool.checkedout()
+        yield {"engine": name, "state": "idle"}, pool.checkedin()
+        yield {"engine": name, "state": "overflow"}, max(pool.overflow(), 0)
+
+
+@collected("cronguard_db_pool_size", "Configured size of each database pool.")
+def _pool_size() -> Samples:
+    for name, db_engine in _engines().items():
+        pool = db_engine.sync_engine.pool
+        if hasattr(pool, "size"):
+            yield {"engine": name}, pool.size()
+
+
+@collected(
+    "cronguard_db_checkouts_total", "Connections taken from the database pools.", "counter"
+)
+def _db_checkouts() -> Samples:
+    yield {}, db_stats.checkouts
+
+
+@collected(
+    "cronguard_db_commits_total", "Session commits that reached the database.", "counter"
+)
+def _db_commits() -> Samples:
+    yield {}, db_stats.commits
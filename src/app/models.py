@@ -1,8 +1,32 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+    TypeDecorator,
+    case,
+    event,
+    func,
+    inspect,
+    literal_column,
+    select,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    WriteOnlyMapped,
+    column_property,
+    mapped_column,
+    relationship,
+)
 
 from app.database import Base
 
@@ -11,6 +35,79 @@ def generate_uuid() -> str:
     return str(uuid.uuid4())
 
 
+class UTCDateTime(TypeDecorator):
+    """Naive-UTC timestamp column that also accepts timezone-aware datetimes.
+
+    The app passes ``datetime.now(timezone.utc)`` around; SQLite drops the
+    offset on its own, but asyncpg rejects aware values for ``timestamp
+    without time zone``, so they are normalized to naive UTC here.
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
+def to_epoch(value: datetime) -> int:
+    """Whole seconds since the Unix epoch; naive datetimes are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def from_epoch(value: int) -> datetime:
+    return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None)
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class EpochSeconds(TypeDecorator):
+    """Timestamp stored as integer seconds since the epoch, read back as naive UTC.
+
+    For the hot time columns: integers are smaller than SQLite's timestamp
+    text, compare and index as plain numbers, and load without string
+    parsing. Binds accept datetimes (naive = UTC) or ints.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, datetime):
+            return to_epoch(value)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return from_epoch(value)
+
+
+status_page_monitors = Table(
+    "status_page_monitors",
+    Base.metadata,
+    Column(
+        "status_page_id",
+        Integer,
+        ForeignKey("status_pages.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "monitor_id",
+        Integer,
+        ForeignKey("monitors.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    ),
+)
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -25,22 +122,27 @@ class User(Base):
     alert_email: Mapped[str | None] = mapped_column(String(255), nullable=True)
     email_alerts_enabled: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), nullable=False
+        UTCDateTime, server_default=func.now(), nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
+        UTCDateTime, server_default=func.now(), onupdate=func.now(), nullable=False
     )
 
     monitors: Mapped[list["Monitor"]] = relationship(
-        "Monitor", back_populates="user", cascade="all, delete-orphan"
+        "Monitor", back_populates="user", cascade="all, delete-orphan", passive_deletes=True
     )
 
 
 class Monitor(Base):
     __tablename__ = "monitors"
+    # Fetch server-generated columns (created_at) in the INSERT itself, so freshly
+    # created monitors can be serialized without a refresh query each
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     slug: Mapped[str] = mapped_column(
         String(36), unique=True, nullable=False, default=generate_uuid, index=True
@@ -50,46 +152,222 @@ class Monitor(Base):
     status: Mapped[str] = mapped_column(
         String(10), nullable=False, default="new"
     )  # new, up, down, paused
-    last_ping_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    status_changed_at: Mapped[datetime | None] = mapped_column(UTCDateTime, nullable=True)
+    last_ping_at: Mapped[datetime | None] = mapped_column(EpochSeconds, nullable=True)
+    # last_ping_at + period + grace, kept in step on flush; the checker's index key
+    deadline_at: Mapped[datetime | None] = mapped_column(EpochSeconds, nullable=True)
     webhook_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Pings ever recorded, archived ones included; maintained by app.counters
+    ping_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), nullable=False
+        UTCDateTime, server_default=func.now(), nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
+        UTCDateTime, server_default=func.now(), onupdate=func.now(), nullable=False
     )
 
     user: Mapped["User"] = relationship("User", back_populates="monitors")
+    # History is removed by the database (ON DELETE CASCADE), not loaded and
+    # deleted row by row; passive_deletes keeps the ORM from touching it.
     pings: Mapped[list["Ping"]] = relationship(
-        "Ping", back_populates="monitor", cascade="all, delete-orphan"
+        "Ping", back_populates="monitor", cascade="all, delete-orphan", passive_deletes=True
     )
     alerts: Mapped[list["Alert"]] = relationship(
-        "Alert", back_populates="monitor", cascade="all, delete-orphan"
+        "Alert", back_populates="monitor", cascade="all, delete-orphan", passive_deletes=True
+    )
+    status_pages: Mapped[list["StatusPage"]] = relationship(
+        "StatusPage",
+        secondary=status_page_monitors,
+        back_populates="monitors",
+        passive_deletes=True,
+    )
+    # Append-only; never loaded as a collection (see app.uptime for reads)
+    status_events: WriteOnlyMapped["StatusEvent"] = relationship(
+        "StatusEvent", passive_deletes=True
+    )
+
+    def set_status(self, status: str, at: datetime | None = None) -> bool:
+        """Move to ``status`` and stamp the change time. Returns True if it changed."""
+        if self.status == status:
+            return False
+        self.status = status
+        self.status_changed_at = at or datetime.now(timezone.utc)
+        return True
+
+    def ping_deadline(self) -> datetime | None:
+        """When the monitor is overdue without another ping; None before the first."""
+        if self.last_ping_at is None:
+            return None
+        return self.last_ping_at + timedelta(seconds=self.period + self.grace)
+
+
+@event.listens_for(Monitor, "before_insert")
+@event.listens_for(Monitor, "before_update")
+def _set_deadline(mapper, connection, target: Monitor) -> None:
+    target.deadline_at = target.ping_deadline()
+
+
+# Keep the per-user status counts in step with every flushed monitor change
+# (see app.counters)
+@event.listens_for(Monitor, "after_insert")
+def _count_inserted(mapper, connection, target: Monitor) -> None:
+    from app.counters import shift_status_counts
+
+    shift_status_counts(target, {target.status: 1})
+
+
+@event.listens_for(Monitor, "after_update")
+def _count_status_change(mapper, connection, target: Monitor) -> None:
+    history = inspect(target).attrs.status.history
+    if history.deleted and history.added and history.deleted[0] != history.added[0]:
+        from app.counters import shift_status_counts
+
+        shift_status_counts(target, {history.deleted[0]: -1, history.added[0]: 1})
+
+
+@event.listens_for(Monitor, "after_delete")
+def _count_deleted(mapper, connection, target: Monitor) -> None:
+    from app.counters import shift_status_counts
+
+    # The stored status, if it was changed and deleted in the same flush
+    history = inspect(target).attrs.status.history
+    status = history.deleted[0] if history.deleted else target.status
+    shift_status_counts(target, {status: -1})
+
+
+# Dashboard urgency: down first, then never-pinged, healthy, paused. Built from
+# literals (not bound parameters) so queries match the expression index below.
+URGENCY_ORDER = ("down", "new", "up", "paused")
+monitor_urgency = case(
+    *(
+        (Monitor.status == literal_column(f"'{status}'"), literal_column(str(rank)))
+        for rank, status in enumerate(URGENCY_ORDER)
+    ),
+    else_=literal_column(str(len(URGENCY_ORDER))),
+)
+
+# Composite indexes backing the dashboard's keyset-paginated sorts and status counts
+Index("ix_monitors_user_urgency", Monitor.user_id, monitor_urgency, Monitor.name, Monitor.id)
+Index("ix_monitors_user_name", Monitor.user_id, Monitor.name, Monitor.id)
+Index("ix_monitors_user_status", Monitor.user_id, Monitor.status, Monitor.name, Monitor.id)
+# Overdue check: up monitors whose deadline has passed
+Index("ix_monitors_status_deadline", Monitor.status, Monitor.deadline_at)
+
+
+class MonitorStatusCount(Base):
+    """How many of a user's monitors are in one status (see app.counters)."""
+
+    __tablename__ = "monitor_status_counts"
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
     )
+    status: Mapped[str] = mapped_column(String(10), primary_key=True)
+    monitors: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class UserAgent(Base):
+    """An interned ping ``User-Agent`` (see app.interning)."""
+
+    __tablename__ = "user_agents"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    value: Mapped[str] = mapped_column(String(500), unique=True, nullable=False)
+
+
+class RemoteAddr(Base):
+    """An interned ping source address (see app.interning)."""
+
+    __tablename__ = "remote_addrs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    value: Mapped[str] = mapped_column(String(45), unique=True, nullable=False)
 
 
 class Ping(Base):
     __tablename__ = "pings"
+    # Serves per-monitor history newest-first, time ranges and keyset pages
+    # without a sort (the primary key rides along as the tie-breaker).
+    __table_args__ = (Index("ix_pings_monitor_created", "monitor_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     monitor_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("monitors.id"), nullable=False, index=True
+        Integer, ForeignKey("monitors.id", ondelete="CASCADE"), nullable=False
     )
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), nullable=False
+    created_at: Mapped[datetime] = mapped_column(EpochSeconds, default=utcnow, nullable=False)
+    remote_addr_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("remote_addrs.id"), nullable=True
+    )
+    user_agent_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("user_agents.id"), nullable=True
+    )
+    # The strings, read through the lookup tables. Pings built with them are
+    # given their ids on flush; see app.interning.
+    remote_addr: Mapped[str | None] = column_property(
+        select(RemoteAddr.value).where(RemoteAddr.id == remote_addr_id).scalar_subquery()
+    )
+    user_agent: Mapped[str | None] = column_property(
+        select(UserAgent.value).where(UserAgent.id == user_agent_id).scalar_subquery()
     )
-    remote_addr: Mapped[str | None] = mapped_column(String(45), nullable=True)
-    user_agent: Mapped[str | None] = mapped_column(String(500), nullable=True)
 
     monitor: Mapped["Monitor"] = relationship("Monitor", back_populates="pings")
 
 
+@event.listens_for(Ping, "before_insert")
+def _intern_strings(mapper, connection, target: Ping) -> None:
+    from app.interning import intern_ping
+
+    intern_ping(connection, target)
+
+
+@event.listens_for(Ping, "after_insert")
+def _count_ping(mapper, connection, target: Ping) -> None:
+    from app.counters import count_flushed_ping
+
+    count_flushed_ping(target)
+
+
+class PingDay(Base):
+    """Pings one monitor received on one UTC day (see app.counters)."""
+
+    __tablename__ = "ping_days"
+
+    monitor_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("monitors.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[int] = mapped_column(Integer, primary_key=True)  # days since the epoch
+    pings: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class PingSegment(Base):
+    """A gzip NDJSON file of one monitor's archived pings (see app.archive)."""
+
+    __tablename__ = "ping_segments"
+    __table_args__ = (Index("ix_ping_segments_monitor_start", "monitor_id", "start_at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    monitor_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("monitors.id", ondelete="CASCADE"), nullable=False
+    )
+    start_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False)  # oldest ping
+    end_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False)  # newest ping
+    first_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    path: Mapped[str] = mapped_column(String(500), nullable=False)  # relative to archive_dir
+    created_at: Mapped[datetime] = mapped_column(
+        UTCDateTime, server_default=func.now(), nullable=False
+    )
+
+
 class Alert(Base):
     __tablename__ = "alerts"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     monitor_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("monitors.id"), nullable=False, index=True
+        Integer, ForeignKey("monitors.id", ondelete="CASCADE"), nullable=False, index=True
     )
     alert_type: Mapped[str] = mapped_column(
         String(10), nullable=False
@@ -99,7 +377,46 @@ class Alert(Base):
     )  # "email", "webhook"
     details: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), nullable=False
+        UTCDateTime, server_default=func.now(), nullable=False
     )
 
     monitor: Mapped["Monitor"] = relationship("Monitor", back_populates="alerts")
+
+
+class StatusEvent(Base):
+    """One row per status transition; the source of truth for uptime."""
+
+    __tablename__ = "status_events"
+    __table_args__ = (Index("ix_status_events_monitor_at", "monitor_id", "at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    monitor_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("monitors.id", ondelete="CASCADE"), nullable=False
+    )
+    from_status: Mapped[str] = mapped_column(String(10), nullable=False)
+    to_status: Mapped[str] = mapped_column(String(10), nullable=False)
+    at: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False)
+
+
+class StatusPage(Base):
+    __tablename__ = "status_pages"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    slug: Mapped[str] = mapped_column(
+        String(36), unique=True, nullable=False, default=generate_uuid, index=True
+    )
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        UTCDateTime, server_default=func.now(), nullable=False
+    )
+
+    monitors: Mapped[list["Monitor"]] = relationship(
+        "Monitor",
+        secondary=status_page_monitors,
+        back_populates="status_pages",
+        order_by="Monitor.name",
+        passive_deletes=True,
+    )
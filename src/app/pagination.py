@@ -0,0 +1,120 @@
+"""Keyset (seek) pagination helpers.
+
+A page is fetched with ``WHERE (k1, k2, ...) > (:v1, :v2, ...) ORDER BY k1, k2, ...
+LIMIT n + 1`` instead of ``OFFSET``, so page 200 costs the same index seek
+as page 1. The sort key of the last row on a page is handed back to the
+client as an opaque, URL-safe cursor.
+
+Cursor values must be ints or strings. Timestamp keys need care:
+``server_default=func.now()`` stores second-precision text in SQLite, which
+never compares equal to a bound Python datetime (rendered with
+microseconds). Either sort by the monotonically increasing primary key, or
+key on ``time_key(column)`` with ``time_bound(column, dt)`` bounds: epoch
+columns compare as their stored integers, DateTime columns as their stored
+text. On other databases DateTime keys compare real timestamps and only
+convert to and from text at the edges, so the same cursors and bounds work.
+"""
+import base64
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    String,
+    TypeDecorator,
+    and_,
+    literal,
+    tuple_,
+    type_coerce,
+)
+from sqlalchemy.sql import ColumnElement
+
+from app.models import EpochSeconds, to_epoch
+
+
+def encode_cursor(values: tuple) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None, size: int) -> tuple | None:
+    """Decode a cursor made by ``encode_cursor``; None if missing or malformed."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != size:
+            return None
+        if not all(isinstance(v, (int, str)) and not isinstance(v, bool) for v in values):
+            return None
+        return tuple(values)
+    except ValueError:
+        return None
+
+
+def after(keys: list[ColumnElement], values: tuple, descending: bool = False) -> ColumnElement:
+    """Predicate selecting rows that sort strictly after ``values`` on ``keys``.
+
+    The row-value comparison is paired with a redundant bound on the leading
+    key, which lets SQLite seek the index instead of filtering a scan.
+    """
+    row = tuple_(*keys)
+    bound = tuple_(*(literal(value, key.type) for key, value in zip(keys, values)))
+    if descending:
+        return and_(keys[0] <= values[0], row < bound)
+    return and_(keys[0] >= values[0], row > bound)
+
+
+def split_page(rows: list, limit: int) -> tuple[list, bool]:
+    """Trim a ``limit + 1`` fetch to ``limit`` rows and report whether more exist."""
+    return rows[:limit], len(rows) > limit
+
+
+class DateTimeKey(TypeDecorator):
+    """Timestamp handled as text: the stored text on SQLite, ISO text elsewhere."""
+
+    impl = String
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime())
+
+    def process_bind_param(self, value, dialect):
+        if dialect.name != "sqlite" and isinstance(value, str):
+            return datetime.fromisoformat(value)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, datetime):
+            return value.isoformat(sep=" ")
+        return value
+
+
+def time_key(column: ColumnElement) -> ColumnElement:
+    """A timestamp column as a sort/range key whose values are cursor-safe.
+
+    Epoch columns yield their stored integers, DateTime columns their stored
+    text. ``type_coerce`` leaves the SQL untouched, so indexes on the column
+    still apply.
+    """
+    if isinstance(column.type, EpochSeconds):
+        return type_coerce(column, BigInteger)
+    return type_coerce(column, DateTimeKey())
+
+
+def time_bound(column: ColumnElement, dt: datetime) -> int | str:
+    """``dt`` as a value comparable with ``time_key(column)``."""
+    if isinstance(column.type, EpochSeconds):
+        return to_epoch(dt)
+    return datetime_text(dt)
+
+
+def datetime_text(dt: datetime) -> str:
+    """Format a bound so it compares correctly against stored timestamp text."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.strftime("%Y-%m-%d %H:%M:%S")
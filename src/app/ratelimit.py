@@ -0,0 +1,105 @@
+"""In-process token-bucket rate limiting.
+
+Each ``RateLimiter`` holds one bucket per key (a ping slug, a client IP, an
+account email). A bucket refills at ``per_minute`` tokens a minute up to
+``burst``; a request that finds it empty is shed with the seconds until the
+next token, for ``Retry-After``. Buckets live in an LRU dict: ones that have
+sat idle long enough to refill completely are indistinguishable from new
+ones and are evicted as other keys arrive, and ``max_keys`` caps memory
+whatever the traffic.
+
+Limits are per process; with several workers each enforces its own.
+"""
+import math
+import time
+from collections import OrderedDict
+
+from app.config import settings
+
+
+class RateLimiter:
+    def __init__(self, name: str, per_minute: float, burst: int, max_keys: int):
+        self.name = name
+        self.rate = per_minute / 60  # tokens per second
+        self.burst = burst
+        self.max_keys = max_keys
+        # key -> (tokens, last refill time)
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self.allowed = 0
+        self.limited = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0 and self.burst > 0
+
+    def hit(self, key: str) -> int:
+        """Take a token for ``key``; returns 0 if allowed, else seconds to wait."""
+        if not self.enabled:
+            return 0
+        now = time.monotonic()
+        tokens, last = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        if tokens >= 1:
+            tokens -= 1
+            self.allowed += 1
+            retry_after = 0
+        else:
+            self.limited += 1
+            retry_after = max(1, math.ceil((1 - tokens) / self.rate))
+        self._buckets[key] = (tokens, now)
+        self._evict(now)
+        return retry_after
+
+    def _evict(self, now: float) -> None:
+        full_after = self.burst / self.rate
+        while self._buckets:
+            key, (_, last) = next(iter(self._buckets.items()))
+            if len(self._buckets) <= self.max_keys and now - last < full_after:
+                break
+            del self._buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self.allowed = 0
+        self.limited = 0
+
+
+def _limiter(name: str, per_minute: float, burst: int) -> RateLimiter:
+    return RateLimiter(name, per_minute, burst, settings.rate_limit_max_keys)
+
+
+ping_by_slug = _limiter("ping_slug", settings.ping_rate_per_slug, settings.ping_burst_per_slug)
+ping_by_ip = _limiter("ping_ip", settings.ping_rate_per_ip, settings.ping_burst_per_ip)
+login_by_ip = _limiter("login_ip", settings.login_rate_per_ip, settings.login_burst_per_ip)
+login_by_account = _limiter(
+    "login_account", settings.login_rate_per_account, settings.login_burst_per_account
+)
+register_by_ip = _limiter(
+    "register_ip", settings.register_rate_per_ip, settings.register_burst_per_ip
+)
+
+limiters = (ping_by_slug, ping_by_ip, login_by_ip, login_by_account, register_by_ip)
+
+
+def check(*hits: tuple[RateLimiter, str]) -> int:
+    """Take a token from each (limiter, key) in turn, stopping at the first refusal.
+
+    Returns 0 if every limiter allowed the request, else the ``Retry-After`` seconds.
+    """
+    for limiter, key in hits:
+        retry_after = limiter.hit(key)
+        if retry_after:
+            return retry_after
+    return 0
+
+
+def client_ip(request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def clear() -> None:
+    for limiter in limiters:
+        limiter.clear()
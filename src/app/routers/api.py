@@ -0,0 +1,308 @@
+"""Versioned JSON API for monitors (``/api/v1``).
+
+Authenticate with the ``X-Api-Key`` header (or the session cookie). Field
+validation is shared with the HTML forms via ``validate_monitor``. The bulk
+endpoint applies every create/update/delete in one transaction, and nothing
+is applied if any item fails validation.
+"""
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import status_pages, sync
+from app.auth import get_api_user
+from app.config import settings
+from app.database import get_db, get_read_db
+from app.models import Monitor, User
+from app.routers.monitors import (
+    DASHBOARD_SORTS,
+    DASHBOARD_STATUSES,
+    compute_grace,
+    list_monitors,
+    remove_monitor,
+    set_paused,
+    validate_monitor,
+)
+
+router = APIRouter(prefix="/api/v1", tags=["api"])
+
+
+class MonitorCreate(BaseModel):
+    name: str
+    period: int
+    grace: int = 0
+    webhook_url: str | None = None
+    paused: bool = False
+
+
+class MonitorUpdate(BaseModel):
+    name: str | None = None
+    period: int | None = None
+    grace: int | None = None
+    webhook_url: str | None = None
+    paused: bool | None = None
+
+
+class MonitorBulkUpdate(MonitorUpdate):
+    id: int
+
+
+class BulkRequest(BaseModel):
+    create: list[MonitorCreate] = Field(default_factory=list)
+    update: list[MonitorBulkUpdate] = Field(default_factory=list)
+    delete: list[int] = Field(default_factory=list)
+
+
+class SyncRequest(BaseModel):
+    monitors: list[sync.ManifestEntry]
+
+
+def monitor_json(monitor: Monitor) -> dict:
+    return {
+        "id": monitor.id,
+        "name": monitor.name,
+        "slug": monitor.slug,
+        "ping_url": f"{settings.base_url}/ping/{monitor.slug}",
+        "period": monitor.period,
+        "grace": monitor.grace,
+        "status": monitor.status,
+        "webhook_url": monitor.webhook_url,
+        "last_ping_at": iso(monitor.last_ping_at),
+        "created_at": iso(monitor.created_at),
+    }
+
+
+def iso(value: datetime | None) -> str | None:
+    return value.isoformat() if value else None
+
+
+def validation_error(errors) -> JSONResponse:
+    return JSONResponse({"errors": errors}, status_code=422)
+
+
+def not_found() -> JSONResponse:
+    return JSONResponse({"error": "Not found"}, status_code=404)
+
+
+def build_monitor(user_id: int, data: MonitorCreate) -> tuple[Monitor | None, list[str]]:
+    name, webhook_url, errors = validate_monitor(data.name, data.period, data.webhook_url)
+    if errors:
+        return None, errors
+    monitor = Monitor(
+        user_id=user_id,
+        name=name,
+        period=data.period,
+        grace=compute_grace(data.period, data.grace),
+        webhook_url=webhook_url,
+        status="paused" if data.paused else "new",
+    )
+    return monitor, []
+
+
+def check_update(monitor: Monitor, data: MonitorUpdate) -> tuple[dict, list[str]]:
+    """Validate a partial update against the monitor's current values; nothing is applied."""
+    fields = data.model_dump(exclude_unset=True)
+    for key in ("name", "period", "grace", "paused"):
+        if fields.get(key) is None:
+            fields.pop(key, None)  # explicit nulls on non-nullable fields mean "unchanged"
+    name = fields.get("name", monitor.name)
+    period = fields.get("period", monitor.period)
+    webhook_url = fields["webhook_url"] if "webhook_url" in fields else monitor.webhook_url
+    name, webhook_url, errors = validate_monitor(name, period, webhook_url)
+    if "period" in fields or "grace" in fields:
+        # Same rule as the edit form: an unset or zero grace is recomputed from the period
+        fields["grace"] = compute_grace(period, fields.get("grace"))
+    fields.update(name=name, period=period, webhook_url=webhook_url)
+    return fields, errors
+
+
+def apply_update(monitor: Monitor, fields: dict) -> None:
+    if "grace" in fields:
+        monitor.grace = fields["grace"]
+    monitor.name = fields["name"]
+    monitor.period = fields["period"]
+    monitor.webhook_url = fields["webhook_url"]
+    if fields.get("paused") is not None:
+        set_paused(monitor, fields["paused"])
+
+
+async def owned_monitor(db: AsyncSession, user: User, monitor_id: int) -> Monitor | None:
+    result = await db.execute(
+        select(Monitor).where(Monitor.id == monitor_id, Monitor.user_id == user.id)
+    )
+    return result.scalar_one_or_none()
+
+
+@router.get("/monitors")
+async def api_list_monitors(
+    status: str = "",
+    q: str = "",
+    sort: str = "name",
+    after: str | None = None,
+    limit: int = 100,
+    user: User = Depends(get_api_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    status = status if status in DASHBOARD_STATUSES else ""
+    sort = sort if sort in DASHBOARD_SORTS else "name"
+    limit = min(max(limit, 1), settings.api_max_page_size)
+    monitors, next_cursor, _ = await list_monitors(
+        db, user.id, status, q.strip()[:200], sort, after, limit
+    )
+    return {"monitors": [monitor_json(m) for m in monitors], "next": next_cursor}
+
+
+@router.post("/monitors", status_code=201)
+async def api_create_monitor(
+    data: MonitorCreate,
+    user: User = Depends(get_api_user),
+    db: AsyncSession = Depends(get_db),
+):
+    monitor, errors = build_monitor(user.id, data)
+    if errors:
+        return validation_error(errors)
+    db.add(monitor)
+    await db.flush()
+    return monitor_json(monitor)
+
+
+@router.get("/monitors/{monitor_id}")
+async def api_get_monitor(
+    monitor_id: int,
+    user: User = Depends(get_api_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    monitor = await owned_monitor(db, user, monitor_id)
+    if not monitor:
+        return not_found()
+    return monitor_json(monitor)
+
+
+@router.patch("/monitors/{monitor_id}")
+async def api_update_monitor(
+    monitor_id: int,
+    data: MonitorUpdate,
+    user: User = Depends(get_api_user),
+    db: AsyncSession = Depends(get_db),
+):
+    monitor = await owned_monitor(db, user, monitor_id)
+    if not monitor:
+        return not_found()
+    fields, errors = check_update(monitor, data)
+    if errors:
+        return validation_error(errors)
+    apply_update(monitor, fields)
+    status_pages.invalidate_monitor_on_commit(db, monitor.id)
+    return monitor_json(monitor)
+
+
+@router.delete("/monitors/{monitor_id}", status_code=204)
+async def api_delete_monitor(
+    monitor_id: int,
+    user: User = Depends(get_api_user),
+    db: AsyncSession = Depends(get_db),
+):
+    monitor = await owned_monitor(db, user, monitor_id)
+    if not monitor:
+        return not_found()
+    await remove_monitor(db, monitor)
+    return Response(status_code=204)
+
+
+@router.post("/monitors/bulk")
+async def api_bulk(
+    data: BulkRequest,
+    user: User = Depends(get_api_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Apply creates, updates and deletes atomically in one request.
+
+    Errors are keyed by operation and item index, e.g.
+    ``{"create": {"3": [...]}, "delete": {"0": ["Monitor not found."]}}``.
+    """
+    total = len(data.create) + len(data.update) + len(data.delete)
+    if total > settings.api_bulk_max_items:
+        return validation_error(
+            {"request": [f"At most {settings.api_bulk_max_items} operations per request."]}
+        )
+
+    errors: dict[str, dict[str, list[str]]] = {}
+
+    new_monitors = []
+    for i, item in enumerate(data.create):
+        monitor, item_errors = build_monitor(user.id, item)
+        if item_errors:
+            errors.setdefault("create", {})[str(i)] = item_errors
+        new_monitors.append(monitor)
+
+    # Every monitor touched by an update or delete, in one query
+    ids = {item.id for item in data.update} | set(data.delete)
+    owned = {}
+    if ids:
+        result = await db.execute(
+            select(Monitor).where(Monitor.id.in_(ids), Monitor.user_id == user.id)
+        )
+        owned = {m.id: m for m in result.scalars()}
+
+    updates = []
+    for i, item in enumerate(data.update):
+        monitor = owned.get(item.id)
+        if monitor is None:
+            errors.setdefault("update", {})[str(i)] = ["Monitor not found."]
+            continue
+        fields, item_errors = check_update(monitor, item)
+        if item_errors:
+            errors.setdefault("update", {})[str(i)] = item_errors
+        updates.append((monitor, fields))
+
+    for i, monitor_id in enumerate(data.delete):
+        if monitor_id not in owned:
+            errors.setdefault("delete", {})[str(i)] = ["Monitor not found."]
+
+    if errors:
+        return validation_error(errors)
+
+    db.add_all(new_monitors)
+    for monitor, fields in updates:
+        apply_update(monitor, fields)
+        status_pages.invalidate_monitor_on_commit(db, monitor.id)
+    for monitor_id in dict.fromkeys(data.delete):
+        await remove_monitor(db, owned[monitor_id])
+    await db.flush()
+
+    deleted = set(data.delete)
+    return {
+        "created": [monitor_json(m) for m in new_monitors],
+        "updated": [monitor_json(m) for m, _ in updates if m.id not in deleted],
+        "deleted": list(dict.fromkeys(data.delete)),
+    }
+
+
+@router.post("/monitors/sync")
+async def api_sync(
+    data: SyncRequest,
+    dry_run: bool = False,
+    user: User = Depends(get_api_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Make the user's monitors match ``data.monitors`` exactly, matched by name.
+
+    Returns the plan; with ``?dry_run=true`` nothing is changed. Monitors not in
+    the manifest are deleted.
+    """
+    if len(data.monitors) > settings.sync_max_items:
+        return validation_error(
+            {"request": [f"At most {settings.sync_max_items} monitors per manifest."]}
+        )
+    desired, errors = sync.desired_state(data.monitors)
+    if errors:
+        return validation_error({"monitors": errors})
+
+    plan = await sync.plan_sync(db, user.id, desired)
+    if plan.changed and not dry_run:
+        await sync.apply_plan(db, user.id, plan)
+    return {"dry_run": dry_run, **plan.as_dict()}
@@ -5,7 +5,13 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth import create_access_token, get_current_user_optional, hash_password, verify_password
+from app import ratelimit
+from app.auth import (
+    create_access_token,
+    get_current_user_optional,
+    hash_password_async,
+    verify_password_async,
+)
 from app.database import get_db
 from app.models import User
 from app.main import templates
@@ -15,6 +21,19 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
 
 
+def too_many_attempts(request: Request, template: str, retry_after: int, **context):
+    return templates.TemplateResponse(
+        template,
+        {
+            "request": request,
+            "errors": ["Too many attempts. Please wait a minute and try again."],
+            **context,
+        },
+        status_code=429,
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
 @router.get("/register", response_class=HTMLResponse)
 async def register_page(request: Request, user: User | None = Depends(get_current_user_optional)):
     if user:
@@ -37,6 +56,12 @@ async def register(
     username = username.strip()
     email = email.strip().lower()
 
+    retry_after = ratelimit.check((ratelimit.register_by_ip, ratelimit.client_ip(request)))
+    if retry_after:
+        return too_many_attempts(
+            request, "auth/register.html", retry_after, username=username, email=email
+        )
+
     if len(username) < 3:
         errors.append("Username must be at least 3 characters.")
     if len(username) > 100:
@@ -69,11 +94,15 @@ async def register(
             status_code=422,
         )
 
+    # End the read transaction so the pooled connection is free while bcrypt runs
+    await db.commit()
+    hashed_password = await hash_password_async(password)
+
     # Create user
     user = User(
         email=email,
         username=username,
-        hashed_password=hash_password(password),
+        hashed_password=hashed_password,
         alert_email=email,
     )
     db.add(user)
@@ -108,10 +137,20 @@ async def login(
 ):
     email = email.strip().lower()
 
+    # Checked before the user query and bcrypt, which is what an attacker wants to burn
+    retry_after = ratelimit.check(
+        (ratelimit.login_by_ip, ratelimit.client_ip(request)),
+        (ratelimit.login_by_account, email),
+    )
+    if retry_after:
+        return too_many_attempts(request, "auth/login.html", retry_after, email=email)
+
     result = await db.execute(select(User).where(User.email == email))
     user = result.scalar_one_or_none()
+    # End the read transaction so the pooled connection is free while bcrypt runs
+    await db.commit()
 
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await verify_password_async(password, user.hashed_password):
         return templates.TemplateResponse(
             "auth/login.html",
             {"request": request, "errors": ["Invalid email or password."], "email": email},
@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends
+import hashlib
+from datetime import datetime
+from functools import lru_cache
+from html import escape
+
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import JSONResponse, Response
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_read_db
 from app.models import Monitor
+from app.uptime import UPTIME_WINDOWS, format_uptime, uptime_engine
 
 router = APIRouter(tags=["badge"])
 
@@ -13,9 +20,9 @@ SVG_TEMPLATE = """<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height
     <stop offset="0" stop-color="#bbb" stop-opacity=".1"/>
     <stop offset="1" stop-opacity=".1"/>
   </linearGradient>
-  <rect rx="3" width="{width}" height="20" fill="#555"/>
-  <rect rx="3" x="{label_width}" width="{value_width}" height="20" fill="{color}"/>
-  <rect rx="3" width="{width}" height="20" fill="url(#a)"/>
+  <rect rx="{rx}" width="{width}" height="20" fill="#555"/>
+  <rect rx="{rx}" x="{label_width}" width="{value_width}" height="20" fill="{color}"/>
+  <rect rx="{rx}" width="{width}" height="20" fill="url(#a)"/>
   <g fill="#fff" text-anchor="middle" font-family="DejaVu Sans,Verdana,Geneva,sans-serif" font-size="11">
     <text x="{label_center}" y="15" fill="#010101" fill-opacity=".3">{label}</text>
     <text x="{label_center}" y="14">{label}</text>
@@ -31,53 +38,188 @@ STATUS_COLORS = {
     "paused": "#dfb317",
 }
 
+# Corner radius per badge style
+BADGE_STYLES = {
+    "flat": 3,
+    "flat-square": 0,
+}
 
-@router.get("/badge/{slug}.svg")
-async def badge_svg(slug: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Monitor).where(Monitor.slug == slug))
-    monitor = result.scalar_one_or_none()
+MAX_LABEL_LENGTH = 40
+
+# Slug lookups, built once as Core statements returning plain rows: per request
+# only the parameter changes and the compiled SQL comes from SQLAlchemy's cache
+monitors = Monitor.__table__
+
+
+def _by_slug(*columns):
+    return select(*columns).where(monitors.c.slug == bindparam("badge_slug"))
+
+
+BADGE_STATUS = _by_slug(monitors.c.status, monitors.c.status_changed_at, monitors.c.created_at)
+BADGE_UPTIME = _by_slug(monitors.c.id, monitors.c.status)
+BADGE_SUMMARY = _by_slug(
+    monitors.c.id,
+    monitors.c.name,
+    monitors.c.status,
+    monitors.c.status_changed_at,
+    monitors.c.created_at,
+    monitors.c.last_ping_at,
+    monitors.c.period,
+    monitors.c.grace,
+)
+
+# (minimum uptime %, color), checked in order
+UPTIME_COLORS = [
+    (99.9, "#4c1"),
+    (99.0, "#97ca00"),
+    (95.0, "#dfb317"),
+    (0.0, "#e05d44"),
+]
 
-    if not monitor:
-        return Response(status_code=404)
 
-    label = "status"
-    value = monitor.status
-    color = STATUS_COLORS.get(monitor.status, "#9f9f9f")
+def uptime_color(value: float | None) -> str:
+    if value is None:
+        return "#9f9f9f"
+    for threshold, color in UPTIME_COLORS:
+        if value >= threshold:
+            return color
+    return UPTIME_COLORS[-1][1]
 
+
+@lru_cache(maxsize=512)
+def render_badge(label: str, value: str, color: str, style: str = "flat") -> bytes:
+    """Render a badge once per (label, value, color, style); later calls are a dict hit."""
     label_width = len(label) * 7 + 10
     value_width = len(value) * 7 + 10
     width = label_width + value_width
 
     svg = SVG_TEMPLATE.format(
         width=width,
+        rx=BADGE_STYLES.get(style, 3),
         label_width=label_width,
         value_width=value_width,
         color=color,
-        label=label,
-        value=value,
+        label=escape(label),
+        value=escape(value),
         label_center=label_width / 2,
         value_center=label_width + value_width / 2,
     )
+    return svg.encode()
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1(":".join(str(p) for p in parts).encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": f"public, max-age={settings.badge_max_age}"}
+
+
+def status_changed(status_changed_at: datetime | None, created_at: datetime) -> str:
+    return (status_changed_at or created_at).isoformat()
 
-    return Response(
-        content=svg,
-        media_type="image/svg+xml",
-        headers={"Cache-Control": "no-cache, no-store, must-revalidate"},
+
+@router.get("/badge/{slug}.svg")
+async def badge_svg(
+    slug: str,
+    request: Request,
+    label: str = "status",
+    style: str = "flat",
+    db: AsyncSession = Depends(get_read_db),
+):
+    row = (await db.execute(BADGE_STATUS, {"badge_slug": slug})).first()
+
+    if not row:
+        return Response(status_code=404)
+
+    label = label[:MAX_LABEL_LENGTH] or "status"
+    style = style if style in BADGE_STYLES else "flat"
+    etag = make_etag(
+        row.status, status_changed(row.status_changed_at, row.created_at), label, style
     )
+    headers = cache_headers(etag)
+
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    svg = render_badge(label, row.status, STATUS_COLORS.get(row.status, "#9f9f9f"), style)
+    return Response(content=svg, media_type="image/svg+xml", headers=headers)
+
+
+@router.get("/badge/{slug}/uptime.svg")
+async def badge_uptime_svg(
+    slug: str,
+    request: Request,
+    window: str = "30d",
+    label: str = "",
+    style: str = "flat",
+    db: AsyncSession = Depends(get_read_db),
+):
+    row = (await db.execute(BADGE_UPTIME, {"badge_slug": slug})).first()
+
+    if not row:
+        return Response(status_code=404)
+
+    window = window if window in UPTIME_WINDOWS else "30d"
+    label = label[:MAX_LABEL_LENGTH] or f"uptime {window}"
+    style = style if style in BADGE_STYLES else "flat"
+    uptime = await uptime_engine.cached(db, row.id, row.status, window)
+    value = format_uptime(uptime)
+
+    etag = make_etag("uptime", value, label, style)
+    headers = cache_headers(etag)
+
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    svg = render_badge(label, value, uptime_color(uptime), style)
+    return Response(content=svg, media_type="image/svg+xml", headers=headers)
 
 
 @router.get("/badge/{slug}.json")
-async def badge_json(slug: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Monitor).where(Monitor.slug == slug))
-    monitor = result.scalar_one_or_none()
+async def badge_json(slug: str, request: Request, db: AsyncSession = Depends(get_read_db)):
+    row = (await db.execute(BADGE_SUMMARY, {"badge_slug": slug})).first()
 
-    if not monitor:
+    if not row:
         return JSONResponse({"error": "Not found"}, status_code=404)
 
-    return JSONResponse({
-        "name": monitor.name,
-        "status": monitor.status,
-        "last_ping": monitor.last_ping_at.isoformat() if monitor.last_ping_at else None,
-        "period": monitor.period,
-        "grace": monitor.grace,
-    })
+    last_ping = row.last_ping_at.isoformat() if row.last_ping_at else None
+    # Rounded to the precision badges display, so the ETag only moves when the figure does
+    uptime = {
+        window: round(value, 2) if value is not None else None
+        for window, value in (await uptime_engine.cached_summary(db, row.id, row.status)).items()
+    }
+    etag = make_etag(
+        row.status,
+        status_changed(row.status_changed_at, row.created_at),
+        last_ping,
+        row.name,
+        row.period,
+        row.grace,
+        *uptime.values(),
+    )
+    headers = cache_headers(etag)
+
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    return JSONResponse(
+        {
+            "name": row.name,
+            "status": row.status,
+            "last_ping": last_ping,
+            "period": row.period,
+            "grace": row.grace,
+            "uptime": uptime,
+        },
+        headers=headers,
+    )
@@ -0,0 +1,103 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import archive
+from app.auth import get_api_user
+from app.database import get_read_db, get_session_factory
+from app.export import EXPORTS, FORMATS, export_query, stream_export
+from app.models import Monitor, User
+from app.routers.monitors import parse_range_bound
+
+router = APIRouter(prefix="/api/v1", tags=["export"])
+
+
+def export_response(
+    request: Request,
+    session_factory: async_sessionmaker,
+    kind: str,
+    fmt: str,
+    filename: str,
+    query,
+    segments=None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> StreamingResponse:
+    # Compress on the fly for clients that accept it; the body is never buffered whole
+    compress = "gzip" in request.headers.get("accept-encoding", "")
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return StreamingResponse(
+        stream_export(session_factory, query, kind, fmt, compress, segments, since, until),
+        media_type=FORMATS[fmt],
+        headers=headers,
+    )
+
+
+def check_params(kind: str, fmt: str) -> JSONResponse | None:
+    if kind not in EXPORTS:
+        return JSONResponse({"error": "Not found"}, status_code=404)
+    if fmt not in FORMATS:
+        return JSONResponse({"errors": [f"Unknown format {fmt!r}."]}, status_code=422)
+    return None
+
+
+@router.get("/export/{kind}")
+async def export_user_history(
+    request: Request,
+    kind: str,
+    format: str = "ndjson",
+    since: str = "",
+    until: str = "",
+    user: User = Depends(get_api_user),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    """Every ping or alert across the user's monitors, oldest first."""
+    error = check_params(kind, format)
+    if error:
+        return error
+    since_at, until_at = parse_range_bound(since), parse_range_bound(until, True)
+    query = export_query(kind, user.id, since=since_at, until=until_at)
+    segments = None
+    if kind == "pings":
+        segments = archive.segments_query(user_id=user.id, since=since_at, until=until_at)
+    return export_response(
+        request, session_factory, kind, format, kind, query, segments, since_at, until_at
+    )
+
+
+@router.get("/monitors/{monitor_id}/export/{kind}")
+async def export_monitor_history(
+    request: Request,
+    monitor_id: int,
+    kind: str,
+    format: str = "ndjson",
+    since: str = "",
+    until: str = "",
+    user: User = Depends(get_api_user),
+    db: AsyncSession = Depends(get_read_db),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    """One monitor's pings or alerts, oldest first."""
+    error = check_params(kind, format)
+    if error:
+        return error
+    owned = await db.scalar(
+        select(Monitor.id).where(Monitor.id == monitor_id, Monitor.user_id == user.id)
+    )
+    if owned is None:
+        return JSONResponse({"error": "Not found"}, status_code=404)
+    since_at, until_at = parse_range_bound(since), parse_range_bound(until, True)
+    query = export_query(kind, user.id, monitor_id, since=since_at, until=until_at)
+    segments = None
+    if kind == "pings":
+        segments = archive.segments_query(monitor_id, since=since_at, until=until_at)
+    filename = f"monitor-{monitor_id}-{kind}"
+    return export_response(
+        request, session_factory, kind, format, filename, query, segments, since_at, until_at
+    )
@@ -0,0 +1,60 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.auth import get_current_user
+from app.config import settings
+from app.database import get_session_factory
+from app.live import Subscriber, TooManyConnections, format_sse, hub
+
+router = APIRouter(tags=["live"])
+
+
+async def event_stream(subscriber: Subscriber, request: Request) -> AsyncIterator[str]:
+    """Relay a subscriber's events as SSE, with heartbeats so proxies keep the stream open."""
+    try:
+        yield f"retry: {settings.live_retry_ms}\n\n"
+        while not subscriber.closed.is_set():
+            if await request.is_disconnected():
+                return
+            try:
+                name, data = await asyncio.wait_for(
+                    subscriber.queue.get(), timeout=settings.live_heartbeat
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(name, data)
+        if subscriber.overflowed:
+            # Events were dropped; the page must reload to get back in sync
+            yield format_sse("reset", {})
+    finally:
+        hub.unsubscribe(subscriber)
+
+
+@router.get("/events")
+async def live_events(
+    request: Request,
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    # Authenticate on a session of our own (usually an auth cache hit, no
+    # query) and close it before streaming, so an open tab never holds a
+    # pooled connection for the life of the stream
+    async with session_factory() as db:
+        user_id = (await get_current_user(request, db)).id
+
+    try:
+        subscriber = hub.subscribe(user_id)
+    except TooManyConnections:
+        return PlainTextResponse(
+            "Too many live connections", status_code=429, headers={"Retry-After": "30"}
+        )
+
+    return StreamingResponse(
+        event_stream(subscriber, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
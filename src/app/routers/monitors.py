@@ -1,12 +1,17 @@
+from datetime import datetime, timedelta, timezone
+
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app import archive, counters, pagination, status_pages
 from app.auth import get_current_user
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.main import templates
-from app.models import Monitor, Ping, User
+from app.models import Monitor, Ping, User, monitor_urgency
 from app.config import settings
+from app.transitions import change_status
+from app.uptime import forget_uptime_on_commit, format_uptime, uptime_engine
 
 router = APIRouter(tags=["monitors"])
 
@@ -40,24 +45,134 @@ def format_duration(seconds: int) -> str:
     return f"{d}d"
 
 
+DASHBOARD_STATUSES = ("down", "new", "up", "paused")
+
+# sort name -> (keyset columns, descending)
+DASHBOARD_SORTS = {
+    "urgency": ([monitor_urgency, Monitor.name, Monitor.id], False),
+    "name": ([Monitor.name, Monitor.id], False),
+    "newest": ([Monitor.id], True),  # ids are assigned in creation order
+}
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def status_counts(db: AsyncSession, user_id: int) -> dict[str, int]:
+    """Monitors per status for one user, from the maintained counters."""
+    counts = dict.fromkeys(DASHBOARD_STATUSES, 0)
+    counts.update(await counters.user_status_counts(db, user_id))
+    return counts
+
+
+def parse_range_bound(value: str, end_of_day: bool = False) -> datetime | None:
+    """Parse a ``YYYY-MM-DD`` or ISO datetime filter; a bare ``until`` date includes that day.
+
+    Bounds with an offset are converted to naive UTC, the form stored times load as.
+    """
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    if end_of_day and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+
+async def list_monitors(
+    db: AsyncSession,
+    user_id: int,
+    status: str,
+    q: str,
+    sort: str,
+    after: str | None,
+    limit: int,
+) -> tuple[list[Monitor], str | None, bool]:
+    """One keyset page of a user's monitors: (monitors, next cursor, whether a cursor applied)."""
+    keys, descending = DASHBOARD_SORTS[sort]
+    if status and sort == "urgency":
+        # Urgency is constant within one status, so order by name on the status index
+        keys = keys[1:]
+
+    query = select(Monitor, *keys).where(Monitor.user_id == user_id)
+    if status:
+        query = query.where(Monitor.status == status)
+    if q:
+        query = query.where(Monitor.name.ilike(f"%{escape_like(q)}%", escape="\\"))
+    cursor = pagination.decode_cursor(after, len(keys))
+    if cursor is not None:
+        query = query.where(pagination.after(keys, cursor, descending))
+    order = [key.desc() for key in keys] if descending else keys
+
+    result = await db.execute(query.order_by(*order).limit(limit + 1))
+    rows, has_more = pagination.split_page(result.all(), limit)
+    next_cursor = pagination.encode_cursor(tuple(rows[-1][1:])) if has_more else None
+    return [row[0] for row in rows], next_cursor, cursor is not None
+
+
+def validate_monitor(
+    name: str, period: int, webhook_url: str | None
+) -> tuple[str, str | None, list[str]]:
+    """Normalize and check monitor fields; shared by the HTML forms and the JSON API.
+
+    Returns the cleaned name and webhook URL plus a list of error messages.
+    """
+    errors = []
+    name = name.strip()
+    webhook_url = (webhook_url or "").strip() or None
+
+    if len(name) < 1:
+        errors.append("Monitor name is required.")
+    if len(name) > 200:
+        errors.append("Monitor name must be at most 200 characters.")
+    if period < 60:
+        errors.append("Period must be at least 60 seconds.")
+    if webhook_url and not (webhook_url.startswith("http://") or webhook_url.startswith("https://")):
+        errors.append("Webhook URL must start with http:// or https://.")
+    return name, webhook_url, errors
+
+
+def set_paused(monitor: Monitor, paused: bool) -> None:
+    if paused and monitor.status != "paused":
+        change_status(monitor, "paused")
+    elif not paused and monitor.status == "paused":
+        # Resume to appropriate status
+        change_status(monitor, "up" if monitor.last_ping_at else "new")
+
+
+async def remove_monitor(db: AsyncSession, monitor: Monitor) -> None:
+    """Delete a monitor. Its pings, alerts, status events and status page links
+    go with it in the database (ON DELETE CASCADE) without being loaded."""
+    status_pages.invalidate_monitor_on_commit(db, monitor.id)
+    forget_uptime_on_commit(db, monitor.id)
+    await archive.drop_segments(db, monitor.id)
+    await db.delete(monitor)
+
+
 @router.get("/dashboard", response_class=HTMLResponse)
 async def dashboard(
     request: Request,
+    status: str = "",
+    q: str = "",
+    sort: str = "urgency",
+    after: str | None = None,
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    result = await db.execute(
-        select(Monitor)
-        .where(Monitor.user_id == user.id)
-        .order_by(Monitor.created_at.desc())
-    )
-    monitors = result.scalars().all()
+    counts = await status_counts(db, user.id)
 
-    # Count stats
-    total = len(monitors)
-    up_count = sum(1 for m in monitors if m.status == "up")
-    down_count = sum(1 for m in monitors if m.status == "down")
-    new_count = sum(1 for m in monitors if m.status == "new")
+    status = status if status in DASHBOARD_STATUSES else ""
+    sort = sort if sort in DASHBOARD_SORTS else "urgency"
+    q = q.strip()[:200]
+    monitors, next_cursor, paged = await list_monitors(
+        db, user.id, status, q, sort, after, settings.dashboard_page_size
+    )
 
     return templates.TemplateResponse(
         "dashboard.html",
@@ -65,10 +180,18 @@ async def dashboard(
             "request": request,
             "user": user,
             "monitors": monitors,
-            "total": total,
-            "up_count": up_count,
-            "down_count": down_count,
-            "new_count": new_count,
+            "total": sum(counts.values()),
+            "up_count": counts["up"],
+            "down_count": counts["down"],
+            "new_count": counts["new"],
+            "paused_count": counts["paused"],
+            "status_filter": status,
+            "q": q,
+            "sort": sort,
+            "sorts": list(DASHBOARD_SORTS),
+            "statuses": DASHBOARD_STATUSES,
+            "paged": paged,
+            "next_cursor": next_cursor,
             "format_duration": format_duration,
             "base_url": settings.base_url,
         },
@@ -102,18 +225,7 @@ async def create_monitor(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    errors = []
-    name = name.strip()
-    webhook_url = webhook_url.strip() or None
-
-    if len(name) < 1:
-        errors.append("Monitor name is required.")
-    if len(name) > 200:
-        errors.append("Monitor name must be at most 200 characters.")
-    if period < 60:
-        errors.append("Period must be at least 60 seconds.")
-    if webhook_url and not (webhook_url.startswith("http://") or webhook_url.startswith("https://")):
-        errors.append("Webhook URL must start with http:// or https://.")
+    name, webhook_url, errors = validate_monitor(name, period, webhook_url)
 
     if errors:
         return templates.TemplateResponse(
@@ -151,8 +263,11 @@ async def create_monitor(
 async def monitor_detail(
     monitor_id: int,
     request: Request,
+    since: str = "",
+    until: str = "",
+    before: str | None = None,
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     result = await db.execute(
         select(Monitor).where(Monitor.id == monitor_id, Monitor.user_id == user.id)
@@ -161,20 +276,44 @@ async def monitor_detail(
     if not monitor:
         return RedirectResponse("/dashboard", status_code=303)
 
-    # Get recent pings
+    # Ping history, newest first, one keyset page at a time
+    since_at = parse_range_bound(since)
+    until_at = parse_range_bound(until, end_of_day=True)
+    keys = [pagination.time_key(Ping.created_at), Ping.id]
+    query = select(Ping, *(key.label(f"key_{i}") for i, key in enumerate(keys))).where(
+        Ping.monitor_id == monitor.id
+    )
+    if since_at:
+        query = query.where(keys[0] >= pagination.time_bound(Ping.created_at, since_at))
+    if until_at:
+        query = query.where(keys[0] < pagination.time_bound(Ping.created_at, until_at))
+    cursor = pagination.decode_cursor(before, len(keys))
+    if cursor is not None:
+        query = query.where(pagination.after(keys, cursor, descending=True))
+
+    page_size = settings.ping_page_size
     ping_result = await db.execute(
-        select(Ping)
-        .where(Ping.monitor_id == monitor.id)
-        .order_by(Ping.created_at.desc())
-        .limit(50)
+        query.order_by(*(key.desc() for key in keys)).limit(page_size + 1)
     )
-    pings = ping_result.scalars().all()
+    rows, has_more = pagination.split_page(ping_result.all(), page_size)
+    pings = [row[0] for row in rows]
+    older_key = tuple(rows[-1][1:]) if rows else None
+    if not has_more:
+        # Live history is exhausted; continue into archived (older) pings
+        room = page_size - len(pings)
+        archived = await archive.archived_pings(
+            db, monitor.id, since_at, until_at, cursor, room + 1
+        )
+        archived, has_more = pagination.split_page(archived, room)
+        pings += archived
+        if archived:
+            older_key = archive.ping_key(archived[-1])
+    older_cursor = pagination.encode_cursor(older_key) if has_more else None
 
-    # Get ping count
-    count_result = await db.execute(
-        select(func.count()).where(Ping.monitor_id == monitor.id)
-    )
-    ping_count = count_result.scalar()
+    recent_days = settings.ping_count_days
+    recent_count = await counters.recent_pings(db, monitor.id, recent_days)
+
+    uptime = await uptime_engine.summary(db, monitor.id, monitor.status)
 
     return templates.TemplateResponse(
         "monitors/detail.html",
@@ -183,7 +322,15 @@ async def monitor_detail(
             "user": user,
             "monitor": monitor,
             "pings": pings,
-            "ping_count": ping_count,
+            "ping_count": monitor.ping_count,
+            "recent_count": recent_count,
+            "recent_days": recent_days,
+            "since": since.strip() if since_at else "",
+            "until": until.strip() if until_at else "",
+            "paged": cursor is not None,
+            "older_cursor": older_cursor,
+            "uptime": uptime,
+            "format_uptime": format_uptime,
             "format_duration": format_duration,
             "base_url": settings.base_url,
         },
@@ -195,7 +342,7 @@ async def edit_monitor_page(
     monitor_id: int,
     request: Request,
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     result = await db.execute(
         select(Monitor).where(Monitor.id == monitor_id, Monitor.user_id == user.id)
@@ -234,18 +381,7 @@ async def update_monitor(
     if not monitor:
         return RedirectResponse("/dashboard", status_code=303)
 
-    errors = []
-    name = name.strip()
-    webhook_url = webhook_url.strip() or None
-
-    if len(name) < 1:
-        errors.append("Monitor name is required.")
-    if len(name) > 200:
-        errors.append("Monitor name must be at most 200 characters.")
-    if period < 60:
-        errors.append("Period must be at least 60 seconds.")
-    if webhook_url and not (webhook_url.startswith("http://") or webhook_url.startswith("https://")):
-        errors.append("Webhook URL must start with http:// or https://.")
+    name, webhook_url, errors = validate_monitor(name, period, webhook_url)
 
     if errors:
         return templates.TemplateResponse(
@@ -265,6 +401,7 @@ async def update_monitor(
     monitor.period = period
     monitor.grace = compute_grace(period, grace)
     monitor.webhook_url = webhook_url
+    status_pages.invalidate_monitor_on_commit(db, monitor.id)
 
     return RedirectResponse(f"/monitors/{monitor.id}", status_code=303)
 
@@ -280,7 +417,7 @@ async def delete_monitor(
     )
     monitor = result.scalar_one_or_none()
     if monitor:
-        await db.delete(monitor)
+        await remove_monitor(db, monitor)
 
     return RedirectResponse("/dashboard", status_code=303)
 
@@ -295,8 +432,8 @@ async def pause_monitor(
         select(Monitor).where(Monitor.id == monitor_id, Monitor.user_id == user.id)
     )
     monitor = result.scalar_one_or_none()
-    if monitor and monitor.status != "paused":
-        monitor.status = "paused"
+    if monitor:
+        set_paused(monitor, True)
 
     return RedirectResponse(f"/monitors/{monitor_id}", status_code=303)
 
@@ -311,11 +448,7 @@ async def resume_monitor(
         select(Monitor).where(Monitor.id == monitor_id, Monitor.user_id == user.id)
     )
     monitor = result.scalar_one_or_none()
-    if monitor and monitor.status == "paused":
-        # Resume to appropriate status
-        if monitor.last_ping_at:
-            monitor.status = "up"
-        else:
-            monitor.status = "new"
+    if monitor:
+        set_paused(monitor, False)
 
     return RedirectResponse(f"/monitors/{monitor_id}", status_code=303)
@@ -2,14 +2,35 @@ from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import PlainTextResponse
-from sqlalchemy import select
+from sqlalchemy import BigInteger, bindparam, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models import Monitor, Ping
+from app import counters, interning, metrics, ratelimit
+from app.database import DEFER_WRITE_MARK, get_db
+from app.live import publish_on_commit
+from app.models import Monitor, Ping, to_epoch
+from app.transitions import change_status
 
 router = APIRouter(tags=["ping"])
 
+# Built once: per call only the parameters change, so SQLAlchemy skips
+# statement construction and reuses the compiled SQL from its cache.
+monitors, pings = Monitor.__table__, Ping.__table__
+STAMP_UP_MONITOR = (
+    update(monitors)
+    .where(monitors.c.slug == bindparam("ping_slug"), monitors.c.status == "up")
+    .values(
+        last_ping_at=bindparam("ping_at", type_=BigInteger),
+        deadline_at=bindparam("ping_at", type_=BigInteger) + monitors.c.period + monitors.c.grace,
+        ping_count=monitors.c.ping_count + 1,
+    )
+    .returning(monitors.c.id, monitors.c.user_id)
+    # Matching no row writes nothing; the ping insert marks the session written
+    .execution_options(**{DEFER_WRITE_MARK: True})
+)
+INSERT_PING = insert(pings)
+MONITOR_BY_SLUG = select(Monitor).where(Monitor.slug == bindparam("ping_slug"))
+
 
 @router.api_route("/ping/{slug}", methods=["GET", "POST"], response_class=PlainTextResponse)
 async def receive_ping(
@@ -18,33 +39,70 @@ async def receive_ping(
     db: AsyncSession = Depends(get_db),
 ):
     """Receive a ping for a monitor. No authentication required. Must be fast."""
-    result = await db.execute(select(Monitor).where(Monitor.slug == slug))
+    retry_after = ratelimit.check(
+        (ratelimit.ping_by_ip, ratelimit.client_ip(request)),
+        (ratelimit.ping_by_slug, slug),
+    )
+    if retry_after:
+        metrics.pings.inc("limited")
+        return PlainTextResponse(
+            "Too Many Requests", status_code=429, headers={"Retry-After": str(retry_after)}
+        )
+
+    now = datetime.now(timezone.utc)
+    remote_addr = request.client.host if request.client else None
+    user_agent = request.headers.get("user-agent", "")[:500]
+
+    # Common case: a healthy monitor checking in. One UPDATE ... RETURNING stamps it
+    # and hands back what the ping row needs, without loading the monitor.
+    stamped = (await db.execute(
+        STAMP_UP_MONITOR, {"ping_slug": slug, "ping_at": to_epoch(now)}
+    )).first()
+    if stamped:
+        await db.execute(INSERT_PING, {
+            "monitor_id": stamped.id,
+            **await interning.ping_ids_async(db, remote_addr, user_agent),
+        })
+        await counters.count_ping_day(db, stamped.id, now)
+        publish_on_commit(db, stamped.user_id, "ping", {
+            "monitor_id": stamped.id,
+            "at": now.isoformat(),
+        })
+        metrics.pings.inc("accepted")
+        return PlainTextResponse("OK", status_code=200)
+
+    result = await db.execute(MONITOR_BY_SLUG, {"ping_slug": slug})
     monitor = result.scalar_one_or_none()
 
     if not monitor:
+        metrics.pings.inc("unknown")
         return PlainTextResponse("Not Found", status_code=404)
 
     if monitor.status == "paused":
+        metrics.pings.inc("paused")
         return PlainTextResponse("OK (paused)", status_code=200)
 
-    now = datetime.now(timezone.utc)
     was_down = monitor.status == "down"
 
     # Update monitor status
     monitor.last_ping_at = now
-    monitor.status = "up"
+    change_status(monitor, "up", now)
 
     # Record ping
-    ping = Ping(
-        monitor_id=monitor.id,
-        remote_addr=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent", "")[:500],
-    )
-    db.add(ping)
+    await db.execute(INSERT_PING, {
+        "monitor_id": monitor.id,
+        **await interning.ping_ids_async(db, remote_addr, user_agent),
+    })
+    await counters.count_ping(db, monitor.id, now)
+    publish_on_commit(db, monitor.user_id, "ping", {
+        "monitor_id": monitor.id,
+        "at": now.isoformat(),
+    })
 
     # If recovering from down, we'll handle alert in the checker or here
     if was_down:
         from app.alerts import send_recovery_alert
         await send_recovery_alert(monitor, db)
 
+    metrics.pings.inc("accepted")
     return PlainTextResponse("OK", status_code=200)
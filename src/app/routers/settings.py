@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import HTMLResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth import get_current_user, hash_password, verify_password
+from app.auth import get_current_user, hash_password_async, verify_password_async
 from app.database import get_db
 from app.main import templates
 from app.models import User
@@ -52,7 +52,9 @@ async def change_password(
 ):
     errors = []
 
-    if not verify_password(current_password, user.hashed_password):
+    # End the read transaction so the pooled connection is free while bcrypt runs
+    await db.commit()
+    if not await verify_password_async(current_password, user.hashed_password):
         errors.append("Current password is incorrect.")
     if len(new_password) < 8:
         errors.append("New password must be at least 8 characters.")
@@ -66,7 +68,7 @@ async def change_password(
             status_code=422,
         )
 
-    user.hashed_password = hash_password(new_password)
+    user.hashed_password = await hash_password_async(new_password)
 
     return templates.TemplateResponse(
         "settings.html",
@@ -0,0 +1,138 @@
+from fastapi import APIRouter, Depends, Form, Request
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app import status_pages
+from app.auth import get_current_user
+from app.config import settings
+from app.database import get_db, get_read_db
+from app.main import templates
+from app.models import Monitor, StatusPage, User, generate_uuid
+from app.routers.badge import is_not_modified
+
+router = APIRouter(tags=["status pages"])
+
+
+async def render_index(
+    request: Request,
+    user: User,
+    db: AsyncSession,
+    errors: list[str] | None = None,
+    status_code: int = 200,
+):
+    pages_result = await db.execute(
+        select(StatusPage)
+        .options(selectinload(StatusPage.monitors))
+        .where(StatusPage.user_id == user.id)
+        .order_by(StatusPage.created_at.desc())
+    )
+    monitors_result = await db.execute(
+        select(Monitor).where(Monitor.user_id == user.id).order_by(Monitor.name)
+    )
+    return templates.TemplateResponse(
+        "status_pages/index.html",
+        {
+            "request": request,
+            "user": user,
+            "pages": pages_result.scalars().all(),
+            "monitors": monitors_result.scalars().all(),
+            "errors": errors,
+            "base_url": settings.base_url,
+        },
+        status_code=status_code,
+    )
+
+
+@router.get("/status-pages", response_class=HTMLResponse)
+async def status_pages_index(
+    request: Request,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return await render_index(request, user, db)
+
+
+@router.post("/status-pages/new")
+async def create_status_page(
+    request: Request,
+    title: str = Form(...),
+    monitor_ids: list[int] = Form([]),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    errors = []
+    title = title.strip()
+
+    if len(title) < 1:
+        errors.append("Status page title is required.")
+    if len(title) > 200:
+        errors.append("Status page title must be at most 200 characters.")
+
+    monitors = []
+    if monitor_ids:
+        result = await db.execute(
+            select(Monitor).where(Monitor.id.in_(monitor_ids), Monitor.user_id == user.id)
+        )
+        monitors = result.scalars().all()
+    if not monitors:
+        errors.append("Select at least one monitor.")
+
+    if errors:
+        return await render_index(request, user, db, errors=errors, status_code=422)
+
+    page = StatusPage(slug=generate_uuid(), user_id=user.id, title=title, monitors=list(monitors))
+    db.add(page)
+    # The slug may have been probed (and cached as missing) before it existed
+    status_pages.invalidate_page_on_commit(db, page.slug)
+    return RedirectResponse("/status-pages", status_code=303)
+
+
+@router.post("/status-pages/{page_id}/delete")
+async def delete_status_page(
+    page_id: int,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    result = await db.execute(
+        select(StatusPage).where(StatusPage.id == page_id, StatusPage.user_id == user.id)
+    )
+    page = result.scalar_one_or_none()
+    if page:
+        status_pages.invalidate_page_on_commit(db, page.slug)
+        await db.delete(page)
+
+    return RedirectResponse("/status-pages", status_code=303)
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": f"public, max-age={settings.status_page_max_age}"}
+
+
+# Public pages render from the primary (get_db), not the read replica: a render
+# is cached until the page's next transition, so one taken from a lagging
+# replica could stay stale indefinitely. Cache hits never connect at all.
+# Declared before /status/{slug} so ".json" is not swallowed by the slug parameter
+@router.get("/status/{slug}.json")
+async def public_status_json(slug: str, request: Request, db: AsyncSession = Depends(get_db)):
+    page = await status_pages.get_rendered(db, slug)
+    if not page:
+        return JSONResponse({"error": "Not found"}, status_code=404)
+
+    headers = cache_headers(page.json_etag)
+    if is_not_modified(request, page.json_etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=page.json, media_type="application/json", headers=headers)
+
+
+@router.get("/status/{slug}", response_class=HTMLResponse)
+async def public_status_page(slug: str, request: Request, db: AsyncSession = Depends(get_db)):
+    page = await status_pages.get_rendered(db, slug)
+    if not page:
+        return HTMLResponse("Not Found", status_code=404)
+
+    headers = cache_headers(page.html_etag)
+    if is_not_modified(request, page.html_etag):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=page.html, headers=headers)
@@ -0,0 +1,177 @@
+"""Pre-rendered public status pages.
+
+Public hits are served from rendered bytes held in memory. A page is only
+re-rendered (one query) after one of its monitors changes status, it is
+edited, or a member monitor is deleted; anonymous traffic never reaches the
+database otherwise.
+"""
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+
+from app.models import StatusPage
+from app.transitions import Transition, add_listener
+
+_PENDING_MONITORS_KEY = "cronguard_status_page_monitors"
+_PENDING_PAGES_KEY = "cronguard_status_page_slugs"
+
+
+@dataclass(frozen=True)
+class RenderedPage:
+    html: bytes
+    html_etag: str
+    json: bytes
+    json_etag: str
+    monitor_ids: frozenset[int]
+
+
+_cache: dict[str, RenderedPage] = {}
+_pages_by_monitor: dict[int, set[str]] = {}
+# Slugs known not to exist, so probing random /status/<uuid> URLs stays off the
+# database too. LRU-bounded; a slug is dropped from here when its page is created.
+MAX_MISSING = 10_000
+_missing: OrderedDict[str, None] = OrderedDict()
+# Bumped on every invalidation so a render that raced with one is not cached
+_generation = 0
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+
+def overall_status(statuses: list[str]) -> str:
+    if "down" in statuses:
+        return "down"
+    if statuses and all(s == "up" for s in statuses):
+        return "up"
+    return "partial"
+
+
+def invalidate_page(slug: str) -> None:
+    global _generation
+    _generation += 1
+    _missing.pop(slug, None)
+    page = _cache.pop(slug, None)
+    if page:
+        for monitor_id in page.monitor_ids:
+            slugs = _pages_by_monitor.get(monitor_id)
+            if slugs:
+                slugs.discard(slug)
+                if not slugs:
+                    del _pages_by_monitor[monitor_id]
+
+
+def invalidate_monitor(monitor_id: int) -> None:
+    for slug in list(_pages_by_monitor.get(monitor_id, ())):
+        invalidate_page(slug)
+
+
+def invalidate_monitor_on_commit(db: AsyncSession, monitor_id: int) -> None:
+    """Invalidate pages showing ``monitor_id`` once ``db`` commits (e.g. on delete)."""
+    db.info.setdefault(_PENDING_MONITORS_KEY, set()).add(monitor_id)
+
+
+def invalidate_page_on_commit(db: AsyncSession, slug: str) -> None:
+    db.info.setdefault(_PENDING_PAGES_KEY, set()).add(slug)
+
+
+def clear() -> None:
+    global _generation
+    _generation += 1
+    _cache.clear()
+    _pages_by_monitor.clear()
+    _missing.clear()
+
+
+@add_listener
+def _on_transition(transition: Transition) -> None:
+    invalidate_monitor(transition.monitor_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    for monitor_id in session.info.pop(_PENDING_MONITORS_KEY, ()):
+        invalidate_monitor(monitor_id)
+    for slug in session.info.pop(_PENDING_PAGES_KEY, ()):
+        invalidate_page(slug)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_MONITORS_KEY, None)
+    session.info.pop(_PENDING_PAGES_KEY, None)
+
+
+async def render(db: AsyncSession, slug: str) -> RenderedPage | None:
+    from app.main import templates
+
+    result = await db.execute(
+        select(StatusPage)
+        .options(selectinload(StatusPage.monitors))
+        .where(StatusPage.slug == slug)
+    )
+    page = result.scalar_one_or_none()
+    if not page:
+        return None
+
+    generated_at = datetime.now(timezone.utc)
+    monitors = [
+        {
+            "name": m.name,
+            "status": m.status,
+            "since": (m.status_changed_at or m.created_at).isoformat(),
+        }
+        for m in page.monitors
+    ]
+    overall = overall_status([m["status"] for m in monitors])
+
+    html = templates.get_template("status_pages/public.html").render(
+        title=page.title,
+        overall=overall,
+        monitors=monitors,
+        generated_at=generated_at,
+    ).encode()
+    body = json.dumps({
+        "title": page.title,
+        "status": overall,
+        "generated_at": generated_at.isoformat(),
+        "monitors": monitors,
+    }).encode()
+
+    return RenderedPage(
+        html=html,
+        html_etag=_etag(html),
+        json=body,
+        json_etag=_etag(body),
+        monitor_ids=frozenset(m.id for m in page.monitors),
+    )
+
+
+async def get_rendered(db: AsyncSession, slug: str) -> RenderedPage | None:
+    """Return the cached render of a page, rendering it first on a miss."""
+    page = _cache.get(slug)
+    if page is not None:
+        return page
+    if slug in _missing:
+        _missing.move_to_end(slug)
+        return None
+
+    generation = _generation
+    page = await render(db, slug)
+    if generation != _generation:
+        return page
+    if page is None:
+        _missing[slug] = None
+        if len(_missing) > MAX_MISSING:
+            _missing.popitem(last=False)
+    else:
+        _cache[slug] = page
+        for monitor_id in page.monitor_ids:
+            _pages_by_monitor.setdefault(monitor_id, set()).add(slug)
+    return page
@@ -0,0 +1,173 @@
+"""Declarative monitor sync: make a user's monitors match a manifest exactly.
+
+Monitors are matched to manifest entries by name. ``plan_sync`` reads only the
+columns it compares, in one query, so re-syncing an unchanged manifest costs a
+single SELECT and no writes. ``apply_plan`` then loads just the rows that
+change and applies every insert, update and delete on the caller's session,
+so they commit (or roll back) together.
+"""
+from dataclasses import dataclass, field
+
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import status_pages
+from app.models import Monitor
+from app.routers.monitors import compute_grace, remove_monitor, set_paused, validate_monitor
+
+SYNCED_FIELDS = ("period", "grace", "webhook_url", "paused")
+
+
+class ManifestEntry(BaseModel):
+    name: str
+    period: int
+    grace: int = 0
+    webhook_url: str | None = None
+    paused: bool = False
+
+
+@dataclass
+class SyncPlan:
+    create: list[dict] = field(default_factory=list)
+    # (monitor id, name, {field: (old, new)})
+    update: list[tuple[int, str, dict]] = field(default_factory=list)
+    # (monitor id, name)
+    delete: list[tuple[int, str]] = field(default_factory=list)
+    unchanged: int = 0
+    # (monitor id, name) of planned updates and deletes whose monitor was
+    # deleted before the plan was applied; skipped, a re-sync recreates them
+    gone: list[tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.create or self.update or self.delete)
+
+    def as_dict(self) -> dict:
+        return {
+            "create": [entry["name"] for entry in self.create],
+            "update": [
+                {
+                    "id": monitor_id,
+                    "name": name,
+                    "changes": {key: list(pair) for key, pair in changes.items()},
+                }
+                for monitor_id, name, changes in self.update
+            ],
+            "delete": [{"id": monitor_id, "name": name} for monitor_id, name in self.delete],
+            "unchanged": self.unchanged,
+            "gone": [{"id": monitor_id, "name": name} for monitor_id, name in self.gone],
+        }
+
+
+def desired_state(entries: list[ManifestEntry]) -> tuple[dict[str, dict], dict[str, list[str]]]:
+    """Validate and normalize a manifest into ``{name: fields}``; errors keyed by entry index."""
+    desired: dict[str, dict] = {}
+    errors: dict[str, list[str]] = {}
+    for i, entry in enumerate(entries):
+        name, webhook_url, item_errors = validate_monitor(
+            entry.name, entry.period, entry.webhook_url
+        )
+        if not item_errors and name in desired:
+            item_errors = [f"Duplicate monitor name {name!r}."]
+        if item_errors:
+            errors[str(i)] = item_errors
+            continue
+        desired[name] = {
+            "name": name,
+            "period": entry.period,
+            "grace": compute_grace(entry.period, entry.grace),
+            "webhook_url": webhook_url,
+            "paused": entry.paused,
+        }
+    return desired, errors
+
+
+async def plan_sync(db: AsyncSession, user_id: int, desired: dict[str, dict]) -> SyncPlan:
+    """Diff the desired monitors against the user's current ones without loading full rows."""
+    result = await db.execute(
+        select(
+            Monitor.id,
+            Monitor.name,
+            Monitor.period,
+            Monitor.grace,
+            Monitor.webhook_url,
+            Monitor.status,
+        )
+        .where(Monitor.user_id == user_id)
+        .order_by(Monitor.id)
+    )
+
+    plan = SyncPlan()
+    seen = set()
+    for monitor_id, name, period, grace, webhook_url, status in result.tuples():
+        wanted = desired.get(name)
+        if wanted is None or name in seen:
+            # Not in the manifest, or a duplicate name: only the oldest match is kept
+            plan.delete.append((monitor_id, name))
+            continue
+        seen.add(name)
+        current = {
+            "period": period,
+            "grace": grace,
+            "webhook_url": webhook_url,
+            "paused": status == "paused",
+        }
+        changes = {
+            key: (current[key], wanted[key])
+            for key in SYNCED_FIELDS
+            if current[key] != wanted[key]
+        }
+        if changes:
+            plan.update.append((monitor_id, name, changes))
+        else:
+            plan.unchanged += 1
+
+    plan.create = [fields for name, fields in desired.items() if name not in seen]
+    return plan
+
+
+async def apply_plan(db: AsyncSession, user_id: int, plan: SyncPlan) -> None:
+    """Apply a plan on ``db``; the caller's commit makes it atomic.
+
+    Monitors deleted since the plan was made are skipped and listed in ``plan.gone``.
+    """
+    ids = [monitor_id for monitor_id, _, _ in plan.update]
+    ids += [monitor_id for monitor_id, _ in plan.delete]
+    monitors = {}
+    if ids:
+        result = await db.execute(
+            select(Monitor).where(Monitor.id.in_(ids), Monitor.user_id == user_id)
+        )
+        monitors = {m.id: m for m in result.scalars()}
+
+    for monitor_id, name, changes in plan.update:
+        monitor = monitors.get(monitor_id)
+        if monitor is None:
+            plan.gone.append((monitor_id, name))
+            continue
+        for key, (_, new) in changes.items():
+            if key == "paused":
+                set_paused(monitor, new)
+            else:
+                setattr(monitor, key, new)
+        status_pages.invalidate_monitor_on_commit(db, monitor_id)
+
+    for monitor_id, name in plan.delete:
+        if monitor_id not in monitors:
+            plan.gone.append((monitor_id, name))
+            continue
+        await remove_monitor(db, monitors[monitor_id])
+
+    db.add_all(
+        Monitor(
+            user_id=user_id,
+            name=fields["name"],
+            period=fields["period"],
+            grace=fields["grace"],
+            webhook_url=fields["webhook_url"],
+            status="paused" if fields["paused"] else "new",
+        )
+        for fields in plan.create
+    )
+    await db.flush()
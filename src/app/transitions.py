@@ -0,0 +1,81 @@
+"""Single entry point for monitor status changes.
+
+``change_status`` updates the monitor, appends a ``StatusEvent`` row and
+queues a ``Transition`` on its session. Listeners registered with
+``add_listener`` are called once that session commits, so anything derived
+from monitor status (public status pages, live updates) never observes a
+change that was rolled back.
+"""
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.models import Monitor, StatusEvent
+
+logger = logging.getLogger("cronguard.transitions")
+
+_PENDING_KEY = "cronguard_transitions"
+
+
+@dataclass(frozen=True)
+class Transition:
+    monitor_id: int
+    user_id: int
+    previous: str
+    status: str
+    at: datetime
+
+
+_listeners: list[Callable[[Transition], None]] = []
+
+
+def add_listener(listener: Callable[[Transition], None]) -> Callable[[Transition], None]:
+    """Register a callback run for every committed transition. Usable as a decorator."""
+    _listeners.append(listener)
+    return listener
+
+
+def _notify(transitions: list[Transition]) -> None:
+    for transition in transitions:
+        for listener in _listeners:
+            try:
+                listener(transition)
+            except Exception as e:
+                logger.error(f"Transition listener {listener.__name__} failed: {e}")
+
+
+def change_status(monitor: Monitor, status: str, at: datetime | None = None) -> bool:
+    """Move a monitor to ``status``, logging a StatusEvent.
+
+    Returns True if the status actually changed.
+    """
+    previous = monitor.status
+    at = at or datetime.now(timezone.utc)
+    if not monitor.set_status(status, at):
+        return False
+
+    monitor.status_events.add(StatusEvent(from_status=previous, to_status=status, at=at))
+
+    transition = Transition(monitor.id, monitor.user_id, previous, status, at)
+    session = object_session(monitor)
+    if session is None:
+        _notify([transition])
+    else:
+        session.info.setdefault(_PENDING_KEY, []).append(transition)
+    return True
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        _notify(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
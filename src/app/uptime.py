@@ -0,0 +1,279 @@
+"""Uptime/SLA engine over the ``status_events`` transition log.
+
+Uptime over a window is the share of *monitored* time (up or down) spent up;
+time spent new or paused counts toward neither side. Answering a query walks
+the transitions inside the window once. Whole UTC days are immutable once
+they have ended, so their up/down totals and end status are cached and later
+queries only fetch transitions for the partial first day plus any days not
+cached yet.
+
+Public badges read through ``cached``, which keeps each (monitor, window)
+result for ``settings.uptime_cache_ttl`` seconds and drops it as soon as the
+monitor changes status, so anonymous badge traffic costs no extra queries.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import StatusEvent
+from app.transitions import Transition, add_listener
+
+_PENDING_KEY = "cronguard_uptime_forget"
+
+DAY = timedelta(days=1)
+
+UPTIME_WINDOWS = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+    "90d": timedelta(days=90),
+}
+
+
+@dataclass(frozen=True)
+class DaySummary:
+    up: float  # seconds
+    down: float
+    end_status: str
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    """Timestamps are stored as naive UTC; compare everything in that form."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _floor_day(dt: datetime) -> datetime:
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _ceil_day(dt: datetime) -> datetime:
+    floor = _floor_day(dt)
+    return floor if floor == dt else floor + DAY
+
+
+def _integrate(
+    status: str, events: list[tuple], lo: datetime, hi: datetime
+) -> tuple[float, float, str]:
+    """Up/down seconds in [lo, hi) starting from ``status``, given the events inside it."""
+    up = down = 0.0
+    cursor = lo
+    for at, to_status in events:
+        span = (at - cursor).total_seconds()
+        if status == "up":
+            up += span
+        elif status == "down":
+            down += span
+        status, cursor = to_status, at
+    span = (hi - cursor).total_seconds()
+    if status == "up":
+        up += span
+    elif status == "down":
+        down += span
+    return up, down, status
+
+
+class UptimeEngine:
+    def __init__(self, max_cached_days: int = 100_000, max_cached_results: int = 100_000):
+        self.max_cached_days = max_cached_days
+        self.max_cached_results = max_cached_results
+        self._days: OrderedDict[tuple[int, datetime], DaySummary] = OrderedDict()
+        # (monitor_id, window name) -> (monotonic expiry, uptime)
+        self._results: OrderedDict[tuple[int, str], tuple[float, float | None]] = OrderedDict()
+
+    def _cached(self, monitor_id: int, day: datetime) -> DaySummary | None:
+        key = (monitor_id, day)
+        summary = self._days.get(key)
+        if summary is not None:
+            self._days.move_to_end(key)
+        return summary
+
+    def _store(self, monitor_id: int, day: datetime, summary: DaySummary) -> None:
+        self._days[(monitor_id, day)] = summary
+        if len(self._days) > self.max_cached_days:
+            self._days.popitem(last=False)
+
+    def forget_results(self, monitor_id: int) -> None:
+        for window in UPTIME_WINDOWS:
+            self._results.pop((monitor_id, window), None)
+
+    def forget(self, monitor_id: int) -> None:
+        for key in [k for k in self._days if k[0] == monitor_id]:
+            del self._days[key]
+        self.forget_results(monitor_id)
+
+    def clear(self) -> None:
+        self._days.clear()
+        self._results.clear()
+
+    async def _status_at(
+        self, db: AsyncSession, monitor_id: int, at: datetime, current_status: str
+    ) -> str:
+        result = await db.execute(
+            select(StatusEvent.to_status)
+            .where(StatusEvent.monitor_id == monitor_id, StatusEvent.at < at)
+            .order_by(StatusEvent.at.desc(), StatusEvent.id.desc())
+            .limit(1)
+        )
+        status = result.scalar()
+        if status is not None:
+            return status
+
+        # Nothing logged before ``at``: the status then is whatever the next
+        # transition moved away from, or the current status if there is none.
+        result = await db.execute(
+            select(StatusEvent.from_status)
+            .where(StatusEvent.monitor_id == monitor_id, StatusEvent.at >= at)
+            .order_by(StatusEvent.at, StatusEvent.id)
+            .limit(1)
+        )
+        return result.scalar() or current_status
+
+    async def uptime(
+        self,
+        db: AsyncSession,
+        monitor_id: int,
+        current_status: str,
+        window: timedelta,
+        now: datetime | None = None,
+    ) -> float | None:
+        """Percentage of monitored time spent up over ``window``, or None if none was monitored."""
+        now = _naive_utc(now or datetime.now(timezone.utc))
+        start = now - window
+
+        first_full = _ceil_day(start)
+        if first_full >= now:
+            full_days = []
+            head_end = now
+        else:
+            head_end = first_full
+            full_days = [
+                first_full + i * DAY for i in range((_floor_day(now) - first_full).days)
+            ]
+        tail_start = full_days[-1] + DAY if full_days else head_end
+
+        cached = []
+        for day in full_days:
+            summary = self._cached(monitor_id, day)
+            if summary is None:
+                break
+            cached.append(summary)
+        # Transitions are needed for the partial head and everything after the cached run
+        fetch_from = full_days[len(cached)] if len(cached) < len(full_days) else tail_start
+
+        result = await db.execute(
+            select(StatusEvent.at, StatusEvent.to_status)
+            .where(
+                StatusEvent.monitor_id == monitor_id,
+                StatusEvent.at >= start,
+                StatusEvent.at < now,
+                or_(StatusEvent.at < head_end, StatusEvent.at >= fetch_from),
+            )
+            .order_by(StatusEvent.at, StatusEvent.id)
+        )
+        events = [(_naive_utc(at), to_status) for at, to_status in result.all()]
+
+        status = await self._status_at(db, monitor_id, start, current_status)
+        up, down, status = _integrate(
+            status, [e for e in events if e[0] < head_end], start, head_end
+        )
+
+        for i, day in enumerate(full_days):
+            if i < len(cached):
+                summary = cached[i]
+            else:
+                day_end = day + DAY
+                day_up, day_down, end_status = _integrate(
+                    status, [e for e in events if day <= e[0] < day_end], day, day_end
+                )
+                summary = DaySummary(day_up, day_down, end_status)
+                self._store(monitor_id, day, summary)
+            up += summary.up
+            down += summary.down
+            status = summary.end_status
+
+        if tail_start < now:
+            tail_up, tail_down, status = _integrate(
+                status, [e for e in events if e[0] >= tail_start], tail_start, now
+            )
+            up += tail_up
+            down += tail_down
+
+        monitored = up + down
+        if monitored <= 0:
+            return None
+        return up / monitored * 100
+
+    async def summary(
+        self, db: AsyncSession, monitor_id: int, current_status: str, now: datetime | None = None
+    ) -> dict[str, float | None]:
+        """Uptime for the standard 24h/7d/30d windows."""
+        now = now or datetime.now(timezone.utc)
+        return {
+            name: await self.uptime(db, monitor_id, current_status, UPTIME_WINDOWS[name], now)
+            for name in ("24h", "7d", "30d")
+        }
+
+    async def cached(
+        self, db: AsyncSession, monitor_id: int, current_status: str, window: str
+    ) -> float | None:
+        """``uptime`` for a named window, reused for up to ``settings.uptime_cache_ttl`` seconds."""
+        key = (monitor_id, window)
+        hit = self._results.get(key)
+        now = time.monotonic()
+        if hit is not None and hit[0] > now:
+            self._results.move_to_end(key)
+            return hit[1]
+        value = await self.uptime(db, monitor_id, current_status, UPTIME_WINDOWS[window])
+        self._results[key] = (now + settings.uptime_cache_ttl, value)
+        self._results.move_to_end(key)
+        if len(self._results) > self.max_cached_results:
+            self._results.popitem(last=False)
+        return value
+
+    async def cached_summary(
+        self, db: AsyncSession, monitor_id: int, current_status: str
+    ) -> dict[str, float | None]:
+        return {
+            name: await self.cached(db, monitor_id, current_status, name)
+            for name in ("24h", "7d", "30d")
+        }
+
+
+def format_uptime(value: float | None) -> str:
+    if value is None:
+        return "n/a"
+    if value >= 100:
+        return "100%"
+    return f"{min(value, 99.99):.2f}%"
+
+
+uptime_engine = UptimeEngine()
+
+
+@add_listener
+def _on_transition(transition: Transition) -> None:
+    uptime_engine.forget_results(transition.monitor_id)
+
+
+def forget_uptime_on_commit(db: AsyncSession, monitor_id: int) -> None:
+    """Drop ``monitor_id``'s cached uptime once ``db`` commits (e.g. on delete)."""
+    db.info.setdefault(_PENDING_KEY, set()).add(monitor_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    for monitor_id in session.info.pop(_PENDING_KEY, ()):
+        uptime_engine.forget(monitor_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,264 @@
+import asyncio
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+from app import alerts
+from app.alerts import WebhookBatcher, send_webhook_alert
+from app.auth import hash_password
+from app.channels import (
+    AlertEvent,
+    Channel,
+    ChannelPool,
+    channel_stats,
+    dispatch,
+    get_pool,
+    register_channel,
+)
+from app.checker import check_overdue_monitors
+from app.config import settings
+from app.models import Monitor, User
+from tests.conftest import test_session
+
+HOOK_URL = "https://hooks.example.com/router"
+
+
+@pytest.fixture
+def posted(monkeypatch):
+    """Capture webhook POSTs instead of sending them."""
+    sent = []
+
+    async def fake_post(url, payload):
+        sent.append((url, payload))
+
+    monkeypatch.setattr(alerts, "post_webhook", fake_post)
+    return sent
+
+
+def make_event(
+    name: str,
+    alert_type: str = "down",
+    webhook_url: str | None = HOOK_URL,
+    alert_email: str | None = None,
+) -> AlertEvent:
+    return AlertEvent(
+        alert_type=alert_type,
+        monitor_id=1,
+        monitor_name=name,
+        monitor_slug=f"slug-{name}",
+        period=300,
+        grace=60,
+        last_ping_at=None,
+        webhook_url=webhook_url,
+        alert_email=alert_email,
+    )
+
+
+@pytest.mark.asyncio
+async def test_webhook_single_event_is_default(posted, monkeypatch):
+    monkeypatch.setattr(settings, "webhook_batch_urls", [])
+    await send_webhook_alert(make_event("a"))
+
+    assert len(posted) == 1
+    url, payload = posted[0]
+    assert url == HOOK_URL
+    assert payload["monitor_slug"] == "slug-a"
+    assert payload["status"] == "down"
+    assert "batch" not in payload
+
+
+@pytest.mark.asyncio
+async def test_webhook_batch_flushes_at_max_size(posted, monkeypatch):
+    batcher = WebhookBatcher(max_size=3, max_wait=60)
+    monkeypatch.setattr(alerts, "webhook_batcher", batcher)
+    monkeypatch.setattr(settings, "webhook_batch_urls", [HOOK_URL])
+
+    for name in ("a", "b"):
+        await send_webhook_alert(make_event(name))
+    assert posted == []
+    assert batcher.pending(HOOK_URL) == 2
+
+    await send_webhook_alert(make_event("c"))
+    assert len(posted) == 1
+    payload = posted[0][1]
+    assert payload["batch"] is True
+    assert payload["count"] == 3
+    assert [e["monitor_slug"] for e in payload["events"]] == ["slug-a", "slug-b", "slug-c"]
+    assert batcher.pending(HOOK_URL) == 0
+
+
+@pytest.mark.asyncio
+async def test_webhook_batch_flushes_after_max_wait(posted, monkeypatch):
+    batcher = WebhookBatcher(max_size=50, max_wait=0.01)
+    monkeypatch.setattr(alerts, "webhook_batcher", batcher)
+    monkeypatch.setattr(settings, "webhook_batch_urls", [HOOK_URL])
+
+    await send_webhook_alert(make_event("a", "up"))
+    assert posted == []
+
+    await asyncio.sleep(0.05)
+    assert len(posted) == 1
+    assert posted[0][1]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_checker_sends_one_batch_per_pass(posted, monkeypatch):
+    batcher = WebhookBatcher(max_size=50, max_wait=60)
+    monkeypatch.setattr(alerts, "webhook_batcher", batcher)
+    monkeypatch.setattr(settings, "webhook_batch_urls", [HOOK_URL])
+
+    async with test_session() as db:
+        user = User(
+            email="test@example.com",
+            username="testuser",
+            hashed_password=hash_password("password"),
+            email_alerts_enabled=False,
+        )
+        db.add(user)
+        await db.flush()
+        for i in range(5):
+            db.add(Monitor(
+                user_id=user.id,
+                name=f"Overdue {i}",
+                period=300,
+                grace=60,
+                status="up",
+                last_ping_at=datetime.now(timezone.utc) - timedelta(hours=1),
+                webhook_url=HOOK_URL,
+            ))
+        await db.commit()
+
+    await check_overdue_monitors(session_factory=test_session)
+    # The pass does not wait for delivery; the batch goes out when the workers
+    # add the last of its alerts, long before the 60s timer
+    await get_pool("webhook").drain()
+
+    assert len(posted) == 1
+    assert posted[0][1]["count"] == 5
+    assert batcher.pending(HOOK_URL) == 0
+
+
+@pytest.mark.asyncio
+async def test_checker_does_not_wait_for_webhook_delivery(monkeypatch):
+    delivered = asyncio.Event()
+
+    async def slow_post(url, payload):
+        await asyncio.sleep(0.5)
+        delivered.set()
+
+    monkeypatch.setattr(alerts, "post_webhook", slow_post)
+    monkeypatch.setattr(settings, "webhook_batch_urls", [])
+
+    async with test_session() as db:
+        user = User(
+            email="test@example.com",
+            username="testuser",
+            hashed_password=hash_password("password"),
+            email_alerts_enabled=False,
+        )
+        db.add(user)
+        await db.flush()
+        db.add(Monitor(
+            user_id=user.id,
+            name="Overdue",
+            period=300,
+            grace=60,
+            status="up",
+            last_ping_at=datetime.now(timezone.utc) - timedelta(hours=1),
+            webhook_url=HOOK_URL,
+        ))
+        await db.commit()
+
+    await asyncio.wait_for(check_overdue_monitors(session_factory=test_session), timeout=0.3)
+    assert not delivered.is_set()
+
+
+@pytest.mark.asyncio
+async def test_failed_timed_batch_counts_as_channel_failure(monkeypatch):
+    async def failing_post(url, payload):
+        raise RuntimeError("unreachable")
+
+    monkeypatch.setattr(alerts, "post_webhook", failing_post)
+    batcher = WebhookBatcher(max_size=50, max_wait=60)
+    before = channel_stats()["webhook"]["failed"]
+
+    await batcher.add(HOOK_URL, {"monitor_slug": "a"})
+    await batcher.flush()
+
+    assert batcher.pending(HOOK_URL) == 0
+    assert channel_stats()["webhook"]["failed"] == before + 1
+
+
+class RecordingChannel(Channel):
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.delivered: list[AlertEvent] = []
+
+    def target(self, event):
+        return event.alert_email
+
+    async def send(self, event):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        self.delivered.append(event)
+
+
+@pytest.fixture
+def isolated_channels(monkeypatch):
+    """Swap in an empty channel registry for the duration of a test."""
+    from app import channels
+
+    monkeypatch.setattr(channels, "_pools", {})
+    yield channels._pools
+    for pool in channels._pools.values():
+        for task in pool._tasks:
+            task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_slow_channel_does_not_delay_others(isolated_channels):
+    slow = RecordingChannel("slow", delay=0.5)
+    fast = RecordingChannel("fast")
+    register_channel(slow, workers=1, queue_size=10)
+    fast_pool = register_channel(fast, workers=1, queue_size=10)
+
+    accepted = dispatch(make_event("a", alert_email="ops@example.com"))
+    assert sorted(name for name, _ in accepted) == ["fast", "slow"]
+
+    await asyncio.wait_for(fast_pool.drain(), timeout=0.2)
+    assert len(fast.delivered) == 1
+    assert slow.delivered == []
+
+
+@pytest.mark.asyncio
+async def test_channel_skips_unconfigured_events(isolated_channels):
+    channel = RecordingChannel("email-like")
+    register_channel(channel, workers=1, queue_size=10)
+
+    assert dispatch(make_event("a", alert_email=None)) == []
+
+
+@pytest.mark.asyncio
+async def test_channel_stats_track_failures_and_drops(isolated_channels):
+    register_channel(RecordingChannel("ok"), workers=2, queue_size=10)
+    register_channel(RecordingChannel("broken", fail=True), workers=1, queue_size=10)
+    full = ChannelPool(RecordingChannel("full", delay=1.0), workers=1, queue_size=1)
+    isolated_channels["full"] = full
+
+    for name in ("a", "b", "c"):
+        dispatch(make_event(name, alert_email="ops@example.com"))
+    assert channel_stats()["full"]["queue_depth"] == 1
+
+    await isolated_channels["ok"].drain()
+    await isolated_channels["broken"].drain()
+
+    stats = channel_stats()
+    assert stats["ok"]["sent"] == 3
+    assert stats["ok"]["failed"] == 0
+    assert stats["ok"]["workers"] == 2
+    assert stats["broken"]["failed"] == 3
+    assert stats["full"]["dropped"] == 2
+    assert stats["ok"]["latency_max"] >= stats["ok"]["latency_avg"] >= 0
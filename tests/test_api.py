@@ -0,0 +1,263 @@
+import pytest
+from sqlalchemy import select
+
+from app import sync
+from app.config import settings
+from app.models import Monitor, User
+from tests.conftest import test_session
+
+
+async def api_client(client, username="testuser", email="test@example.com"):
+    """Register a user and authenticate the client with their API key instead of the cookie."""
+    await client.post(
+        "/auth/register",
+        data={
+            "username": username,
+            "email": email,
+            "password": "securepassword123",
+            "password_confirm": "securepassword123",
+        },
+        follow_redirects=False,
+    )
+    async with test_session() as db:
+        result = await db.execute(select(User.api_key).where(User.username == username))
+        api_key = result.scalar_one()
+    client.cookies.clear()
+    client.headers["X-Api-Key"] = api_key
+    return api_key
+
+
+@pytest.mark.asyncio
+async def test_api_requires_authentication(client):
+    response = await client.get("/api/v1/monitors")
+    assert response.status_code == 401
+
+    client.headers["X-Api-Key"] = "not-a-key"
+    response = await client.get("/api/v1/monitors")
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_api_crud(client):
+    await api_client(client)
+
+    response = await client.post(
+        "/api/v1/monitors", json={"name": "Nightly Backup", "period": 86400}
+    )
+    assert response.status_code == 201
+    created = response.json()
+    assert created["status"] == "new"
+    assert created["grace"] == 43200
+    assert created["ping_url"].endswith(f"/ping/{created['slug']}")
+    assert created["created_at"]
+
+    monitor_id = created["id"]
+    response = await client.get(f"/api/v1/monitors/{monitor_id}")
+    assert response.json()["name"] == "Nightly Backup"
+
+    response = await client.patch(
+        f"/api/v1/monitors/{monitor_id}", json={"name": "Renamed", "paused": True}
+    )
+    assert response.status_code == 200
+    assert response.json()["name"] == "Renamed"
+    assert response.json()["status"] == "paused"
+    assert response.json()["period"] == 86400
+
+    response = await client.delete(f"/api/v1/monitors/{monitor_id}")
+    assert response.status_code == 204
+    assert (await client.get(f"/api/v1/monitors/{monitor_id}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_api_update_keeps_custom_grace(client):
+    await api_client(client)
+    await client.post("/api/v1/monitors", json={"name": "Job", "period": 300, "grace": 600})
+
+    response = await client.patch("/api/v1/monitors/1", json={"name": "Renamed"})
+    assert response.json()["grace"] == 600
+    response = await client.post(
+        "/api/v1/monitors/bulk", json={"update": [{"id": 1, "paused": True}]}
+    )
+    assert response.json()["updated"][0]["grace"] == 600
+
+    # Changing the period without a grace recomputes it, as the edit form does
+    response = await client.patch("/api/v1/monitors/1", json={"period": 3600})
+    assert response.json()["grace"] == 1800
+
+
+@pytest.mark.asyncio
+async def test_api_validation_matches_forms(client):
+    await api_client(client)
+
+    response = await client.post(
+        "/api/v1/monitors", json={"name": " ", "period": 10, "webhook_url": "ftp://x"}
+    )
+    assert response.status_code == 422
+    assert response.json()["errors"] == [
+        "Monitor name is required.",
+        "Period must be at least 60 seconds.",
+        "Webhook URL must start with http:// or https://.",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_api_cannot_touch_other_users_monitors(client):
+    await api_client(client, "other", "other@example.com")
+    await client.post("/api/v1/monitors", json={"name": "Theirs", "period": 3600})
+
+    await api_client(client)
+    assert (await client.get("/api/v1/monitors/1")).status_code == 404
+    assert (await client.delete("/api/v1/monitors/1")).status_code == 404
+    assert (await client.get("/api/v1/monitors")).json()["monitors"] == []
+
+
+@pytest.mark.asyncio
+async def test_api_list_is_paginated(client, monkeypatch):
+    await api_client(client)
+    for name in ["C", "A", "B"]:
+        await client.post("/api/v1/monitors", json={"name": name, "period": 3600})
+
+    page = (await client.get("/api/v1/monitors?limit=2")).json()
+    assert [m["name"] for m in page["monitors"]] == ["A", "B"]
+    page = (await client.get(f"/api/v1/monitors?limit=2&after={page['next']}")).json()
+    assert [m["name"] for m in page["monitors"]] == ["C"]
+    assert page["next"] is None
+
+    monkeypatch.setattr(settings, "api_max_page_size", 1)
+    page = (await client.get("/api/v1/monitors?limit=100")).json()
+    assert len(page["monitors"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_api_bulk_applies_everything_in_one_transaction(client):
+    await api_client(client)
+    for name in ["Keep", "Drop"]:
+        await client.post("/api/v1/monitors", json={"name": name, "period": 3600})
+
+    response = await client.post("/api/v1/monitors/bulk", json={
+        "create": [{"name": f"Job {i}", "period": 300} for i in range(200)],
+        "update": [{"id": 1, "period": 600, "grace": 120}],
+        "delete": [2],
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["created"]) == 200
+    assert body["updated"][0]["grace"] == 120
+    assert body["deleted"] == [2]
+
+    async with test_session() as db:
+        names = (await db.execute(select(Monitor.name))).scalars().all()
+    assert len(names) == 201
+    assert "Drop" not in names
+
+
+@pytest.mark.asyncio
+async def test_api_bulk_is_all_or_nothing(client):
+    await api_client(client)
+    await client.post("/api/v1/monitors", json={"name": "Existing", "period": 3600})
+
+    response = await client.post("/api/v1/monitors/bulk", json={
+        "create": [{"name": "Good", "period": 300}, {"name": "", "period": 300}],
+        "update": [{"id": 1, "name": "Changed"}],
+        "delete": [999],
+    })
+    assert response.status_code == 422
+    errors = response.json()["errors"]
+    assert errors["create"] == {"1": ["Monitor name is required."]}
+    assert errors["delete"] == {"0": ["Monitor not found."]}
+
+    monitors = (await client.get("/api/v1/monitors")).json()["monitors"]
+    assert [m["name"] for m in monitors] == ["Existing"]
+
+
+def manifest(count=3, **overrides):
+    return {"monitors": [
+        {"name": f"job-{i}", "period": 3600, **overrides} for i in range(count)
+    ]}
+
+
+@pytest.mark.asyncio
+async def test_sync_creates_updates_and_deletes(client):
+    await api_client(client)
+    await client.post("/api/v1/monitors", json={"name": "job-0", "period": 3600})
+    await client.post("/api/v1/monitors", json={"name": "job-1", "period": 60})
+    await client.post("/api/v1/monitors", json={"name": "legacy", "period": 3600})
+
+    response = await client.post("/api/v1/monitors/sync", json=manifest())
+    assert response.status_code == 200
+    plan = response.json()
+    assert plan["create"] == ["job-2"]
+    assert plan["update"] == [{
+        "id": 2, "name": "job-1", "changes": {"period": [60, 3600], "grace": [60, 1800]},
+    }]
+    assert plan["delete"] == [{"id": 3, "name": "legacy"}]
+    assert plan["unchanged"] == 1
+
+    async with test_session() as db:
+        rows = (await db.execute(select(Monitor.name, Monitor.period))).all()
+    assert sorted(rows) == [("job-0", 3600), ("job-1", 3600), ("job-2", 3600)]
+
+
+@pytest.mark.asyncio
+async def test_sync_dry_run_changes_nothing(client):
+    await api_client(client)
+    await client.post("/api/v1/monitors", json={"name": "legacy", "period": 3600})
+
+    plan = (await client.post("/api/v1/monitors/sync?dry_run=true", json=manifest(2))).json()
+    assert plan["dry_run"] is True
+    assert plan["create"] == ["job-0", "job-1"]
+    assert [item["name"] for item in plan["delete"]] == ["legacy"]
+
+    monitors = (await client.get("/api/v1/monitors")).json()["monitors"]
+    assert [m["name"] for m in monitors] == ["legacy"]
+
+
+@pytest.mark.asyncio
+async def test_sync_unchanged_manifest_is_a_no_op(client):
+    await api_client(client)
+    await client.post("/api/v1/monitors/sync", json=manifest(50, paused=True))
+
+    plan = (await client.post("/api/v1/monitors/sync", json=manifest(50, paused=True))).json()
+    assert plan["create"] == plan["update"] == plan["delete"] == []
+    assert plan["unchanged"] == 50
+
+    plan = (await client.post("/api/v1/monitors/sync", json=manifest(50))).json()
+    assert len(plan["update"]) == 50
+    assert plan["update"][0]["changes"] == {"paused": [True, False]}
+
+
+@pytest.mark.asyncio
+async def test_sync_skips_monitors_deleted_after_planning(client):
+    await api_client(client)
+    await client.post("/api/v1/monitors", json={"name": "job-0", "period": 60})
+    await client.post("/api/v1/monitors", json={"name": "legacy", "period": 3600})
+
+    async with test_session() as db:
+        entries = [sync.ManifestEntry(**entry) for entry in manifest(1)["monitors"]]
+        desired, _ = sync.desired_state(entries)
+        plan = await sync.plan_sync(db, 1, desired)
+    # Both planned monitors disappear before the plan is applied
+    assert (await client.delete("/api/v1/monitors/1")).status_code == 204
+    assert (await client.delete("/api/v1/monitors/2")).status_code == 204
+
+    async with test_session() as db:
+        await sync.apply_plan(db, 1, plan)
+        await db.commit()
+    assert plan.as_dict()["gone"] == [{"id": 1, "name": "job-0"}, {"id": 2, "name": "legacy"}]
+
+
+@pytest.mark.asyncio
+async def test_sync_rejects_invalid_manifest(client):
+    await api_client(client)
+    await client.post("/api/v1/monitors", json={"name": "keep", "period": 3600})
+
+    response = await client.post("/api/v1/monitors/sync", json={"monitors": [
+        {"name": "a", "period": 3600}, {"name": "a", "period": 60}, {"name": "b", "period": 5},
+    ]})
+    assert response.status_code == 422
+    assert response.json()["errors"]["monitors"] == {
+        "1": ["Duplicate monitor name 'a'."],
+        "2": ["Period must be at least 60 seconds."],
+    }
+    monitors = (await client.get("/api/v1/monitors")).json()["monitors"]
+    assert [m["name"] for m in monitors] == ["keep"]
@@ -0,0 +1,123 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.archive import archive_old_pings
+from app.config import settings
+from app.models import Ping, PingSegment
+from tests.conftest import test_session
+from tests.test_api import api_client
+
+START = datetime(2026, 1, 30, 12, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "archive_dir", str(tmp_path))
+    return tmp_path
+
+
+async def seed(client, days=6):
+    """One monitor with a ping a day from Jan 30, straddling a month boundary."""
+    await api_client(client)
+    await client.post("/api/v1/monitors", json={"name": "Backup", "period": 86400})
+    async with test_session() as db:
+        db.add_all(
+            Ping(monitor_id=1, created_at=START + timedelta(days=i), user_agent=f"run-{i}")
+            for i in range(days)
+        )
+        await db.commit()
+
+
+async def archive_before(day):
+    return await archive_old_pings(START + timedelta(days=day), test_session)
+
+
+@pytest.mark.asyncio
+async def test_archiver_moves_old_pings_to_monthly_segments(client, archive_dir):
+    await seed(client)
+
+    assert await archive_before(4) == 4
+    async with test_session() as db:
+        live = (await db.execute(select(func.count()).select_from(Ping))).scalar()
+        segments = (await db.execute(select(PingSegment).order_by(PingSegment.id))).scalars().all()
+    assert live == 2
+    assert [(s.path, s.row_count, s.first_id, s.last_id) for s in segments] == [
+        ("1/2026-01-1.ndjson.gz", 2, 1, 2),
+        ("1/2026-02-3.ndjson.gz", 2, 3, 4),
+    ]
+    assert sorted(p.name for p in (archive_dir / "1").iterdir()) == [
+        "2026-01-1.ndjson.gz", "2026-02-3.ndjson.gz",
+    ]
+
+    # Nothing left to move until the cutoff advances
+    assert await archive_before(4) == 0
+    assert await archive_before(5) == 1
+
+
+@pytest.mark.asyncio
+async def test_export_reads_archived_segments(client):
+    await seed(client)
+    await archive_before(4)
+
+    response = await client.get("/api/v1/monitors/1/export/pings")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [1, 2, 3, 4, 5, 6]
+    assert rows[0]["created_at"] == "2026-01-30T12:00:00"
+
+    response = await client.get("/api/v1/export/pings?since=2026-01-31&until=2026-02-03")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["user_agent"] for row in rows] == ["run-1", "run-2", "run-3", "run-4"]
+
+
+@pytest.mark.asyncio
+async def test_export_range_with_utc_offsets(client):
+    await seed(client)
+    await archive_before(4)
+
+    # 12:00 UTC on Jan 31 up to (not including) 12:00 UTC on Feb 3
+    response = await client.get(
+        "/api/v1/export/pings",
+        params={"since": "2026-01-31T14:00:00+02:00", "until": "2026-02-03T11:00:00-01:00"},
+    )
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["user_agent"] for row in rows] == ["run-1", "run-2", "run-3"]
+
+
+@pytest.mark.asyncio
+async def test_history_pages_continue_into_the_archive(client, monkeypatch):
+    await seed(client)
+    await archive_before(4)
+    monkeypatch.setattr(settings, "ping_page_size", 4)
+    client.headers.pop("X-Api-Key")
+    await client.post(
+        "/auth/login", data={"email": "test@example.com", "password": "securepassword123"}
+    )
+
+    response = await client.get("/monitors/1")
+    assert "6 total pings" in response.text
+    assert "run-5" in response.text and "run-2" in response.text
+    assert "run-1" not in response.text
+    older = response.text.split('before=')[1].split('"')[0]
+
+    response = await client.get(f"/monitors/1?before={older}")
+    assert "run-1" in response.text and "run-0" in response.text
+    assert "run-2" not in response.text
+    assert "Older pings" not in response.text
+
+    response = await client.get("/monitors/1?until=2026-01-30")
+    assert "run-0" in response.text and "run-1" not in response.text
+
+
+@pytest.mark.asyncio
+async def test_deleting_a_monitor_removes_its_segments(client, archive_dir):
+    await seed(client)
+    await archive_before(4)
+
+    assert (await client.delete("/api/v1/monitors/1")).status_code == 204
+    async with test_session() as db:
+        assert (await db.execute(select(PingSegment))).first() is None
+    assert list((archive_dir / "1").iterdir()) == []
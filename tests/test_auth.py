@@ -1,5 +1,19 @@
+import asyncio
+
 import pytest
-from app.auth import hash_password, verify_password, create_access_token, decode_access_token
+from sqlalchemy import event, select
+
+from app.auth import (
+    create_access_token,
+    decode_access_token,
+    hash_password,
+    hash_password_async,
+    verify_password,
+    verify_password_async,
+)
+from app.models import User
+from tests.conftest import engine, test_session
+from tests.test_api import api_client
 
 
 @pytest.mark.asyncio
@@ -245,6 +259,25 @@ def test_hash_password():
     assert not verify_password("wrongpassword", hashed)
 
 
+@pytest.mark.asyncio
+async def test_password_hashing_does_not_block_the_event_loop():
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    hashed = await hash_password_async("mypassword")
+    assert await verify_password_async("mypassword", hashed)
+    assert not await verify_password_async("wrongpassword", hashed)
+    task.cancel()
+    # Each bcrypt call takes tens of milliseconds; the loop kept running meanwhile
+    assert ticks >= 3
+
+
 def test_create_and_decode_token():
     token = create_access_token({"sub": "42"})
     payload = decode_access_token(token)
@@ -357,3 +390,68 @@ async def test_root_redirects_to_dashboard_when_authed(client):
     response = await client.get("/", follow_redirects=False)
     assert response.status_code == 303
     assert "/dashboard" in response.headers["location"]
+
+
+def count_user_queries():
+    """Collect SELECTs against the users table issued on the test engine."""
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT") and "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_execute)
+    return statements, lambda: event.remove(
+        engine.sync_engine, "before_cursor_execute", before_execute
+    )
+
+
+@pytest.mark.asyncio
+async def test_repeat_requests_skip_the_user_query(client):
+    api_key = await api_client(client)
+    await client.get("/api/v1/monitors")
+
+    statements, stop = count_user_queries()
+    try:
+        for _ in range(5):
+            assert (await client.get("/api/v1/monitors")).status_code == 200
+        client.headers.pop("X-Api-Key")
+        await client.post(
+            "/auth/login", data={"email": "test@example.com", "password": "securepassword123"}
+        )
+        statements.clear()
+        for _ in range(5):
+            assert (await client.get("/settings")).status_code == 200
+    finally:
+        stop()
+    # The cookie is resolved once, then served from the cache
+    assert len(statements) == 1
+    assert api_key
+
+
+@pytest.mark.asyncio
+async def test_auth_cache_is_invalidated_when_the_user_changes(client):
+    old_key = await api_client(client)
+    assert (await client.get("/api/v1/monitors")).status_code == 200
+
+    # Regenerating the key revokes the old one at once
+    client.headers.pop("X-Api-Key")
+    await client.post(
+        "/auth/login", data={"email": "test@example.com", "password": "securepassword123"}
+    )
+    await client.post("/settings/api-key")
+    cookies = dict(client.cookies)
+    client.cookies.clear()
+    client.headers["X-Api-Key"] = old_key
+    assert (await client.get("/api/v1/monitors")).status_code == 401
+
+    # Deactivation ends cookie sessions that were cached
+    client.headers.pop("X-Api-Key")
+    client.cookies.update(cookies)
+    assert (await client.get("/settings")).status_code == 200
+    async with test_session() as db:
+        user = (await db.execute(select(User))).scalar_one()
+        user.is_active = False
+        await db.commit()
+    response = await client.get("/settings", follow_redirects=False)
+    assert response.status_code == 303
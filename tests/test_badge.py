@@ -75,3 +75,62 @@ async def test_badge_updates_after_ping(client):
     data = response.json()
     assert data["status"] == "up"
     assert data["last_ping"] is not None
+
+
+@pytest.mark.asyncio
+async def test_badge_svg_cache_headers(client):
+    slug = await setup_user_and_monitor(client)
+    response = await client.get(f"/badge/{slug}.svg")
+    assert response.headers["etag"]
+    assert response.headers["cache-control"] == "public, max-age=60"
+
+
+@pytest.mark.asyncio
+async def test_badge_svg_not_modified(client):
+    slug = await setup_user_and_monitor(client)
+    first = await client.get(f"/badge/{slug}.svg")
+    etag = first.headers["etag"]
+
+    response = await client.get(f"/badge/{slug}.svg", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_badge_etag_changes_with_status(client):
+    slug = await setup_user_and_monitor(client)
+    before = (await client.get(f"/badge/{slug}.svg")).headers["etag"]
+
+    await client.get(f"/ping/{slug}")
+
+    response = await client.get(f"/badge/{slug}.svg", headers={"If-None-Match": before})
+    assert response.status_code == 200
+    assert response.headers["etag"] != before
+    assert ">up<" in response.text
+
+
+@pytest.mark.asyncio
+async def test_badge_svg_label_and_style(client):
+    slug = await setup_user_and_monitor(client)
+    response = await client.get(f"/badge/{slug}.svg?label=<backup>&style=flat-square")
+    assert response.status_code == 200
+    assert "&lt;backup&gt;" in response.text
+    assert 'rx="0"' in response.text
+
+    default = await client.get(f"/badge/{slug}.svg")
+    assert response.headers["etag"] != default.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_badge_json_not_modified_until_ping(client):
+    slug = await setup_user_and_monitor(client)
+    etag = (await client.get(f"/badge/{slug}.json")).headers["etag"]
+
+    response = await client.get(f"/badge/{slug}.json", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    await client.get(f"/ping/{slug}")
+    response = await client.get(f"/badge/{slug}.json", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["status"] == "up"
@@ -1,7 +1,7 @@
 import pytest
 from datetime import datetime, timezone, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import select, text
 
 from app.models import Monitor, User, Alert
 from app.auth import hash_password
@@ -167,3 +167,66 @@ async def test_checker_leaves_timely_monitors_up():
         result = await db.execute(select(Monitor).where(Monitor.id == monitor_id))
         m = result.scalar_one()
         assert m.status == "up"
+
+
+@pytest.mark.asyncio
+async def test_checker_marks_every_overdue_monitor():
+    async with test_session() as db:
+        user = User(
+            email="test@example.com",
+            username="testuser",
+            hashed_password=hash_password("password"),
+        )
+        db.add(user)
+        await db.flush()
+
+        overdue_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        db.add_all([
+            Monitor(user_id=user.id, name=f"Job {n}", period=300, grace=60, status="up",
+                    last_ping_at=overdue_at)
+            for n in range(5)
+        ])
+        db.add(Monitor(user_id=user.id, name="Timely", period=300, grace=60, status="up",
+                       last_ping_at=datetime.now(timezone.utc)))
+        await db.commit()
+
+    await check_overdue_monitors(session_factory=test_session)
+
+    async with test_session() as db:
+        result = await db.execute(select(Monitor.name, Monitor.status).order_by(Monitor.id))
+        statuses = dict(result.all())
+        assert statuses.pop("Timely") == "up"
+        assert set(statuses.values()) == {"down"}
+        alerts = await db.execute(select(Alert).where(Alert.alert_type == "down"))
+        assert len(alerts.scalars().all()) == 5
+
+
+@pytest.mark.asyncio
+async def test_deadline_follows_period_changes():
+    async with test_session() as db:
+        user = User(
+            email="test@example.com",
+            username="testuser",
+            hashed_password=hash_password("password"),
+        )
+        db.add(user)
+        await db.flush()
+
+        last_ping = datetime(2026, 1, 1, 12, 0, 0)
+        monitor = Monitor(
+            user_id=user.id, name="Nightly", period=300, grace=60, status="up",
+            last_ping_at=last_ping,
+        )
+        db.add(monitor)
+        await db.commit()
+        assert monitor.deadline_at == last_ping + timedelta(seconds=360)
+
+        monitor.period = 86400
+        await db.commit()
+        assert monitor.deadline_at == last_ping + timedelta(seconds=86460)
+
+        row = (await db.execute(
+            text("SELECT last_ping_at, deadline_at FROM monitors WHERE id = :id"),
+            {"id": monitor.id},
+        )).one()
+        assert tuple(row) == (1767268800, 1767268800 + 86460)  # stored as epoch seconds
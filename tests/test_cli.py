@@ -0,0 +1,44 @@
+import json
+
+import httpx
+
+from app import cli
+
+
+def test_sync_command_posts_manifest_and_prints_plan(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "monitors.json"
+    path.write_text(json.dumps([{"name": "backup", "period": 86400}]))
+    sent = {}
+
+    def fake_post(url, params, json, headers, timeout):
+        sent.update(url=url, params=params, json=json, headers=headers)
+        plan = {
+            "dry_run": True,
+            "create": ["backup"],
+            "update": [{"id": 4, "name": "etl", "changes": {"period": [60, 300]}}],
+            "delete": [{"id": 5, "name": "old"}],
+            "unchanged": 2,
+        }
+        return httpx.Response(200, json=plan)
+
+    monkeypatch.setattr(cli.httpx, "post", fake_post)
+    code = cli.main([
+        "--url", "https://cron.example.com/", "--api-key", "k", "sync", str(path), "--dry-run",
+    ])
+
+    assert code == 0
+    assert sent["url"] == "https://cron.example.com/api/v1/monitors/sync"
+    assert sent["params"] == {"dry_run": "true"}
+    assert sent["json"] == {"monitors": [{"name": "backup", "period": 86400}]}
+    assert sent["headers"] == {"X-Api-Key": "k"}
+    assert capsys.readouterr().out.splitlines() == [
+        "+ backup",
+        "~ etl (period: 60 -> 300)",
+        "- old",
+        "Would apply: 1 to create, 1 to update, 1 to delete, 2 unchanged.",
+    ]
+
+
+def test_sync_command_requires_api_key(tmp_path, monkeypatch):
+    monkeypatch.delenv("CRONGUARD_API_KEY", raising=False)
+    assert cli.main(["sync", str(tmp_path / "missing.json")]) == 2
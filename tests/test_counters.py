@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from app import counters
+from app.checker import check_overdue_monitors
+from app.models import Monitor, Ping, PingDay
+from app.routers.monitors import status_counts
+from tests.conftest import test_session
+from tests.test_api import api_client
+from tests.test_ping import setup_user_and_monitor
+
+
+async def stored_status_counts(user_id=1) -> dict[str, int]:
+    async with test_session() as db:
+        counts = await status_counts(db, user_id)
+    return {status: count for status, count in counts.items() if count}
+
+
+@pytest.mark.asyncio
+async def test_pings_are_counted_in_total_and_per_day(client):
+    slug = await setup_user_and_monitor(client)
+    for _ in range(3):  # the first ping moves the monitor to up, the rest take the fast path
+        assert (await client.get(f"/ping/{slug}")).status_code == 200
+
+    async with test_session() as db:
+        monitor = (await db.execute(select(Monitor))).scalar_one()
+        assert monitor.ping_count == 3
+        assert await counters.recent_pings(db, monitor.id, 7) == 3
+        ten_days_ago = datetime.now(timezone.utc) - timedelta(days=10)
+        db.add(Ping(monitor_id=monitor.id, created_at=ten_days_ago))
+        await db.commit()
+
+    async with test_session() as db:
+        monitor = (await db.execute(select(Monitor))).scalar_one()
+        assert monitor.ping_count == 4
+        assert await counters.recent_pings(db, monitor.id, 7) == 3
+
+    detail = await client.get("/monitors/1")
+    assert "4 total pings recorded · 3 in the last 7 days" in detail.text
+
+
+@pytest.mark.asyncio
+async def test_status_counts_follow_every_change(client):
+    await api_client(client)
+    response = await client.post("/api/v1/monitors/bulk", json={"create": [
+        {"name": "a", "period": 60},
+        {"name": "b", "period": 60},
+        {"name": "c", "period": 60, "paused": True},
+    ]})
+    assert response.status_code == 200
+    assert await stored_status_counts() == {"new": 2, "paused": 1}
+
+    slug = (await client.get("/api/v1/monitors/1")).json()["slug"]
+    await client.get(f"/ping/{slug}")
+    await client.patch("/api/v1/monitors/3", json={"paused": False})
+    await client.delete("/api/v1/monitors/2")
+    assert await stored_status_counts() == {"up": 1, "new": 1}
+
+    async with test_session() as db:
+        await db.execute(
+            update(Monitor).where(Monitor.id == 1).values(
+                deadline_at=datetime.now(timezone.utc) - timedelta(minutes=1)
+            )
+        )
+        await db.commit()
+    await check_overdue_monitors(session_factory=test_session)
+    assert await stored_status_counts() == {"down": 1, "new": 1}
+
+
+@pytest.mark.asyncio
+async def test_reconcile_repairs_drift(client):
+    slug = await setup_user_and_monitor(client)
+    await client.get(f"/ping/{slug}")
+    await client.get(f"/ping/{slug}")
+    assert await counters.reconcile_counters(test_session) == 0
+
+    async with test_session() as db:
+        # Writes around the ORM leave every counter behind
+        await db.execute(update(Monitor).values(status="paused", ping_count=40))
+        await db.execute(update(PingDay).values(pings=9))
+        await db.commit()
+
+    assert await counters.reconcile_counters(test_session) == 4
+    async with test_session() as db:
+        monitor = (await db.execute(select(Monitor))).scalar_one()
+        assert monitor.ping_count == 2
+        assert await counters.recent_pings(db, monitor.id, 7) == 2
+    assert await stored_status_counts() == {"paused": 1}
+    assert await counters.reconcile_counters(test_session) == 0
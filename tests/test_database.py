@@ -0,0 +1,130 @@
+import dataclasses
+
+import pytest
+from sqlalchemy import delete, text
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.database import (
+    READ_ONLY_KEY,
+    ReadOnlySessionError,
+    engine_options,
+    make_engine,
+    make_read_engine,
+    stats,
+)
+from app.models import User
+from tests.conftest import test_session
+from tests.test_api import api_client
+
+
+async def pragma(engine, name):
+    async with engine.connect() as conn:
+        return (await conn.execute(text(f"PRAGMA {name}"))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_connections_use_the_configured_profile(tmp_path):
+    engine = make_engine(f"sqlite+aiosqlite:///{tmp_path / 'tuned.db'}")
+    try:
+        assert await pragma(engine, "journal_mode") == "wal"
+        assert await pragma(engine, "synchronous") == 1  # NORMAL
+        assert await pragma(engine, "busy_timeout") == 5000
+        assert await pragma(engine, "cache_size") == -20000
+        assert await pragma(engine, "temp_store") == 2  # MEMORY
+        assert await pragma(engine, "foreign_keys") == 1
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_empty_pragma_settings_keep_sqlite_defaults(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "sqlite_journal_mode", "")
+    monkeypatch.setattr(settings, "sqlite_synchronous", "full")
+    engine = make_engine(f"sqlite+aiosqlite:///{tmp_path / 'default.db'}")
+    try:
+        assert await pragma(engine, "journal_mode") == "delete"
+        assert await pragma(engine, "synchronous") == 2  # FULL
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_engine_is_a_separate_read_only_pool(tmp_path):
+    engine = make_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+    reader = make_read_engine(engine)
+    try:
+        assert reader is not engine
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            await conn.execute(text("INSERT INTO t VALUES (1)"))
+
+        async with reader.connect() as conn:
+            assert (await conn.execute(text("SELECT x FROM t"))).scalar() == 1
+            with pytest.raises(OperationalError, match="readonly"):
+                await conn.execute(text("INSERT INTO t VALUES (2)"))
+    finally:
+        await reader.dispose()
+        await engine.dispose()
+
+
+def test_in_memory_database_reads_through_the_write_engine():
+    engine = make_engine("sqlite+aiosqlite://")
+    assert make_read_engine(engine) is engine
+
+
+def test_server_databases_get_pool_options(monkeypatch):
+    monkeypatch.setattr(settings, "database_pool_size", 20)
+    monkeypatch.setattr(settings, "database_pool_recycle", 300)
+    options = engine_options("postgresql+asyncpg://u:p@db/cronguard")
+    assert options["pool_size"] == 20
+    assert options["pool_recycle"] == 300
+    assert options["connect_args"] == {"server_settings": {"timezone": "UTC"}}
+    assert engine_options("postgresql+asyncpg://u:p@db/cronguard", 8)["pool_size"] == 8
+    assert "connect_args" not in engine_options("sqlite+aiosqlite:///app.db")
+    assert engine_options("sqlite+aiosqlite://") == {}
+
+
+def snapshot():
+    return dataclasses.replace(stats)
+
+
+def delta(before):
+    return {
+        field.name: getattr(stats, field.name) - getattr(before, field.name)
+        for field in dataclasses.fields(stats)
+    }
+
+
+@pytest.mark.asyncio
+async def test_read_requests_skip_the_commit(client):
+    await api_client(client)
+    response = await client.post("/api/v1/monitors", json={"name": "Backup", "period": 3600})
+    slug = response.json()["slug"]
+    await client.get("/api/v1/monitors")  # warm the auth cache
+
+    before = snapshot()
+    assert (await client.get("/api/v1/monitors")).status_code == 200
+    assert delta(before) == {"checkouts": 1, "transactions": 1, "commits": 0}
+
+    before = snapshot()
+    assert (await client.get("/ping/no-such-monitor")).status_code == 404
+    assert delta(before)["commits"] == 0
+
+    before = snapshot()
+    assert (await client.get(f"/ping/{slug}")).status_code == 200
+    assert delta(before)["commits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_read_only_sessions_reject_writes():
+    session = test_session(info={READ_ONLY_KEY: True})
+    try:
+        session.add(User(email="x@example.com", username="x", hashed_password="x"))
+        with pytest.raises(ReadOnlySessionError):
+            await session.flush()
+        await session.rollback()
+        with pytest.raises(ReadOnlySessionError):
+            await session.execute(delete(User))
+    finally:
+        await session.close()
@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config import settings
+from app.models import Alert, Ping
+from tests.conftest import test_session
+from tests.test_api import api_client
+
+START = datetime(2026, 3, 1, 12, 0, 0)
+
+
+async def seed(client, pings=5):
+    await api_client(client)
+    await client.post("/api/v1/monitors", json={"name": "Backup", "period": 3600})
+    async with test_session() as db:
+        db.add_all(
+            Ping(monitor_id=1, created_at=START + timedelta(days=i), remote_addr="10.0.0.1")
+            for i in range(pings)
+        )
+        db.add(Alert(monitor_id=1, alert_type="down", channel="email", created_at=START))
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_export_streams_ndjson_in_batches(client, monkeypatch):
+    await seed(client)
+    monkeypatch.setattr(settings, "export_batch_size", 2)
+
+    response = await client.get(
+        "/api/v1/monitors/1/export/pings", headers={"Accept-Encoding": "identity"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "content-encoding" not in response.headers
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [1, 2, 3, 4, 5]
+    assert rows[0] == {
+        "id": 1,
+        "monitor_id": 1,
+        "created_at": "2026-03-01T12:00:00",
+        "remote_addr": "10.0.0.1",
+        "user_agent": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_export_csv_with_time_range_and_gzip(client):
+    await seed(client)
+
+    response = await client.get(
+        "/api/v1/export/pings?format=csv&since=2026-03-02&until=2026-03-03",
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-disposition"] == 'attachment; filename="pings.csv"'
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "monitor_id", "created_at", "remote_addr", "user_agent"]
+    assert [row[2] for row in rows[1:]] == ["2026-03-02T12:00:00", "2026-03-03T12:00:00"]
+
+    response = await client.get("/api/v1/export/alerts")
+    assert [json.loads(line)["alert_type"] for line in response.text.splitlines()] == ["down"]
+
+
+@pytest.mark.asyncio
+async def test_export_is_scoped_to_the_owner(client):
+    await seed(client)
+
+    await api_client(client, "other", "other@example.com")
+    assert (await client.get("/api/v1/monitors/1/export/pings")).status_code == 404
+    assert (await client.get("/api/v1/export/pings")).text == ""
+    assert (await client.get("/api/v1/export/pings?format=xml")).status_code == 422
+    assert (await client.get("/api/v1/export/users")).status_code == 404
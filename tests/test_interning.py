@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import func, select
+
+from app import interning
+from app.models import Ping, UserAgent
+from tests.conftest import test_session
+from tests.test_ping import setup_user_and_monitor
+
+
+@pytest.mark.asyncio
+async def test_repeated_pings_share_one_lookup_row(client):
+    slug = await setup_user_and_monitor(client)
+    for agent in ("curl/8.0", "curl/8.0", "wget/1.21", "curl/8.0"):
+        response = await client.get(f"/ping/{slug}", headers={"User-Agent": agent})
+        assert response.status_code == 200
+
+    async with test_session() as db:
+        agents = (await db.execute(select(UserAgent.value).order_by(UserAgent.id))).scalars()
+        assert list(agents) == ["curl/8.0", "wget/1.21"]
+        pings = (await db.execute(select(Ping).order_by(Ping.id))).scalars().all()
+    assert [ping.user_agent for ping in pings] == ["curl/8.0", "curl/8.0", "wget/1.21", "curl/8.0"]
+    assert {ping.remote_addr for ping in pings} == {"127.0.0.1"}
+    # Only the first sighting of each value went to the database
+    assert interning.user_agents.misses == 2
+    assert interning.user_agents.hits == 2
+
+
+@pytest.mark.asyncio
+async def test_ping_built_with_strings_is_interned(client):
+    await setup_user_and_monitor(client)
+    async with test_session() as db:
+        db.add_all([
+            Ping(monitor_id=1, user_agent="cron", remote_addr="10.0.0.1"),
+            Ping(monitor_id=1, user_agent="cron"),
+        ])
+        await db.commit()
+
+    async with test_session() as db:
+        rows = (await db.execute(
+            select(Ping.user_agent_id, Ping.user_agent, Ping.remote_addr).order_by(Ping.id)
+        )).all()
+        assert (await db.execute(select(func.count()).select_from(UserAgent))).scalar() == 1
+    assert rows[0].user_agent_id == rows[1].user_agent_id
+    assert [tuple(row)[1:] for row in rows] == [("cron", "10.0.0.1"), ("cron", None)]
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_ids_are_not_cached(client):
+    await setup_user_and_monitor(client)
+    async with test_session() as db:
+        db.add(Ping(monitor_id=1, user_agent="gone"))
+        await db.flush()
+        await db.rollback()
+    assert len(interning.user_agents) == 0
+
+    async with test_session() as db:
+        db.add(Ping(monitor_id=1, user_agent="kept"))
+        await db.commit()
+    assert interning.user_agents.cached("kept") is not None
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import re
+
+import pytest
+
+from app.live import LiveHub, TooManyConnections, hub
+from app.routers.live import event_stream
+
+
+class FakeRequest:
+    """Stands in for a Starlette request; disconnects once ``connected`` is cleared."""
+
+    def __init__(self):
+        self.connected = True
+
+    async def is_disconnected(self):
+        return not self.connected
+
+
+async def register_and_create(client):
+    response = await client.post(
+        "/auth/register",
+        data={
+            "username": "testuser",
+            "email": "test@example.com",
+            "password": "securepassword123",
+            "password_confirm": "securepassword123",
+        },
+        follow_redirects=False,
+    )
+    client.cookies.set("access_token", response.cookies.get("access_token"))
+    await client.post(
+        "/monitors/new",
+        data={"name": "Live", "period": "3600", "grace": "0", "webhook_url": ""},
+        follow_redirects=False,
+    )
+    detail = await client.get("/monitors/1")
+    return re.search(r"/ping/([a-f0-9-]{36})", detail.text).group(1)
+
+
+def drain(subscriber):
+    events = []
+    while not subscriber.queue.empty():
+        events.append(subscriber.queue.get_nowait())
+    return events
+
+
+@pytest.mark.asyncio
+async def test_publish_fans_out_per_user():
+    live = LiveHub(max_connections=10, max_per_user=5, queue_size=10)
+    tab1, tab2 = live.subscribe(1), live.subscribe(1)
+    other = live.subscribe(2)
+
+    live.publish(1, "ping", {"monitor_id": 7})
+
+    assert drain(tab1) == [("ping", {"monitor_id": 7})]
+    assert drain(tab2) == [("ping", {"monitor_id": 7})]
+    assert drain(other) == []
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_dropped():
+    live = LiveHub(max_connections=10, max_per_user=5, queue_size=2)
+    slow = live.subscribe(1)
+
+    for i in range(3):
+        live.publish(1, "ping", {"monitor_id": i})
+
+    assert slow.overflowed
+    assert slow.closed.is_set()
+    assert live.connections == 0
+    assert live.overflows == 1
+
+    chunks = [chunk async for chunk in event_stream(slow, FakeRequest())]
+    assert chunks[-1].startswith("event: reset")
+
+
+@pytest.mark.asyncio
+async def test_connection_limits():
+    live = LiveHub(max_connections=2, max_per_user=1, queue_size=10)
+    first = live.subscribe(1)
+    with pytest.raises(TooManyConnections):
+        live.subscribe(1)
+    live.subscribe(2)
+    with pytest.raises(TooManyConnections):
+        live.subscribe(3)
+
+    live.unsubscribe(first)
+    live.subscribe(3)
+
+
+@pytest.mark.asyncio
+async def test_ping_and_transition_events_are_published(client):
+    slug = await register_and_create(client)
+    subscriber = hub.subscribe(1)
+
+    await client.get(f"/ping/{slug}")
+    await client.get(f"/ping/{slug}")
+
+    events = drain(subscriber)
+    assert [name for name, _ in events] == ["status", "ping", "ping"]
+    assert events[0][1]["previous"] == "new"
+    assert events[0][1]["status"] == "up"
+    assert events[1][1]["monitor_id"] == 1
+
+
+@pytest.mark.asyncio
+async def test_monitor_detail_subscribes_to_its_events(client):
+    await register_and_create(client)
+
+    detail = await client.get("/monitors/1")
+    assert 'new EventSource("/events")' in detail.text
+    assert "const MONITOR_ID = 1;" in detail.text
+    assert 'data-role="last-ping-time"' in detail.text
+
+
+@pytest.mark.asyncio
+async def test_event_stream_formats_sse():
+    live = LiveHub(max_connections=10, max_per_user=5, queue_size=10)
+    subscriber = live.subscribe(1)
+    request = FakeRequest()
+    live.publish(1, "status", {"monitor_id": 1, "status": "down"})
+
+    stream = event_stream(subscriber, request)
+    assert (await anext(stream)).startswith("retry:")
+    chunk = await anext(stream)
+    name, data = chunk.strip().split("\n")
+    assert name == "event: status"
+    assert json.loads(data.removeprefix("data: ")) == {"monitor_id": 1, "status": "down"}
+
+    request.connected = False
+    live.publish(1, "ping", {"monitor_id": 1})
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(anext(stream), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_events_endpoint_enforces_limits(client, monkeypatch):
+    response = await client.get("/events", follow_redirects=False)
+    assert response.status_code == 303
+
+    await register_and_create(client)
+    monkeypatch.setattr(hub, "max_per_user", 0)
+    response = await client.get("/events")
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "30"
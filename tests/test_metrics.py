@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+
+from app import metrics
+from app.checker import check_overdue_monitors
+from app.models import Monitor
+from tests.conftest import test_session
+from tests.test_ping import setup_user_and_monitor
+
+
+def sample(text: str, line_start: str) -> float:
+    """The value of the first exposition line starting with ``line_start``."""
+    for line in text.splitlines():
+        if line.startswith(line_start):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"no sample {line_start!r}")
+
+
+@pytest.mark.asyncio
+async def test_metrics_exposition_counts_pings_and_routes(client):
+    slug = await setup_user_and_monitor(client)
+    await client.get(f"/ping/{slug}")
+    await client.get(f"/ping/{slug}")
+    await client.get("/ping/no-such-monitor")
+    await client.post("/monitors/1/pause")
+    await client.get(f"/ping/{slug}")
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert "# TYPE cronguard_pings_total counter" in text
+    assert sample(text, 'cronguard_pings_total{outcome="accepted"}') == 2
+    assert sample(text, 'cronguard_pings_total{outcome="unknown"}') == 1
+    assert sample(text, 'cronguard_pings_total{outcome="paused"}') == 1
+    # Routes are labelled by template, never by the slug in the URL
+    assert sample(
+        text, 'cronguard_http_requests_total{method="GET",route="/ping/{slug}",status="200"}'
+    ) == 3
+    assert sample(
+        text,
+        'cronguard_http_request_duration_seconds_count{method="GET",route="/ping/{slug}"}',
+    ) == 4
+    assert slug not in text
+
+
+@pytest.mark.asyncio
+async def test_checker_run_and_lag_are_recorded(client):
+    slug = await setup_user_and_monitor(client)
+    await client.get(f"/ping/{slug}")
+    async with test_session() as db:
+        await db.execute(
+            update(Monitor).values(deadline_at=datetime.now(timezone.utc) - timedelta(minutes=2))
+        )
+        await db.commit()
+
+    await check_overdue_monitors(session_factory=test_session)
+
+    assert metrics.checker_runs.value("ok") == 1
+    assert metrics.checker_duration.count() == 1
+    assert metrics.checker_lag.count() == 1
+    text = (await client.get("/metrics")).text
+    assert sample(text, 'cronguard_checker_lag_seconds_bucket{le="60"}') == 0
+    assert sample(text, 'cronguard_checker_lag_seconds_bucket{le="300"}') == 1
+    assert sample(text, "cronguard_checker_lag_seconds_count") == 1
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram("test_seconds", "Test.", ("kind",), buckets=(1, 5))
+    for value in (0.5, 1, 3, 7):
+        histogram.observe(value, 'a"b')
+    assert histogram.render()[2:] == [
+        'test_seconds_bucket{kind="a\\"b",le="1"} 2',
+        'test_seconds_bucket{kind="a\\"b",le="5"} 3',
+        'test_seconds_bucket{kind="a\\"b",le="+Inf"} 4',
+        'test_seconds_sum{kind="a\\"b"} 11.5',
+        'test_seconds_count{kind="a\\"b"} 4',
+    ]
@@ -1,4 +1,11 @@
+import re
+
 import pytest
+from sqlalchemy import event, func, select, update
+
+from app.config import settings
+from app.models import Monitor, Ping, StatusEvent
+from tests.conftest import engine, test_session
 
 
 async def register_and_get_cookie(client):
@@ -205,6 +212,38 @@ async def test_delete_monitor(client):
     assert "To Delete" not in dashboard.text
 
 
+@pytest.mark.asyncio
+async def test_delete_monitor_leaves_history_to_the_database(client):
+    await register_and_get_cookie(client)
+    await client.post(
+        "/monitors/new",
+        data={"name": "Busy", "period": "3600", "grace": "0", "webhook_url": ""},
+        follow_redirects=False,
+    )
+    monitor = (await client.get("/monitors/1")).text
+    slug = re.search(r"/ping/([a-f0-9-]{36})", monitor).group(1)
+    for _ in range(3):
+        await client.get(f"/ping/{slug}")
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await client.post("/monitors/1/delete", follow_redirects=False)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert response.status_code == 303
+    # Neither loaded nor deleted row by row: ON DELETE CASCADE removes them
+    assert not [sql for sql in statements if "pings" in sql]
+
+    async with test_session() as db:
+        for model in (Ping, StatusEvent):
+            assert (await db.execute(select(func.count()).select_from(model))).scalar() == 0
+
+
 @pytest.mark.asyncio
 async def test_pause_resume_monitor(client):
     await register_and_get_cookie(client)
@@ -269,3 +308,83 @@ async def test_monitor_stats(client):
 def response_contains_stat(text: str, value: str) -> bool:
     """Check if a stat value appears in the dashboard."""
     return value in text
+
+
+async def create_monitors(client, names):
+    for name in names:
+        await client.post(
+            "/monitors/new",
+            data={"name": name, "period": "3600", "grace": "0", "webhook_url": ""},
+            follow_redirects=False,
+        )
+
+
+async def set_status(name, status):
+    async with test_session() as db:
+        await db.execute(update(Monitor).where(Monitor.name == name).values(status=status))
+        await db.commit()
+
+
+def listed(text: str) -> list[str]:
+    """Monitor names in dashboard table order."""
+    return re.findall(r'hover:text-brand-600 transition-colors">([^<]+)</a>', text)
+
+
+@pytest.mark.asyncio
+async def test_dashboard_counts_and_urgency_order(client):
+    await register_and_get_cookie(client)
+    await create_monitors(client, ["Charlie", "Alpha", "Bravo", "Delta"])
+    await set_status("Bravo", "up")
+    await set_status("Delta", "down")
+    await set_status("Alpha", "paused")
+
+    dashboard = await client.get("/dashboard")
+    assert listed(dashboard.text) == ["Delta", "Charlie", "Bravo", "Alpha"]
+
+    dashboard = await client.get("/dashboard?sort=name")
+    assert listed(dashboard.text) == ["Alpha", "Bravo", "Charlie", "Delta"]
+
+
+@pytest.mark.asyncio
+async def test_dashboard_filters(client):
+    await register_and_get_cookie(client)
+    await create_monitors(client, ["Nightly Backup", "Hourly Sync", "Backup_Weekly"])
+    await set_status("Hourly Sync", "up")
+
+    assert listed((await client.get("/dashboard?status=up")).text) == ["Hourly Sync"]
+    response = await client.get("/dashboard?q=backup")
+    assert listed(response.text) == ["Backup_Weekly", "Nightly Backup"]
+    # LIKE wildcards in the search are matched literally
+    assert listed((await client.get("/dashboard?q=p_w")).text) == ["Backup_Weekly"]
+
+    response = await client.get("/dashboard?q=nothing")
+    assert "No matching monitors" in response.text
+
+
+@pytest.mark.asyncio
+async def test_dashboard_keyset_pagination(client, monkeypatch):
+    monkeypatch.setattr(settings, "dashboard_page_size", 2)
+    await register_and_get_cookie(client)
+    await create_monitors(client, ["E", "D", "C", "B", "A"])
+
+    async def walk(url):
+        seen = []
+        for _ in range(5):  # 5 monitors, 2 per page: 3 pages, then no next link
+            if url is None:
+                break
+            page = await client.get(url)
+            names = listed(page.text)
+            assert len(names) <= 2
+            seen.extend(names)
+            match = re.search(r'href="([^"]*after=[^"]+)"', page.text)
+            url = match.group(1).replace("&amp;", "&") if match else None
+        assert url is None, "pagination did not terminate"
+        return seen
+
+    assert await walk("/dashboard?sort=name") == ["A", "B", "C", "D", "E"]
+    # Monitors created within the same second still page by id, newest first
+    assert await walk("/dashboard?sort=newest") == ["A", "B", "C", "D", "E"]
+    assert await walk("/dashboard?sort=urgency") == ["A", "B", "C", "D", "E"]
+
+    # A malformed cursor falls back to the first page
+    assert listed((await client.get("/dashboard?sort=name&after=bogus")).text) == ["A", "B"]
@@ -2,8 +2,8 @@ import pytest
 import re
 
 from datetime import datetime, timezone, timedelta
-from sqlalchemy import select
-from app.models import Monitor, User, Alert
+from sqlalchemy import func, select
+from app.models import Monitor, Ping, User, Alert
 from app.auth import hash_password
 from tests.conftest import test_session
 
@@ -91,6 +91,31 @@ async def test_ping_records_history(client):
     assert "3 total pings" in detail.text
 
 
+@pytest.mark.asyncio
+async def test_ping_on_up_monitor_stamps_it_in_place(client):
+    slug = await setup_user_and_monitor(client)
+    await client.get(f"/ping/{slug}")  # new -> up
+
+    earlier = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=1)
+    async with test_session() as db:
+        monitor = (await db.execute(select(Monitor).where(Monitor.slug == slug))).scalar_one()
+        monitor.last_ping_at = earlier
+        await db.commit()
+
+    response = await client.get(f"/ping/{slug}")
+    assert response.text == "OK"
+
+    async with test_session() as db:
+        monitor = (await db.execute(select(Monitor).where(Monitor.slug == slug))).scalar_one()
+        assert monitor.status == "up"
+        assert monitor.last_ping_at > earlier
+        assert monitor.deadline_at == monitor.last_ping_at + timedelta(
+            seconds=monitor.period + monitor.grace
+        )
+        pings = await db.execute(select(func.count()).where(Ping.monitor_id == monitor.id))
+        assert pings.scalar() == 2
+
+
 @pytest.mark.asyncio
 async def test_ping_paused_monitor(client):
     slug = await setup_user_and_monitor(client)
@@ -159,3 +184,61 @@ async def test_ping_recovery_from_down():
         alerts = await db.execute(select(Alert).where(Alert.monitor_id == m.id))
         alert_list = alerts.scalars().all()
         assert any(a.alert_type == "up" for a in alert_list)
+
+
+def history_agents(text: str) -> list[str]:
+    return re.findall(r"agent-\d+", text)
+
+
+def older_link(text: str) -> str | None:
+    match = re.search(r'href="([^"]*before=[^"]+)"', text)
+    return match.group(1).replace("&amp;", "&") if match else None
+
+
+@pytest.mark.asyncio
+async def test_ping_history_keyset_pages(client, monkeypatch):
+    from app.config import settings
+    from app.models import Ping
+
+    monkeypatch.setattr(settings, "ping_page_size", 2)
+    await setup_user_and_monitor(client)
+    async with test_session() as db:
+        # Server-default timestamps share one second; ties are broken by id
+        for i in range(5):
+            db.add(Ping(monitor_id=1, user_agent=f"agent-{i}"))
+        await db.commit()
+
+    seen = []
+    url = "/monitors/1"
+    for _ in range(5):
+        if url is None:
+            break
+        page = await client.get(url)
+        assert len(history_agents(page.text)) <= 2
+        seen.extend(history_agents(page.text))
+        url = older_link(page.text)
+    assert url is None
+    assert seen == ["agent-4", "agent-3", "agent-2", "agent-1", "agent-0"]
+
+
+@pytest.mark.asyncio
+async def test_ping_history_time_range(client):
+    from app.models import Ping
+
+    await setup_user_and_monitor(client)
+    async with test_session() as db:
+        for day, agent in ((1, "agent-1"), (2, "agent-2"), (3, "agent-3")):
+            db.add(Ping(
+                monitor_id=1, user_agent=agent, created_at=datetime(2026, 3, day, 12, 0, 0)
+            ))
+        await db.commit()
+
+    page = await client.get("/monitors/1?since=2026-03-02&until=2026-03-02")
+    assert history_agents(page.text) == ["agent-2"]
+
+    page = await client.get("/monitors/1?since=2026-03-02")
+    assert history_agents(page.text) == ["agent-3", "agent-2"]
+
+    page = await client.get("/monitors/1?until=2026-02-01")
+    assert history_agents(page.text) == []
+    assert "No pings in this time range" in page.text
@@ -0,0 +1,79 @@
+import pytest
+
+from app import ratelimit
+from app.ratelimit import RateLimiter
+from tests.test_api import api_client
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", clock)
+    return clock
+
+
+def test_bucket_allows_burst_then_refills(clock):
+    limiter = RateLimiter("test", per_minute=60, burst=3, max_keys=100)
+
+    assert [limiter.hit("a") for _ in range(4)] == [0, 0, 0, 1]
+    assert limiter.hit("b") == 0  # buckets are per key
+    clock.now += 1
+    assert limiter.hit("a") == 0
+    assert limiter.hit("a") == 1
+    assert (limiter.allowed, limiter.limited) == (5, 2)
+
+
+def test_bucket_store_is_bounded(clock):
+    limiter = RateLimiter("test", per_minute=60, burst=3, max_keys=2)
+    for key in "abc":
+        limiter.hit(key)
+    assert len(limiter) == 2
+
+    # Buckets idle long enough to be full again are dropped as traffic arrives
+    clock.now += 3
+    limiter.hit("d")
+    assert len(limiter) == 1
+
+
+@pytest.mark.asyncio
+async def test_ping_is_rate_limited_per_slug(client, monkeypatch):
+    monkeypatch.setattr(ratelimit.ping_by_slug, "burst", 2)
+    await api_client(client)
+    response = await client.post("/api/v1/monitors", json={"name": "Loop", "period": 60})
+    slug = response.json()["slug"]
+
+    assert (await client.get(f"/ping/{slug}")).status_code == 200
+    assert (await client.get(f"/ping/{slug}")).status_code == 200
+    response = await client.get(f"/ping/{slug}")
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "1"
+    assert ratelimit.ping_by_slug.limited == 1
+
+    # Other monitors are unaffected
+    assert (await client.get("/ping/some-other-slug")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_login_is_rate_limited_per_account(client, monkeypatch):
+    monkeypatch.setattr(ratelimit.login_by_account, "burst", 2)
+    await api_client(client)
+
+    for _ in range(2):
+        response = await client.post(
+            "/auth/login", data={"email": "test@example.com", "password": "wrong-password"}
+        )
+        assert response.status_code == 401
+    response = await client.post(
+        "/auth/login", data={"email": "TEST@example.com", "password": "securepassword123"}
+    )
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) > 0
+    assert "Too many attempts" in response.text
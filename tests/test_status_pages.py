@@ -0,0 +1,210 @@
+import re
+from datetime import datetime, timezone, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app import status_pages
+from app.checker import check_overdue_monitors
+from app.models import Monitor
+from tests.conftest import test_session
+
+
+async def register(client, username="testuser", email="test@example.com"):
+    response = await client.post(
+        "/auth/register",
+        data={
+            "username": username,
+            "email": email,
+            "password": "securepassword123",
+            "password_confirm": "securepassword123",
+        },
+        follow_redirects=False,
+    )
+    client.cookies.set("access_token", response.cookies.get("access_token"))
+
+
+async def create_monitor(client, name):
+    await client.post(
+        "/monitors/new",
+        data={"name": name, "period": "3600", "grace": "0", "webhook_url": ""},
+        follow_redirects=False,
+    )
+
+
+async def setup_page(client):
+    """Helper: register, create two monitors and a status page; return (page slug, ping slugs)."""
+    await register(client)
+    await create_monitor(client, "Backup")
+    await create_monitor(client, "Sync")
+
+    response = await client.post(
+        "/status-pages/new",
+        data={"title": "Nightly Jobs", "monitor_ids": ["1", "2"]},
+        follow_redirects=False,
+    )
+    assert response.status_code == 303
+
+    index = await client.get("/status-pages")
+    match = re.search(r"/status/([a-f0-9-]{36})", index.text)
+    assert match
+
+    ping_slugs = []
+    for monitor_id in (1, 2):
+        detail = await client.get(f"/monitors/{monitor_id}")
+        ping_slugs.append(re.search(r"/ping/([a-f0-9-]{36})", detail.text).group(1))
+    return match.group(1), ping_slugs
+
+
+@pytest.fixture
+def render_count(monkeypatch):
+    calls = []
+    original = status_pages.render
+
+    async def counting_render(db, slug):
+        calls.append(slug)
+        return await original(db, slug)
+
+    monkeypatch.setattr(status_pages, "render", counting_render)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_status_pages_index_requires_auth(client):
+    response = await client.get("/status-pages", follow_redirects=False)
+    assert response.status_code == 303
+    assert response.headers["location"] == "/auth/login"
+
+
+@pytest.mark.asyncio
+async def test_public_status_page(client):
+    slug, _ = await setup_page(client)
+    client.cookies.clear()
+
+    response = await client.get(f"/status/{slug}")
+    assert response.status_code == 200
+    assert "Nightly Jobs" in response.text
+    assert "Backup" in response.text
+    assert "Sync" in response.text
+    assert response.headers["etag"]
+
+    data = (await client.get(f"/status/{slug}.json")).json()
+    assert data["title"] == "Nightly Jobs"
+    assert data["status"] == "partial"
+    assert [m["name"] for m in data["monitors"]] == ["Backup", "Sync"]
+
+
+@pytest.mark.asyncio
+async def test_public_status_page_not_found(client):
+    response = await client.get("/status/00000000-0000-0000-0000-000000000000")
+    assert response.status_code == 404
+    response = await client.get("/status/00000000-0000-0000-0000-000000000000.json")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_public_status_page_served_from_cache(client, render_count):
+    slug, _ = await setup_page(client)
+
+    first = await client.get(f"/status/{slug}")
+    for _ in range(5):
+        response = await client.get(f"/status/{slug}")
+        assert response.content == first.content
+    await client.get(f"/status/{slug}.json")
+    assert render_count == [slug]
+
+    response = await client.get(f"/status/{slug}", headers={"If-None-Match": first.headers["etag"]})
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_ping_transition_regenerates_page(client, render_count):
+    slug, ping_slugs = await setup_page(client)
+    await client.get(f"/status/{slug}.json")
+
+    # A ping that keeps a monitor "up" does not touch the page
+    await client.get(f"/ping/{ping_slugs[0]}")
+    await client.get(f"/status/{slug}.json")
+    await client.get(f"/ping/{ping_slugs[0]}")
+    await client.get(f"/status/{slug}.json")
+    assert len(render_count) == 2
+
+    await client.get(f"/ping/{ping_slugs[1]}")
+    data = (await client.get(f"/status/{slug}.json")).json()
+    assert data["status"] == "up"
+    assert len(render_count) == 3
+
+
+@pytest.mark.asyncio
+async def test_checker_transition_regenerates_page(client):
+    slug, ping_slugs = await setup_page(client)
+    for ping_slug in ping_slugs:
+        await client.get(f"/ping/{ping_slug}")
+    assert (await client.get(f"/status/{slug}.json")).json()["status"] == "up"
+
+    async with test_session() as db:
+        result = await db.execute(select(Monitor).where(Monitor.id == 1))
+        monitor = result.scalar_one()
+        monitor.last_ping_at = datetime.now(timezone.utc) - timedelta(days=1)
+        await db.commit()
+
+    await check_overdue_monitors(session_factory=test_session)
+
+    data = (await client.get(f"/status/{slug}.json")).json()
+    assert data["status"] == "down"
+    assert data["monitors"][0]["status"] == "down"
+
+
+@pytest.mark.asyncio
+async def test_create_status_page_rejects_foreign_monitors(client):
+    await register(client, "other", "other@example.com")
+    await create_monitor(client, "Theirs")
+    client.cookies.clear()
+
+    await register(client)
+    response = await client.post(
+        "/status-pages/new",
+        data={"title": "Sneaky", "monitor_ids": ["1"]},
+    )
+    assert response.status_code == 422
+    assert "Select at least one monitor." in response.text
+
+
+@pytest.mark.asyncio
+async def test_delete_status_page(client):
+    slug, _ = await setup_page(client)
+    assert (await client.get(f"/status/{slug}")).status_code == 200
+
+    response = await client.post("/status-pages/1/delete", follow_redirects=False)
+    assert response.status_code == 303
+    assert (await client.get(f"/status/{slug}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_deleting_monitor_updates_page(client):
+    slug, _ = await setup_page(client)
+    await client.get(f"/status/{slug}.json")
+
+    await client.post("/monitors/1/delete", follow_redirects=False)
+
+    data = (await client.get(f"/status/{slug}.json")).json()
+    assert [m["name"] for m in data["monitors"]] == ["Sync"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_slug_lookups_are_cached(client, render_count, monkeypatch):
+    slug = "11111111-1111-1111-1111-111111111111"
+    for _ in range(3):
+        assert (await client.get(f"/status/{slug}")).status_code == 404
+    assert render_count == [slug]
+
+    # Creating a page with a previously probed slug clears the cached miss
+    from app.routers import status_pages as status_pages_router
+
+    monkeypatch.setattr(status_pages_router, "generate_uuid", lambda: slug)
+    await register(client)
+    await create_monitor(client, "Backup")
+    await client.post(
+        "/status-pages/new", data={"title": "Jobs", "monitor_ids": ["1"]}, follow_redirects=False
+    )
+    assert (await client.get(f"/status/{slug}")).status_code == 200
@@ -0,0 +1,222 @@
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.models import Monitor, StatusEvent, User
+from app.routers.monitors import remove_monitor
+from app.uptime import UptimeEngine, format_uptime, uptime_engine
+from tests.conftest import test_session
+
+NOW = datetime(2026, 3, 10, 12, 0, 0)
+
+
+async def make_monitor(status: str, events: list[tuple[timedelta, str, str]]) -> int:
+    """Create a monitor with transitions given as (age, from, to); return its id."""
+    async with test_session() as db:
+        user = User(email="test@example.com", username="testuser", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        monitor = Monitor(user_id=user.id, name="Job", period=300, grace=60, status=status)
+        db.add(monitor)
+        await db.flush()
+        for age, from_status, to_status in events:
+            db.add(StatusEvent(
+                monitor_id=monitor.id, from_status=from_status, to_status=to_status, at=NOW - age
+            ))
+        await db.commit()
+        return monitor.id
+
+
+async def uptime(engine, monitor_id, status, window, now=NOW):
+    async with test_session() as db:
+        return await engine.uptime(db, monitor_id, status, window, now)
+
+
+@pytest.mark.asyncio
+async def test_uptime_over_windows():
+    monitor_id = await make_monitor("up", [
+        (timedelta(days=10), "new", "up"),
+        (timedelta(days=2), "up", "down"),
+        (timedelta(days=2) - timedelta(hours=6), "down", "up"),
+    ])
+    engine = UptimeEngine()
+
+    assert await uptime(engine, monitor_id, "up", timedelta(hours=24)) == 100
+    week = await uptime(engine, monitor_id, "up", timedelta(days=7))
+    assert week == pytest.approx(162 / 168 * 100)
+    # Monitoring started 10 days ago, so only 240 of the 720 hours count
+    month = await uptime(engine, monitor_id, "up", timedelta(days=30))
+    assert month == pytest.approx(234 / 240 * 100)
+
+
+@pytest.mark.asyncio
+async def test_uptime_ignores_paused_and_new_time():
+    monitor_id = await make_monitor("paused", [
+        (timedelta(hours=20), "new", "up"),
+        (timedelta(hours=8), "up", "paused"),
+    ])
+    engine = UptimeEngine()
+
+    assert await uptime(engine, monitor_id, "paused", timedelta(hours=24)) == 100
+    assert await uptime(engine, monitor_id, "paused", timedelta(hours=4)) is None
+
+
+@pytest.mark.asyncio
+async def test_uptime_without_events_uses_current_status():
+    engine = UptimeEngine()
+    assert await uptime(engine, await make_monitor("up", []), "up", timedelta(days=7)) == 100
+
+
+@pytest.mark.asyncio
+async def test_uptime_caches_completed_days():
+    monitor_id = await make_monitor("up", [
+        (timedelta(days=20), "new", "up"),
+        (timedelta(days=5), "up", "down"),
+        (timedelta(days=4), "down", "up"),
+    ])
+    engine = UptimeEngine()
+
+    await uptime(engine, monitor_id, "up", timedelta(days=7))
+    assert len(engine._days) == 6  # 6 whole days between the partial head and today
+
+    # A day later the cached days are reused and the answer still matches a cold engine
+    later = NOW + timedelta(days=1)
+    warm = await uptime(engine, monitor_id, "up", timedelta(days=7), later)
+    cold = await uptime(UptimeEngine(), monitor_id, "up", timedelta(days=7), later)
+    assert warm == pytest.approx(cold)
+    assert len(engine._days) == 7
+
+
+@pytest.mark.asyncio
+async def test_cached_uptime_results_are_bounded():
+    monitor_id = await make_monitor("up", [(timedelta(days=2), "new", "up")])
+    engine = UptimeEngine(max_cached_results=2)
+
+    async with test_session() as db:
+        for window in ("24h", "7d", "30d"):
+            await engine.cached(db, monitor_id, "up", window)
+    assert list(engine._results) == [(monitor_id, "7d"), (monitor_id, "30d")]
+
+
+@pytest.mark.asyncio
+async def test_deleted_monitor_is_forgotten_only_once_committed():
+    monitor_id = await make_monitor("up", [(timedelta(days=2), "new", "up")])
+    async with test_session() as db:
+        await uptime_engine.cached(db, monitor_id, "up", "24h")
+
+    async with test_session() as db:
+        await remove_monitor(db, await db.get(Monitor, monitor_id))
+        await db.flush()
+        await db.rollback()
+    assert (monitor_id, "24h") in uptime_engine._results
+
+    async with test_session() as db:
+        await remove_monitor(db, await db.get(Monitor, monitor_id))
+        assert (monitor_id, "24h") in uptime_engine._results
+        await db.commit()
+    assert (monitor_id, "24h") not in uptime_engine._results
+
+
+def test_format_uptime():
+    assert format_uptime(None) == "n/a"
+    assert format_uptime(100.0) == "100%"
+    assert format_uptime(99.999) == "99.99%"
+    assert format_uptime(97.5) == "97.50%"
+
+
+async def setup_user_and_monitor(client):
+    response = await client.post(
+        "/auth/register",
+        data={
+            "username": "testuser",
+            "email": "test@example.com",
+            "password": "securepassword123",
+            "password_confirm": "securepassword123",
+        },
+        follow_redirects=False,
+    )
+    client.cookies.set("access_token", response.cookies.get("access_token"))
+    await client.post(
+        "/monitors/new",
+        data={"name": "Uptime Test", "period": "3600", "grace": "0", "webhook_url": ""},
+        follow_redirects=False,
+    )
+    detail = await client.get("/monitors/1")
+    return re.search(r"/ping/([a-f0-9-]{36})", detail.text).group(1)
+
+
+@pytest.mark.asyncio
+async def test_transitions_are_logged(client):
+    slug = await setup_user_and_monitor(client)
+    await client.get(f"/ping/{slug}")
+    await client.get(f"/ping/{slug}")
+    await client.post("/monitors/1/pause", follow_redirects=False)
+    await client.post("/monitors/1/resume", follow_redirects=False)
+
+    async with test_session() as db:
+        result = await db.execute(select(StatusEvent).order_by(StatusEvent.id))
+        events = [(e.from_status, e.to_status) for e in result.scalars()]
+    assert events == [("new", "up"), ("up", "paused"), ("paused", "up")]
+
+
+@pytest.mark.asyncio
+async def test_uptime_exposed_on_detail_and_badges(client):
+    slug = await setup_user_and_monitor(client)
+
+    data = (await client.get(f"/badge/{slug}.json")).json()
+    assert data["uptime"] == {"24h": None, "7d": None, "30d": None}
+
+    await client.get(f"/ping/{slug}")
+    data = (await client.get(f"/badge/{slug}.json")).json()
+    assert data["uptime"]["24h"] == 100
+
+    detail = await client.get("/monitors/1")
+    assert "Uptime" in detail.text
+    assert "100%" in detail.text
+
+    response = await client.get(f"/badge/{slug}/uptime.svg?window=7d")
+    assert response.status_code == 200
+    assert "uptime 7d" in response.text
+    assert "100%" in response.text
+
+    response = await client.get(
+        f"/badge/{slug}/uptime.svg?window=7d", headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert response.status_code == 304
+
+    response = await client.get("/badge/00000000-0000-0000-0000-000000000000/uptime.svg")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_badge_uptime_is_cached_until_transition(client, monkeypatch):
+    from app.uptime import uptime_engine
+
+    slug = await setup_user_and_monitor(client)
+    await client.get(f"/ping/{slug}")
+
+    calls = []
+    original = uptime_engine.uptime
+
+    async def counting_uptime(*args, **kwargs):
+        calls.append(args)
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(uptime_engine, "uptime", counting_uptime)
+
+    first = await client.get(f"/badge/{slug}.json")
+    assert len(calls) == 3
+    for _ in range(3):
+        response = await client.get(
+            f"/badge/{slug}.json", headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert response.status_code == 304
+        await client.get(f"/badge/{slug}/uptime.svg?window=7d")
+    assert len(calls) == 3
+
+    # A status change drops the cached figures
+    await client.post("/monitors/1/pause", follow_redirects=False)
+    await client.get(f"/badge/{slug}.json")
+    assert len(calls) == 6